@@ -0,0 +1,151 @@
+# admission.py
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+
+class Rejected(Exception):
+    """Raised when a request is shed; status_code is 429 or 503."""
+    def __init__(self, status_code, detail, retry_after):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent executions of an expensive endpoint.
+
+    Up to max_concurrent requests run at once and at most max_queue wait for a
+    slot, each for no longer than queue_timeout seconds. Anything beyond that
+    is rejected immediately with 503 so cheap endpoints keep their share of
+    the server.
+    """
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if not self._semaphore.locked():
+            # A free slot is taken without suspending
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            self.shed_queue_full += 1
+            raise Rejected(503, f"{self.name} is at capacity, try again shortly", self.queue_timeout)
+        else:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                raise Rejected(503, f"Timed out waiting for {self.name} capacity", self.queue_timeout)
+            finally:
+                self.waiting -= 1
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self):
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'queue_depth': self.waiting,
+            'max_queue_depth': self.max_waiting,
+            'admitted': self.admitted,
+            'shed_queue_full': self.shed_queue_full,
+            'shed_timeout': self.shed_timeout
+        }
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token buckets: each client may burst up to `burst` requests
+    and then `rate_per_minute` per minute. Only the most recently seen
+    max_clients buckets are kept.
+    """
+    def __init__(self, name, rate_per_minute, burst, max_clients=10000):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def check(self, client):
+        """Takes a token for the client or raises Rejected(429)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[client] = (tokens - 1, now)
+                self.allowed += 1
+            else:
+                self._buckets[client] = (tokens, now)
+                self.limited += 1
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        if tokens < 1:
+            raise Rejected(429, f"Rate limit exceeded for {self.name}", (1 - tokens) / self.rate)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'rate_per_minute': self.rate * 60,
+                'burst': self.burst,
+                'clients': len(self._buckets),
+                'allowed': self.allowed,
+                'rate_limited': self.limited
+            }
+
+
+class AdmissionController:
+    """Rate limit, then concurrency limit, per named endpoint group."""
+    def __init__(self):
+        self.limiters = {}
+        self.rate_limiters = {}
+
+    def configure(self, name, max_concurrent, max_queue, queue_timeout, rate_per_minute, burst):
+        self.limiters[name] = ConcurrencyLimiter(name, max_concurrent, max_queue, queue_timeout)
+        if rate_per_minute > 0:
+            self.rate_limiters[name] = TokenBucketLimiter(name, rate_per_minute, burst)
+
+    @asynccontextmanager
+    async def admit(self, name, client):
+        rate_limiter = self.rate_limiters.get(name)
+        if rate_limiter is not None:
+            rate_limiter.check(client)
+        async with self.limiters[name].slot():
+            yield
+
+    def snapshot(self):
+        return {
+            name: {
+                **limiter.snapshot(),
+                **(self.rate_limiters[name].snapshot() if name in self.rate_limiters else {})
+            }
+            for name, limiter in self.limiters.items()
+        }
@@ -1,20 +1,20 @@
 # In api_server.py, at the top with other imports
 import os
 import numpy as np
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-import torch
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import sqlite3
 import pandas as pd
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
 import sys
+import time
 from pathlib import Path
 import requests
 from fastapi import HTTPException
@@ -26,8 +26,37 @@ sys.path.insert(0, str(project_root))
 
 from config.config import config
 from data.etl_pipeline import run_etl_pipeline
-from stock_forecast import generate_forecasts
-from chatbot import handle_general_question, get_last_close_price, get_allocation_decision
+from data.db_pool import read_connection, pool_stats as sqlite_pool_stats
+from data.data_version import get_data_version, data_version_is_cached
+from data.news_client import close_async_client, fetch_top_headlines_async
+from data.news_feed import CachedNewsFeed
+from data.news_archive import load_ticker_news_async, load_many_tickers_news
+from data.sentiment_store import (
+    MARKET_KEY, get_aggregates, get_last_ingest_time, get_recent_headlines, get_top_movers, record_scored_articles
+)
+from stock_forecast import generate_forecasts, get_forecast_chart_spec, preload_models, chart_cache_lookups
+from chatbot import (
+    get_last_close_price, get_allocation_decision,
+    get_async_groq_client, close_async_groq_client, stream_answer_async, QA_DISABLED_MESSAGE
+)
+from sentiment.finbert import load_finbert_pipeline, connect_sentiment_worker, score_headlines, MODEL_VERSION
+from sentiment.batcher import InferenceQueueFull, batcher_stats
+from sentiment.cache import get_sentiment_cache, headline_key
+from sentiment.dedup import dedup_stats, score_headlines_deduped
+from sentiment.client import SentimentWorkerClient
+from startup import components, uptime_seconds
+from response_cache import ResponseCache, Fallback, unwrap
+from market_feed import MarketFeed, format_sse
+from serialization import (
+    negotiate_format, UnsupportedFormat, dumps, frame_to_columns, rows_to_columns, columns_to_arrow, maybe_gzip, accepts_gzip,
+    JSON_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, ARROW_MEDIA_TYPE
+)
+from executors import run_db, run_cpu, shutdown_pools, loop_lag, db_pool_stats, cpu_pool_stats, CPU_POOL_SIZE
+from admission import AdmissionController, Rejected
+from metrics import REGISTRY, MetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from profiling import ProfilingMiddleware
+from tracing import TracingMiddleware, span
+from config.logging_config import setup_logging
 
 # Initialize FastAPI app
 app = FastAPI(title="Portfolio Dashboard API", version="1.0.0")
@@ -41,19 +70,106 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Request latency per route and status, exported on /metrics
+app.add_middleware(MetricsMiddleware)
+# Opt-in sampling profiles for single requests (see profiling.py)
+app.add_middleware(ProfilingMiddleware)
+# Root span per request when TRACING_ENABLED (see tracing.py)
+app.add_middleware(TracingMiddleware)
+setup_logging()
 
-# Load the FinBERT model
-try:
-    finbert_pipeline = pipeline(
-        "sentiment-analysis",
-        model="yiyanghkust/finbert-tone",
-        tokenizer="yiyanghkust/finbert-tone",
-        device=-1  # Use CPU
-    )
+# Heavy components (FinBERT, torch, statsmodels, groq) are loaded by a warm-up
+# task after the server starts listening. With FAST_STARTUP=false the warm-up
+# finishes before the first request is accepted, as it used to at import time.
+SENTIMENT_WORKER_SOCKET = config.get('SENTIMENT_WORKER_SOCKET')
+FAST_STARTUP = config.get('FAST_STARTUP', 'true').lower() == 'true'
+# Stored sentiment newer than this is served without refetching news
+SENTIMENT_MAX_AGE = timedelta(minutes=int(config.get('SENTIMENT_MAX_AGE_MINUTES', 60)))
+SENTIMENT_LOOKBACK_DAYS = int(config.get('SENTIMENT_LOOKBACK_DAYS', 7))
+# Each ticker loads up to 10 headlines and may trigger a NewsAPI fetch
+BULK_SENTIMENT_MAX_TICKERS = int(config.get('BULK_SENTIMENT_MAX_TICKERS', 50))
+# Dashboard news feed: served from memory, refreshed in the background once older than this
+NEWS_FEED_TTL = int(config.get('NEWS_FEED_TTL_SECONDS', 300))
+NEWS_FEED_SIZE = int(config.get('NEWS_FEED_SIZE', 8))
+# Admission control for the expensive endpoints: beyond the concurrency limit
+# requests wait in a bounded queue; a full queue or a wait longer than the
+# timeout gets a 503, a client over its token-bucket rate gets a 429.
+ADMISSION_QUEUE_TIMEOUT = float(config.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', 10))
+TRUST_FORWARDED_FOR = config.get('TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+finbert_pipeline = None
+
+components.register('finbert')
+components.register('forecasting')
+components.register('groq', required=False)
+
+def _load_finbert():
+    # Connect to the shared sentiment worker if one is configured so that
+    # each API worker doesn't hold its own copy of the model
+    if SENTIMENT_WORKER_SOCKET:
+        client = connect_sentiment_worker(SENTIMENT_WORKER_SOCKET)
+        print(f'✅ Using sentiment worker at {SENTIMENT_WORKER_SOCKET}')
+        return client
+    pipeline = load_finbert_pipeline()
     print('✅ FinBERT model loaded successfully')
-except Exception as e:
-    print(f'❌ Error loading FinBERT model: {e}')
-    finbert_pipeline = None
+    return pipeline
+
+def warm_up():
+    """Loads heavy components, recording per-component load times."""
+    global finbert_pipeline
+    finbert_pipeline = components.load('finbert', _load_finbert)
+    if finbert_pipeline is None:
+        print('❌ Error loading FinBERT model: see /api/health for details')
+    components.load('forecasting', preload_models)
+    components.load('groq', get_async_groq_client)
+
+admission = AdmissionController()
+admission.configure(
+    'forecast',
+    max_concurrent=int(config.get('FORECAST_MAX_CONCURRENCY', CPU_POOL_SIZE)),
+    max_queue=int(config.get('FORECAST_QUEUE_SIZE', 8)),
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    rate_per_minute=float(config.get('FORECAST_RATE_PER_MINUTE', 20)),
+    burst=int(config.get('FORECAST_RATE_BURST', 5))
+)
+admission.configure(
+    'bulk_sentiment',
+    max_concurrent=int(config.get('BULK_SENTIMENT_MAX_CONCURRENCY', 2)),
+    max_queue=int(config.get('BULK_SENTIMENT_QUEUE_SIZE', 4)),
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    rate_per_minute=float(config.get('BULK_SENTIMENT_RATE_PER_MINUTE', 10)),
+    burst=int(config.get('BULK_SENTIMENT_RATE_BURST', 3))
+)
+
+def client_id(request: Request):
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get('x-forwarded-for')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.client.host if request.client else 'unknown'
+
+@app.exception_handler(Rejected)
+async def handle_rejected(request: Request, exc: Rejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.on_event("startup")
+async def start_warm_up():
+    loop_lag.start()
+    if FAST_STARTUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+    else:
+        await asyncio.to_thread(warm_up)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_async_client()
+    await close_async_groq_client()
+    await loop_lag.stop()
+    await market_feed.stop()
+    shutdown_pools()
 
 # Pydantic models for request/response
 class ChatMessage(BaseModel):
@@ -67,6 +183,7 @@ class ForecastRequest(BaseModel):
     ticker: str
     days: int
     currency: str
+    include_chart: bool = False  # opt-in serialized Plotly spec per ticker
 
 class TradeRequest(BaseModel):
     symbol: str
@@ -106,10 +223,10 @@ class TeamMember(BaseModel):
 # Database helper functions
 def get_db_connection():
     db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
-    return sqlite3.connect(db_path)
+    return read_connection(db_path)
 
 def get_portfolio_from_db():
-    """Get portfolio data from database or return mock data"""
+    """Get portfolio data from database, or mock data wrapped in Fallback"""
     try:
         with get_db_connection() as conn:
             query = """
@@ -140,7 +257,7 @@ def get_portfolio_from_db():
         print(f"Error getting portfolio from DB: {e}")
         getLogger(__name__).error(e)
     
-    return {
+    return Fallback({
         "totalValue": 125420.50,
         "dailyChange": 2840.25,
         "dailyChangePercent": 2.32,
@@ -152,10 +269,10 @@ def get_portfolio_from_db():
             "crypto": 12.5,
             "cash": 6.5
         }
-    }
+    })
 
 def get_market_data_from_db():
-    """Get latest market data from database"""
+    """Get latest market data from database, or mock quotes wrapped in Fallback"""
     try:
         with get_db_connection() as conn:
             query = """
@@ -172,38 +289,126 @@ def get_market_data_from_db():
     except Exception as e:
         print(f"Error getting market data from DB: {e}")
     
-    return [
+    return Fallback([
         {"symbol": "AAPL", "price": 195.84, "change": 2.34, "changePercent": 1.21},
         {"symbol": "GOOGL", "price": 142.56, "change": -1.23, "changePercent": -0.85},
         {"symbol": "MSFT", "price": 378.91, "change": 4.67, "changePercent": 1.25},
         {"symbol": "TSLA", "price": 248.73, "change": -3.21, "changePercent": -1.27},
         {"symbol": "NVDA", "price": 567.12, "change": 12.45, "changePercent": 2.24},
         {"symbol": "BTC-USD", "price": 67234.56, "change": 1823.45, "changePercent": 2.78}
-    ]
+    ])
 
 # API Endpoints
 @app.get("/")
 async def root():
     return {"message": "Portfolio Dashboard API is running"}
 
+# Dashboard responses only change when the ETL commits market data, so they are
+# cached per data version and revalidated with ETags.
+response_cache = ResponseCache(int(config.get('RESPONSE_CACHE_SIZE', 256)))
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+def encode_json(data):
+    # Same encoding as JSONResponse
+    data = jsonable_encoder(data)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"), JSON_MEDIA_TYPE
+
+async def cached_json(request: Request, name, build, encode=encode_json):
+    """
+    Serves a response from the version-keyed cache.
+
+    Returns 304 when the client's If-None-Match still matches the current data
+    version; otherwise the cached body, calling build() (a coroutine function
+    returning the response data) only on a miss. encode turns that data into
+    (body, media type); large bodies are stored gzipped for clients that
+    accept it. Fallback data, or any response built while the data version
+    can't be read, is sent uncached and without an ETag.
+    """
+    db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
+    try:
+        if data_version_is_cached(db_path):
+            version = get_data_version(db_path)
+        else:
+            version = await run_db(get_data_version, db_path)
+    except sqlite3.Error as e:
+        getLogger(__name__).warning(f"Could not read data version for {name}: {e}")
+        version = None
+    # Each representation (format and content coding) gets its own ETag
+    gzip_ok = accepts_gzip(request)
+    variant = f"{name}+gzip" if gzip_ok else name
+    vary = {"Vary": "Accept, Accept-Encoding"}
+
+    if version is not None:
+        etag = ResponseCache.make_etag(variant, version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", **vary}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            response_cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        cached = response_cache.get(variant, version)
+        if cached is not None:
+            body, media_type, encoding_headers = cached
+            return Response(content=body, media_type=media_type, headers={**headers, **encoding_headers})
+
+    data, fallback = unwrap(await build())
+    body, media_type = encode(data)
+    encoding_headers = {}
+    body = maybe_gzip(request, body, encoding_headers)
+    if fallback or version is None:
+        headers = {"Cache-Control": "no-store", **vary}
+    else:
+        response_cache.put(variant, version, (body, media_type, encoding_headers))
+    return Response(content=body, media_type=media_type, headers={**headers, **encoding_headers})
+
 @app.get("/api/portfolio", response_model=PortfolioData)
-async def get_portfolio():
+async def get_portfolio(request: Request):
     """Get portfolio overview data"""
-    try:
-        portfolio_data = get_portfolio_from_db()
-        return PortfolioData(**portfolio_data)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching portfolio data: {str(e)}")
+    async def build():
+        try:
+            portfolio_data, fallback = unwrap(await run_db(get_portfolio_from_db))
+            portfolio = PortfolioData(**portfolio_data)
+            return Fallback(portfolio) if fallback else portfolio
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching portfolio data: {str(e)}")
+    return await cached_json(request, "portfolio", build)
 
 @app.get("/api/market-data", response_model=List[MarketDataItem])
-async def get_market_data():
+async def get_market_data(request: Request):
     """Get latest market data for ticker and watchlist"""
-    try:
-        market_data = get_market_data_from_db()
-        print(type(market_data))
-        return [MarketDataItem(**item) for item in market_data]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching market data: {str(e)}")
+    async def build():
+        try:
+            market_data, fallback = unwrap(await run_db(get_market_data_from_db))
+            items = [MarketDataItem(**item) for item in market_data]
+            return Fallback(items) if fallback else items
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching market data: {str(e)}")
+    return await cached_json(request, "market-data", build)
+
+async def _load_market_snapshot():
+    return await run_db(get_market_data_from_db)
+
+async def _current_data_version():
+    return await run_db(get_data_version, config.get('DATABASE_PATH', 'database/financial_data.db'))
+
+# One producer per API worker, shared by every open dashboard
+market_feed = MarketFeed(_load_market_snapshot, _current_data_version)
+
+@app.get("/api/stream/market")
+async def stream_market_data():
+    """
+    Server-sent events with market quotes: a 'snapshot' event on connect,
+    then 'delta' events carrying only the symbols that changed after an ETL
+    commit. Replaces polling /api/market-data.
+    """
+    return StreamingResponse(
+        market_feed.subscribe(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/team", response_model=List[TeamMember])
 async def get_team():
@@ -237,32 +442,25 @@ async def get_team():
     return [TeamMember(**member) for member in team_members]
 
 # === SENTIMENT ANALYSIS FUNCTIONS ===
-def fetch_ticker_news(ticker, n_headlines=15):
-    """Fetch news headlines for a ticker symbol"""
-    try:
-        NEWSAPI_KEY = config.get('NEWS_API_KEY')
-        if not NEWSAPI_KEY:
-            raise ValueError("NEWSAPI_KEY not configured")
-
-        url = (
-            "https://newsapi.org/v2/everything?"
-            f"q={ticker}&language=en&sortBy=publishedAt&pageSize={n_headlines}&apiKey={NEWSAPI_KEY}"
-        )
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            articles = resp.json().get("articles", [])
-            headlines = [a['title'] for a in articles if a.get('title')]
-            # Assuming logger is configured
-            # logger.info(f"Fetched {len(headlines)} news headlines for {ticker}")
-            return headlines
-        else:
-            # Assuming logger is configured
-            # logger.warning(f"Failed to fetch news: {resp.status_code}")
-            return []
-    except Exception as e:
-        # Assuming logger is configured
-        # logger.error(f"Error fetching news for {ticker}: {e}")
-        return []
+def summarize_scored_headlines(headlines, scored):
+    """Turns per-headline scores into (counts, numerical scores, detailed results)"""
+    sentiment_counts = {'positive': 0, 'neutral': 0, 'negative': 0}
+    sentiment_scores = []
+    results = []
+    for text, result in zip(headlines, scored):
+        label = result['label']
+        score = result['score']
+        numerical_score = result['numerical_score']
+        sentiment_scores.append(numerical_score)
+        sentiment_counts[label] += 1
+        results.append({
+            'text': text,
+            'label': label,
+            'score': score,
+            'numerical_score': numerical_score,
+            'cluster_size': result.get('cluster_size', 1)
+        })
+    return sentiment_counts, sentiment_scores, results
 
 def analyze_headline_sentiment(headlines):
     """Analyze sentiment of headlines using FinBERT"""
@@ -273,25 +471,14 @@ def analyze_headline_sentiment(headlines):
     if not headlines:
         return {'positive': 0, 'neutral': 0, 'negative': 0}, [], []
 
-    sentiment_counts = {'positive': 0, 'neutral': 0, 'negative': 0}
-    sentiment_scores = []
-    results = []
-
     try:
-        for text in headlines:
-            result = finbert_pipeline(text[:512])[0]
-            label = result['label'].lower()
-            score = result['score']
-            numerical_score = score if label == 'positive' else -score if label == 'negative' else 0
-            sentiment_scores.append(numerical_score)
-            sentiment_counts[label] += 1
-            results.append({
-                'text': text,
-                'label': label,
-                'score': score,
-                'numerical_score': numerical_score
-            })
-        return sentiment_counts, sentiment_scores, results
+        # One representative per near-duplicate cluster is scored (cache
+        # misses only, in batches); every headline gets its cluster's result
+        scored = score_headlines_deduped(finbert_pipeline, headlines)
+        return summarize_scored_headlines(headlines, scored)
+    except InferenceQueueFull:
+        # Let the endpoint turn backpressure into a 503
+        raise
     except Exception as e:
         print(f"Error analyzing sentiment: {e}")
         return {'positive': 0, 'neutral': 0, 'negative': 0}, [], []
@@ -330,17 +517,61 @@ def suggest_allocation(avg_score):
         }
 
 # === API ROUTES ===
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class BulkSentimentRequest(BaseModel):
-    tickers: List[str]
+    tickers: List[str] = Field(..., max_length=BULK_SENTIMENT_MAX_TICKERS)
+
+def get_stored_sentiment(db_path, ticker, n_headlines):
+    """Builds a sentiment response from the stored time series if it is fresh enough"""
+    last_ingest = get_last_ingest_time(db_path, ticker)
+    if last_ingest is None or datetime.now(timezone.utc) - last_ingest > SENTIMENT_MAX_AGE:
+        return None
+    rows = get_recent_headlines(db_path, ticker, days=SENTIMENT_LOOKBACK_DAYS, limit=n_headlines)
+    if not rows:
+        return None
+
+    sentiment_counts = {'positive': 0, 'neutral': 0, 'negative': 0}
+    for row in rows:
+        sentiment_counts[row['label']] += 1
+    avg_score = float(np.mean([row['numerical_score'] for row in rows]))
+    return {
+        'success': True,
+        'ticker': ticker,
+        'sentiment_counts': sentiment_counts,
+        'average_score': avg_score,
+        'allocation_suggestion': suggest_allocation(avg_score),
+        'headlines': [
+            {'text': row['title'], 'label': row['label'], 'score': row['score'],
+             'numerical_score': row['numerical_score']}
+            for row in rows[:10]
+        ],
+        'total_headlines_analyzed': len(rows),
+        'aggregates': get_aggregates(db_path, ticker),
+        'source': 'store',
+        'as_of': last_ingest.isoformat()
+    }
 
 @app.get("/api/sentiment-analysis")
 async def get_sentiment_analysis(ticker: str, headlines: int = 15):
-    """Get sentiment analysis for a single ticker."""
+    """
+    Get sentiment analysis for a single ticker.
+
+    Served from the stored sentiment time series when it was refreshed within
+    SENTIMENT_MAX_AGE_MINUTES; otherwise news is fetched and scored live and
+    the results are stored for subsequent requests.
+    """
     ticker = ticker.upper()
+    db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
+    stored = await run_db(get_stored_sentiment, db_path, ticker, headlines)
+    if stored:
+        return stored
+
+    if components.state('finbert') in ('pending', 'loading'):
+        raise HTTPException(status_code=503, detail="Sentiment model is warming up", headers={"Retry-After": "5"})
     try:
-        news_headlines = fetch_ticker_news(ticker, headlines)
+        articles = await load_ticker_news_async(db_path, ticker, SENTIMENT_LOOKBACK_DAYS, headlines)
+        news_headlines = [a['title'] for a in articles]
 
         if not news_headlines:
             return {
@@ -353,9 +584,14 @@ async def get_sentiment_analysis(ticker: str, headlines: int = 15):
                 'headlines': []
             }
 
-        sentiment_counts, sentiment_scores, detailed_results = analyze_headline_sentiment(news_headlines)
+        sentiment_counts, sentiment_scores, detailed_results = await asyncio.to_thread(
+            analyze_headline_sentiment, news_headlines
+        )
         avg_score = np.mean(sentiment_scores) if sentiment_scores else 0
         allocation = suggest_allocation(avg_score)
+        if detailed_results:
+            await run_db(record_scored_articles, db_path, ticker, articles, detailed_results)
+        aggregates = await run_db(get_aggregates, db_path, ticker)
 
         return {
             'success': True,
@@ -364,129 +600,304 @@ async def get_sentiment_analysis(ticker: str, headlines: int = 15):
             'average_score': float(avg_score),
             'allocation_suggestion': allocation,
             'headlines': detailed_results[:10],
-            'total_headlines_analyzed': len(news_headlines)
+            'total_headlines_analyzed': len(news_headlines),
+            'aggregates': aggregates,
+            'source': 'live'
         }
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Error analyzing sentiment for {ticker}: {str(e)}')
 
 @app.post("/api/bulk-sentiment")
-async def get_bulk_sentiment(request: BulkSentimentRequest):
-    """Get sentiment analysis for multiple tickers."""
+async def get_bulk_sentiment(request: BulkSentimentRequest, http_request: Request):
+    """
+    Get sentiment analysis for multiple tickers.
+
+    News for all tickers is loaded concurrently (from the local archive, with
+    NewsAPI only queried for uncovered time ranges), the distinct headlines are
+    scored in a single batched inference pass, and scores are fanned back out
+    per ticker.
+    """
     if not request.tickers:
         raise HTTPException(status_code=400, detail="No tickers provided")
+    if components.state('finbert') in ('pending', 'loading'):
+        raise HTTPException(status_code=503, detail="Sentiment model is warming up", headers={"Retry-After": "5"})
 
-    results = {}
-    for ticker in request.tickers:
+    async with admission.admit('bulk_sentiment', client_id(http_request)):
+        return await _bulk_sentiment(request)
+
+async def _bulk_sentiment(request: BulkSentimentRequest):
+    tickers = list(dict.fromkeys(t.upper() for t in request.tickers))
+    db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
+    news_by_ticker = await load_many_tickers_news(db_path, tickers, SENTIMENT_LOOKBACK_DAYS, 10)
+
+    # Syndicated headlines often repeat across tickers; score each story once
+    unique_headlines = list(dict.fromkeys(
+        h for headlines in news_by_ticker.values() if not isinstance(headlines, Exception) for h in headlines
+    ))
+    scored_by_text = {}
+    inference_error = None
+    if unique_headlines and finbert_pipeline:
         try:
-            headlines = fetch_ticker_news(ticker.upper(), 10)
-            if headlines:
-                sentiment_counts, sentiment_scores, _ = analyze_headline_sentiment(headlines)
-                avg_score = np.mean(sentiment_scores) if sentiment_scores else 0
-                allocation = suggest_allocation(avg_score)
-                results[ticker.upper()] = {
-                    'sentiment_counts': sentiment_counts,
-                    'average_score': float(avg_score),
-                    'allocation_suggestion': allocation,
-                    'headlines_count': len(headlines)
-                }
-            else:
-                results[ticker.upper()] = {
-                    'sentiment_counts': {'positive': 0, 'neutral': 0, 'negative': 0},
-                    'average_score': 0,
-                    'allocation_suggestion': suggest_allocation(0),
-                    'headlines_count': 0
-                }
+            scored = await asyncio.to_thread(score_headlines_deduped, finbert_pipeline, unique_headlines)
+            scored_by_text = dict(zip(unique_headlines, scored))
+        except InferenceQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
         except Exception as e:
-            results[ticker.upper()] = {
-                'error': str(e),
+            print(f"Error analyzing sentiment: {e}")
+            inference_error = str(e)
+
+    results = {}
+    for ticker in tickers:
+        headlines = news_by_ticker[ticker]
+        error = str(headlines) if isinstance(headlines, Exception) else inference_error
+        if error:
+            results[ticker] = {
+                'error': error,
                 'sentiment_counts': {'positive': 0, 'neutral': 0, 'negative': 0},
                 'average_score': 0,
                 'allocation_suggestion': suggest_allocation(0),
                 'headlines_count': 0
             }
+            continue
+
+        scored = [scored_by_text[h] for h in headlines if h in scored_by_text]
+        sentiment_counts, sentiment_scores, _ = summarize_scored_headlines(headlines, scored)
+        avg_score = np.mean(sentiment_scores) if sentiment_scores else 0
+        results[ticker] = {
+            'sentiment_counts': sentiment_counts,
+            'average_score': float(avg_score),
+            'allocation_suggestion': suggest_allocation(avg_score),
+            'headlines_count': len(headlines)
+        }
     return {'success': True, 'results': results}
 
+@app.get("/api/sentiment/metrics")
+async def get_sentiment_metrics():
+    """Inference queue and sentiment cache statistics."""
+    worker = None
+    if isinstance(finbert_pipeline, SentimentWorkerClient):
+        worker = {**finbert_pipeline.stats(), "status": await asyncio.to_thread(finbert_pipeline.ping)}
+    return {
+        "batchers": batcher_stats(),
+        "worker": worker,
+        "cache": get_sentiment_cache().stats(),
+        "near_duplicates": dedup_stats.snapshot(),
+        "news_feed": news_feed.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
 
-@app.get("/api/news", response_model=List[NewsItem])
-async def get_news():
-    api_key = config.get('NEWS_API_KEY')
-    url = (
-    "https://newsapi.org/v2/top-headlines?"
-    "category=business&language=en&pageSize=8&apiKey={}".format(api_key)
-    )
 
+def annotate_news_sentiment(articles):
+    """
+    Builds NewsItem dicts, taking sentiment from the sentiment cache.
+
+    Runs in the feed's background refresh, so headlines not yet cached are
+    scored there when the model is loaded rather than on a request.
+    """
+    titles = [a['title'] for a in articles]
+    labels = [''] * len(titles)
     try:
-        resp = requests.get(url, timeout=7)
-        if resp.status_code == 200:
-            articles = resp.json().get("articles", [])
-            news_items = []
-            for a in articles:
-                news_items.append({
-                    "title": a["title"],
-                    "summary": a["description"] or "",
-                    "sentiment": "",
-                    "time": a["publishedAt"],
-                    "url": a.get("url")
-                })
-            return news_items
+        if finbert_pipeline is not None:
+            labels = [r['label'] for r in score_headlines(finbert_pipeline, titles)]
         else:
-            raise HTTPException(status_code=500, detail="News API error")
+            keys = [headline_key(t, MODEL_VERSION) for t in titles]
+            cached = get_sentiment_cache().get_many(keys)
+            labels = [cached[k]['label'] if k in cached else '' for k in keys]
+    except Exception as e:
+        print(f"Error scoring news feed: {e}")
+    return [
+        {
+            "title": a['title'],
+            "summary": a['summary'],
+            "sentiment": label,
+            "time": a['published_at'] or "",
+            "url": a['url']
+        }
+        for a, label in zip(articles, labels)
+    ]
+
+news_feed = CachedNewsFeed(
+    lambda: fetch_top_headlines_async(NEWS_FEED_SIZE),
+    ttl_seconds=NEWS_FEED_TTL,
+    annotate=annotate_news_sentiment
+)
+
+@app.get("/api/news", response_model=List[NewsItem])
+async def get_news():
+    """Top business headlines, served from memory and refreshed in the background every NEWS_FEED_TTL_SECONDS"""
+    try:
+        return await news_feed.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"News fetch failed: {e}")
 
+async def _chat_forecast(user_input, http_request):
+    """Runs a 'forecast [TICKER] for [DAYS] days in [CURRENCY]' chat request."""
+    try:
+        parts = user_input.split()
+        ticker = parts[1].upper()
+        days = int(parts[3])
+        currency = parts[6].upper()
+        db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
+        # Chat forecasts share the /api/forecast limits
+        with span('chat.forecast', symbol=ticker, horizon=days, currency=currency):
+            async with admission.admit('forecast', client_id(http_request)):
+                await asyncio.to_thread(run_etl_pipeline, 'market', [ticker], db_path)
+                with span('forecast.generate', symbol=ticker):
+                    forecast_results = await run_cpu(generate_forecasts, db_path, [ticker], days, currency)
+                forecast_df = forecast_results.get(ticker, {}).get('forecast')
+                last_actual_price = await run_db(get_last_close_price, db_path, ticker)
+            with span('allocation.decision', symbol=ticker) as decision_span:
+                decision, justification = get_allocation_decision(forecast_df, last_actual_price, days)
+                decision_span.set_attribute('decision', decision)
+        response_text = f"Forecast completed for {ticker}.\n\nDecision: {decision}\nJustification: {justification}"
+        return ChatResponse(response=response_text, type="forecast")
+    except (IndexError, ValueError) as e:
+        return ChatResponse(
+            response="Invalid forecast format. Please use: 'forecast [TICKER] for [DAYS] days in [CURRENCY]'",
+            type="general"
+        )
+
+EMPTY_ANSWER_MESSAGE = "I'm here to help with your financial questions. Could you please rephrase your question?"
+CHAT_ERROR_MESSAGE = "I'm experiencing some technical difficulties. Please try again later."
+
+async def _general_answer_chunks(user_input):
+    """Yields the Groq answer as it streams in, over the shared async client."""
+    client = get_async_groq_client()
+    if client is None:
+        yield QA_DISABLED_MESSAGE
+        return
+    async for content in stream_answer_async(client, user_input):
+        yield content
+
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat_with_ai(message: ChatMessage):
+async def chat_with_ai(message: ChatMessage, http_request: Request):
     """Handle AI chat requests"""
     try:
         user_input = message.message.strip()
 
         if user_input.lower().startswith('forecast'):
-            try:
-                parts = user_input.split()
-                ticker = parts[1].upper()
-                days = int(parts[3])
-                currency = parts[6].upper()
-                db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
-                run_etl_pipeline('market', [ticker], db_path)
-                forecast_results = generate_forecasts(db_path, [ticker], days, currency)
-                forecast_df = forecast_results.get(ticker, {}).get('forecast')
-                last_actual_price = get_last_close_price(db_path, ticker)
-                decision, justification = get_allocation_decision(forecast_df, last_actual_price, days)
-                response_text = f"Forecast completed for {ticker}.\n\nDecision: {decision}\nJustification: {justification}"
-                return ChatResponse(response=response_text, type="forecast")
-            except (IndexError, ValueError) as e:
-                return ChatResponse(
-                    response="Invalid forecast format. Please use: 'forecast [TICKER] for [DAYS] days in [CURRENCY]'",
-                    type="general"
-                )
+            return await _chat_forecast(user_input, http_request)
         else:
             try:
-                import io
-                import sys
-                from contextlib import redirect_stdout
-                f = io.StringIO()
-                with redirect_stdout(f):
-                    handle_general_question(user_input)
-                ai_response = f.getvalue()
-                if not ai_response.strip():
-                    ai_response = "I'm here to help with your financial questions. Could you please rephrase your question?"
-                return ChatResponse(response=ai_response, type="general")
+                ai_response = "".join([chunk async for chunk in _general_answer_chunks(user_input)])
             except Exception as e:
-                return ChatResponse(
-                    response="I'm experiencing some technical difficulties. Please try again later.",
-                    type="general"
-                )
+                getLogger(__name__).warning(f"Chat answer failed: {e}")
+                return ChatResponse(response=CHAT_ERROR_MESSAGE, type="general")
+            if not ai_response.strip():
+                ai_response = EMPTY_ANSWER_MESSAGE
+            return ChatResponse(response=ai_response, type="general")
+    except Rejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
 
+async def _chat_events(user_input, started, forecast=None):
+    """SSE events for /api/chat/stream; first_token_ms counts from request arrival."""
+    if forecast is not None:
+        yield format_sse('token', {'text': forecast.response})
+        yield format_sse('done', {'type': forecast.type})
+        return
+    first_token_ms = None
+    try:
+        async for content in _general_answer_chunks(user_input):
+            if first_token_ms is None:
+                first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+            yield format_sse('token', {'text': content})
+    except Exception as e:
+        getLogger(__name__).warning(f"Streaming chat failed: {e}")
+        yield format_sse('error', {'message': CHAT_ERROR_MESSAGE})
+        return
+    if first_token_ms is None:
+        yield format_sse('token', {'text': EMPTY_ANSWER_MESSAGE})
+    yield format_sse('done', {'type': 'general', 'first_token_ms': first_token_ms})
+
+@app.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage, http_request: Request):
+    """
+    Streaming /api/chat as server-sent events: 'token' events carry answer
+    text as Groq produces it, then a 'done' event with the response type and
+    time to first token, or an 'error' event. Forecast requests complete
+    before the response starts and arrive as a single token event.
+    """
+    started = time.perf_counter()
+    user_input = message.message.strip()
+    forecast = None
+    if user_input.lower().startswith('forecast'):
+        try:
+            forecast = await _chat_forecast(user_input, http_request)
+        except Rejected:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
+    return StreamingResponse(
+        _chat_events(user_input, started, forecast),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def encode_forecast(response, fmt):
+    """
+    Columnar or Arrow encoding of a forecast response. Columnar keeps the
+    response shape with each forecast as {date: [...], open: [...], ...};
+    Arrow is one table with a symbol column across all successful forecasts.
+    """
+    if fmt == 'arrow':
+        frames = [
+            result['forecast'].assign(symbol=symbol)
+            for symbol, result in response['results'].items() if result.get('forecast') is not None
+        ]
+        if not frames:
+            raise HTTPException(status_code=500, detail="Error generating forecast: no forecast produced")
+        return columns_to_arrow(frame_to_columns(pd.concat(frames))), ARROW_MEDIA_TYPE
+    results = {}
+    for symbol, result in response['results'].items():
+        forecast = result.get('forecast')
+        results[symbol] = {**result, 'forecast': frame_to_columns(forecast) if forecast is not None else None}
+    return dumps({**response, 'results': results}), COLUMNAR_MEDIA_TYPE
+
 @app.post("/api/forecast")
-async def generate_forecast(request: ForecastRequest, background_tasks: BackgroundTasks):
-    """Generate stock forecast"""
+async def generate_forecast(request: ForecastRequest, background_tasks: BackgroundTasks, http_request: Request):
+    """
+    Generate stock forecast.
+
+    Supports the same ?format= / Accept negotiation as /api/portfolio/history;
+    the default JSON keeps each forecast as {column: {date: value}}.
+    """
+    try:
+        fmt = negotiate_format(http_request)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    async with admission.admit('forecast', client_id(http_request)):
+        return await _generate_forecast(request, background_tasks, http_request, fmt)
+
+async def _generate_forecast(request: ForecastRequest, background_tasks: BackgroundTasks, http_request: Request, fmt):
     try:
         db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
         background_tasks.add_task(run_etl_pipeline, 'market', [request.ticker], db_path)
-        forecast_results = generate_forecasts(db_path, [request.ticker], request.days, request.currency)
-        return {"status": "success", "results": forecast_results}
+        # ARIMA fits are CPU-bound; run them in the process pool
+        forecast_results = await run_cpu(generate_forecasts, db_path, [request.ticker], request.days, request.currency)
+        if request.include_chart:
+            for symbol, result in forecast_results.items():
+                if result.get('forecast') is None:
+                    continue
+                # Build (or fetch the cached) chart spec off the event loop thread
+                result['chart'] = await asyncio.to_thread(
+                    get_forecast_chart_spec, result['forecast_key'], result['forecast'],
+                    symbol, request.days, result['currency']
+                )
+        response = {"status": "success", "results": forecast_results}
+        if fmt == 'json':
+            return response
+        body, media_type = await asyncio.to_thread(encode_forecast, response, fmt)
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        body = maybe_gzip(http_request, body, headers)
+        return Response(content=body, media_type=media_type, headers=headers)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating forecast: {str(e)}")
 
@@ -503,9 +914,32 @@ async def execute_trade(request: TradeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error executing trade: {str(e)}")
 
+def get_market_sentiment_from_db(db_path):
+    """Market-wide aggregates plus the 7-day top movers"""
+    aggregates = get_aggregates(db_path, MARKET_KEY)
+    bullish, bearish = get_top_movers(db_path, '7d') if '7d' in aggregates else ([], [])
+    return aggregates, bullish, bearish
+
 @app.get("/api/analytics/sentiment")
 async def get_market_sentiment():
-    """Get AI market sentiment analysis"""
+    """Get AI market sentiment analysis from the market-wide rolling aggregates"""
+    db_path = config.get('DATABASE_PATH', 'database/financial_data.db')
+    aggregates, bullish, bearish = await run_db(get_market_sentiment_from_db, db_path)
+    if '7d' in aggregates:
+        ewma_7d = aggregates['7d']['ewma']
+        ewma_1d = aggregates['1d']['ewma']
+        sentiment = "Bullish" if ewma_7d > 0.1 else "Bearish" if ewma_7d < -0.1 else "Neutral"
+        factors = [f"Most positive coverage: {t} ({score:+.2f})" for t, score, _ in bullish]
+        factors += [f"Most negative coverage: {t} ({score:+.2f})" for t, score, _ in bearish]
+        factors.append(f"1-day sentiment {ewma_1d:+.2f} vs 7-day {ewma_7d:+.2f}")
+        return {
+            "sentiment": sentiment,
+            # Scaled so that an average |score| of 0.5 or more reads as full confidence
+            "confidence": int(round(min(abs(ewma_7d) / 0.5, 1.0) * 100)),
+            "factors": factors,
+            "aggregates": aggregates
+        }
+
     return {
         "sentiment": "Bullish",
         "confidence": 85,
@@ -518,13 +952,77 @@ async def get_market_sentiment():
 
 @app.get("/api/health")
 async def health_check():
-    """API health check"""
+    """API health check with separate liveness and readiness"""
+    snapshot = components.snapshot()
+    ready = components.is_ready()
+    degraded = any(c['state'] == 'failed' for c in snapshot.values())
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy" if ready else "starting",
+        "live": True,
+        "ready": ready,
+        "uptime_seconds": uptime_seconds(),
+        "components": snapshot,
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0"
     }
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"live": True, "uptime_seconds": uptime_seconds()}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness probe: 503 until every required component has loaded, and for good if one failed"""
+    ready = components.is_ready()
+    body = {"ready": ready, "components": components.snapshot()}
+    return JSONResponse(content=body, status_code=200 if ready else 503)
+
+@app.get("/api/runtime/metrics")
+async def get_runtime_metrics():
+    """Event-loop lag, executor pool utilisation, SQLite connection pool and admission metrics"""
+    return {
+        "loop_lag": loop_lag.snapshot(),
+        "pools": {"db": db_pool_stats.snapshot(), "cpu": cpu_pool_stats.snapshot()},
+        "sqlite": sqlite_pool_stats(),
+        "response_cache": response_cache.stats(),
+        "market_feed": market_feed.stats(),
+        "admission": admission.snapshot(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _cache_metrics():
+    lookups = {
+        'response': response_cache.stats(),
+        'sentiment': get_sentiment_cache().stats(),
+    }
+    chart = chart_cache_lookups.export()
+    lookups['chart'] = {'hits': chart.get(('hit',), 0), 'misses': chart.get(('miss',), 0)}
+    feed = news_feed.stats()
+    # Stale copies are still served, but each one means the feed is being refreshed
+    lookups['news_feed'] = {'hits': feed['hits'], 'misses': feed['stale_hits']}
+
+    def ratio(stats):
+        total = stats['hits'] + stats['misses']
+        return stats['hits'] / total if total else 0.0
+
+    return [
+        ('cache_lookups_total', 'counter', 'Cache lookups by cache and result', [
+            ({'cache': name, 'result': result}, stats[key])
+            for name, stats in lookups.items() for result, key in (('hit', 'hits'), ('miss', 'misses'))
+        ]),
+        ('cache_hit_ratio', 'gauge', 'Cache hit ratio since process start', [
+            ({'cache': name}, ratio(stats)) for name, stats in lookups.items()
+        ]),
+    ]
+
+REGISTRY.register_collector(_cache_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
 from fastapi import APIRouter
 from typing import List
 
@@ -543,20 +1041,41 @@ class PortfolioHistoryItem(BaseModel):
     date: str
     total_value: float
 
+def get_portfolio_history_from_db():
+    """Daily total portfolio value from market data"""
+    with get_db_connection() as conn:
+        query = """
+        SELECT date, SUM(close * volume) AS total_value
+        FROM market_data
+        GROUP BY date
+        ORDER BY date ASC
+        """
+        return pd.read_sql_query(query, conn)
+
 @app.get("/api/portfolio/history", response_model=List[PortfolioHistoryItem])
-async def get_portfolio_history():
+async def get_portfolio_history(request: Request):
     """
     Get portfolio performance history (time series).
+
+    Rows of {date, total_value} by default; ?format=columnar (or Accept:
+    application/vnd.quantfin.columnar+json) returns {date: [...], total_value: [...]}
+    and ?format=arrow (or Accept: application/vnd.apache.arrow.stream) an
+    Arrow IPC stream with the same columns.
     """
     try:
-        with get_db_connection() as conn:
-            query = """
-            SELECT date, SUM(close * volume) AS total_value
-            FROM market_data
-            GROUP BY date
-            ORDER BY date ASC
-            """
-            df = pd.read_sql_query(query, conn)
+        fmt = negotiate_format(request)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+    def encode(history):
+        columns = rows_to_columns(history, ["date", "total_value"])
+        if fmt == 'arrow':
+            return columns_to_arrow(columns), ARROW_MEDIA_TYPE
+        return dumps(columns), COLUMNAR_MEDIA_TYPE
+
+    async def build():
+        try:
+            df = await run_db(get_portfolio_history_from_db)
             if not df.empty:
                 history = [
                     {"date": row["date"], "total_value": float(row["total_value"])}
@@ -566,13 +1085,19 @@ async def get_portfolio_history():
             else:
                 from datetime import datetime, timedelta
                 today = datetime.today()
-                return [
+                return Fallback([
                     {"date": (today - timedelta(days=i)).strftime("%Y-%m-%d"), "total_value": 100000 + 500*i}
                     for i in range(10, -1, -1)
-                ]
-    except Exception as e:
-        print(f"Error in get_portfolio_history: {e}")
-        raise HTTPException(status_code=500, detail="Unable to get portfolio history")
+                ])
+        except Exception as e:
+            print(f"Error in get_portfolio_history: {e}")
+            raise HTTPException(status_code=500, detail="Unable to get portfolio history")
+    try:
+        if fmt == 'json':
+            return await cached_json(request, "portfolio-history", build)
+        return await cached_json(request, f"portfolio-history:{fmt}", build, encode)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,10 +3,13 @@ from flask_cors import CORS
 import requests
 import numpy as np
 from datetime import datetime, timedelta
-from transformers import pipeline
 import json
 import os
 import logging
+from transformers import pipeline
+
+# Standalone server: only the batching helper, none of the API's config or caches
+from sentiment.inference import batched_predict, to_numerical_score
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', template_folder='templates')
@@ -80,14 +83,12 @@ def analyze_headline_sentiment(headlines):
     results = []
 
     try:
-        for text in headlines:
-            # FinBERT max length is 512 tokens
-            result = finbert(text[:512])[0]
+        # Batched forward passes; truncation to 512 tokens happens in the tokenizer
+        predictions = batched_predict(finbert, headlines)
+        for text, result in zip(headlines, predictions):
             label = result['label'].lower()
             score = result['score']
-
-            # Convert to numerical score
-            numerical_score = score if label == 'positive' else -score if label == 'negative' else 0
+            numerical_score = to_numerical_score(label, score)
             sentiment_scores.append(numerical_score)
             sentiment_counts[label] += 1
             results.append({
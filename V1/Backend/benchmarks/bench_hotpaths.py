@@ -0,0 +1,349 @@
+"""
+Microbenchmarks for the core hot paths, with a results file and regression check.
+
+Runs each case on seeded synthetic data (random-walk OHLCV for a set of
+symbols, generated headlines) in a scratch database:
+
+  save_to_db              _save_to_db bulk insert into an empty market_data table
+  load_data_from_db       one symbol's full history
+  add_technical_indicators
+  arima_forecast          fit + 30-day forecast
+  backtest_arima          fit on all but the last 30 days + forecast
+  generate_ohlc_from_close
+  analyze_headline_sentiment   cold sentiment cache, FinBERT batched inference
+  portfolio_query / market_data_query / portfolio_history_query
+
+Cases whose dependencies are missing (statsmodels, ta, the FinBERT weights)
+are recorded as skipped. Each timed call runs with the garbage collector
+paused, after untimed setup and warm-up calls.
+
+    python benchmarks/bench_hotpaths.py --output results/base.json
+    python benchmarks/bench_hotpaths.py --output results/new.json --baseline results/base.json
+    python benchmarks/bench_hotpaths.py --compare results/base.json results/new.json --threshold 0.15
+
+Comparison uses the median and exits with status 1 when any case is slower
+than the baseline by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+RESULTS_VERSION = 1
+SYMBOLS = ['AAPL', 'MSFT', 'GOOGL', 'TSLA', 'RELIANCE.NS', 'TCS.NS', 'INFY.NS', 'HDFCBANK.NS']
+
+
+class Case:
+    """One benchmark: `run` is timed, `setup` runs untimed before each call."""
+    def __init__(self, run, setup=None, items=None, unit=None):
+        self.run = run
+        self.setup = setup
+        self.items = items
+        self.unit = unit
+
+
+class Skip(Exception):
+    pass
+
+
+# --- synthetic data ---------------------------------------------------------
+
+def make_ohlcv_rows(symbols, days, seed):
+    """market_data rows: a seeded random walk per symbol over `days` weekdays."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=date.today(), periods=days)
+    rows = []
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, days)))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, days))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, days))
+        volume = rng.integers(1_000_000, 50_000_000, days)
+        for i, day in enumerate(dates):
+            rows.append({
+                'symbol': symbol, 'date': day.date(), 'open': float(open_[i]), 'high': float(high[i]),
+                'low': float(low[i]), 'close': float(close[i]), 'volume': int(volume[i])
+            })
+    return rows
+
+
+def make_headlines(n, seed):
+    from bench_sentiment import make_headlines as generate
+    return generate(n, seed)
+
+
+# --- cases ------------------------------------------------------------------
+
+def case_save_to_db(ctx):
+    from data.etl_pipeline import _save_to_db, _setup_database
+    rows = make_ohlcv_rows(SYMBOLS[:2], ctx.days, ctx.seed)
+    db_path = ctx.scratch / 'insert.db'
+
+    def setup():
+        from data.db_pool import write_connection
+        _setup_database(db_path)
+        with write_connection(db_path) as conn:
+            conn.execute('DELETE FROM market_data')
+
+    return Case(lambda: _save_to_db(db_path, 'market_data', rows), setup, len(rows), 'rows')
+
+
+def case_load_data_from_db(ctx):
+    from stock_forecast import load_data_from_db
+    return Case(lambda: load_data_from_db(ctx.db_path, 'AAPL'), items=ctx.days, unit='rows')
+
+
+def case_add_technical_indicators(ctx):
+    from stock_forecast import add_technical_indicators, load_data_from_db
+    try:
+        import ta  # noqa: F401
+    except ImportError as e:
+        raise Skip(str(e))
+    df = load_data_from_db(ctx.db_path, 'AAPL')
+    return Case(lambda: add_technical_indicators(df), items=len(df), unit='rows')
+
+
+def _arima_input(ctx):
+    from stock_forecast import load_data_from_db
+    try:
+        import statsmodels  # noqa: F401
+    except ImportError as e:
+        raise Skip(str(e))
+    # ARIMA fit time grows with history; use a fixed window so runs stay comparable
+    return load_data_from_db(ctx.db_path, 'AAPL').iloc[-ctx.arima_window:]
+
+
+def case_arima_forecast(ctx):
+    from stock_forecast import arima_forecast
+    df = _arima_input(ctx)
+    return Case(lambda: arima_forecast(df, 30), items=1, unit='fits')
+
+
+def case_backtest_arima(ctx):
+    from stock_forecast import backtest_arima
+    df = _arima_input(ctx)
+    return Case(lambda: backtest_arima(df, test_size=30), items=1, unit='fits')
+
+
+def case_generate_ohlc_from_close(ctx):
+    from stock_forecast import generate_ohlc_from_close
+    forecast = pd.Series(100 * np.exp(np.cumsum(np.random.default_rng(ctx.seed).normal(0, 0.01, 365))))
+    return Case(lambda: generate_ohlc_from_close(forecast, seed=ctx.seed), items=len(forecast), unit='days')
+
+
+def case_analyze_headline_sentiment(ctx):
+    import api_server
+    from sentiment.cache import get_sentiment_cache
+    from sentiment.finbert import load_finbert_pipeline
+    try:
+        api_server.finbert_pipeline = api_server.finbert_pipeline or load_finbert_pipeline()
+    except Exception as e:
+        raise Skip(f"FinBERT unavailable: {e}")
+    headlines = make_headlines(ctx.headlines, ctx.seed)
+    cache = get_sentiment_cache()
+    return Case(lambda: api_server.analyze_headline_sentiment(headlines), cache.clear, len(headlines), 'headlines')
+
+
+def case_portfolio_query(ctx):
+    import api_server
+    return Case(api_server.get_portfolio_from_db, items=1, unit='queries')
+
+
+def case_market_data_query(ctx):
+    import api_server
+    return Case(api_server.get_market_data_from_db, items=1, unit='queries')
+
+
+def case_portfolio_history_query(ctx):
+    import api_server
+    return Case(api_server.get_portfolio_history_from_db, items=ctx.days, unit='rows')
+
+
+CASES = {
+    'save_to_db': case_save_to_db,
+    'load_data_from_db': case_load_data_from_db,
+    'add_technical_indicators': case_add_technical_indicators,
+    'arima_forecast': case_arima_forecast,
+    'backtest_arima': case_backtest_arima,
+    'generate_ohlc_from_close': case_generate_ohlc_from_close,
+    'analyze_headline_sentiment': case_analyze_headline_sentiment,
+    'portfolio_query': case_portfolio_query,
+    'market_data_query': case_market_data_query,
+    'portfolio_history_query': case_portfolio_history_query,
+}
+
+
+# --- runner -----------------------------------------------------------------
+
+def time_case(case, repeat, warmup):
+    for _ in range(warmup):
+        if case.setup:
+            case.setup()
+        case.run()
+    timings = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            case.run()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    median = statistics.median(timings)
+    result = {
+        'repeat': repeat,
+        'median_s': median,
+        'min_s': min(timings),
+        'mean_s': statistics.fmean(timings),
+        'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+    if case.items:
+        result.update({'items': case.items, 'unit': case.unit, 'items_per_s': case.items / median})
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Context:
+    def __init__(self, args, scratch):
+        self.scratch = scratch
+        self.db_path = scratch / 'bench.db'
+        self.days = args.days
+        self.seed = args.seed
+        self.headlines = args.headlines
+        self.arima_window = args.arima_window
+
+
+def run_suite(args):
+    scratch = Path(tempfile.mkdtemp(prefix='quantfin-bench-'))
+    # Point the API's queries and the sentiment cache at the scratch database
+    os.environ['DATABASE_PATH'] = str(scratch / 'bench.db')
+    os.environ['SENTIMENT_CACHE_PATH'] = str(scratch / 'sentiment-cache.db')
+    random.seed(args.seed)
+
+    from data.etl_pipeline import _save_to_db, _setup_database
+    ctx = Context(args, scratch)
+    _setup_database(ctx.db_path)
+    _save_to_db(ctx.db_path, 'market_data', make_ohlcv_rows(SYMBOLS, args.days, args.seed))
+
+    results = {}
+    try:
+        for name, build in CASES.items():
+            if args.only and name not in args.only:
+                continue
+            try:
+                case = build(ctx)
+                results[name] = time_case(case, args.repeat, args.warmup)
+            except Skip as e:
+                results[name] = {'skipped': str(e)}
+            print(_format_result(name, results[name]), flush=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'args': {k: v for k, v in vars(args).items() if k not in ('compare', 'output', 'baseline')},
+        },
+        'results': results,
+    }
+
+
+def _format_result(name, result):
+    if 'skipped' in result:
+        return f"  {name:<28} skipped ({result['skipped']})"
+    line = f"  {name:<28} {result['median_s'] * 1000:10.3f} ms  (min {result['min_s'] * 1000:.3f}, ±{result['stdev_s'] * 1000:.3f})"
+    if 'items_per_s' in result:
+        line += f"  {result['items_per_s']:,.0f} {result['unit']}/s"
+    return line
+
+
+def compare(baseline, candidate, threshold):
+    """Prints median ratios per case; returns the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<30} {'baseline ms':>12} {'candidate ms':>13} {'change':>8}")
+    for name in sorted(set(baseline['results']) | set(candidate['results'])):
+        base, new = baseline['results'].get(name), candidate['results'].get(name)
+        if not base or not new or 'skipped' in base or 'skipped' in new:
+            print(f"{name:<30} {'-':>12} {'-':>13} {'n/a':>8}")
+            continue
+        change = new['median_s'] / base['median_s'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:<30} {base['median_s'] * 1000:12.3f} {new['median_s'] * 1000:13.3f} {change:+8.1%}{flag}")
+    for label, results in (('baseline', baseline), ('candidate', candidate)):
+        meta = results['meta']
+        print(f"{label}: commit {meta.get('commit')} on {meta.get('platform')}, python {meta.get('python')}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot path microbenchmarks')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--baseline', help='Compare this run against a results file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'), help='Compare two results files')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative slowdown flagged as a regression')
+    parser.add_argument('--only', nargs='+', choices=list(CASES), help='Run only these cases')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--days', type=int, default=1500, help='Trading days of history per symbol')
+    parser.add_argument('--arima-window', type=int, default=500, help='Days of history fed to ARIMA')
+    parser.add_argument('--headlines', type=int, default=128)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, candidate = (json.loads(Path(p).read_text()) for p in args.compare)
+        return 1 if compare(baseline, candidate, args.threshold) else 0
+
+    print(f"Hot path benchmarks ({args.repeat} runs each, seed {args.seed})")
+    results = run_suite(args)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        return 1 if compare(json.loads(Path(args.baseline).read_text()), results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Event-loop responsiveness under mixed load.
+
+Starts the API server, waits until it is ready, then runs forecast, chat,
+sentiment and DB-backed dashboard requests concurrently while a probe
+measures /api/health/live latency. A blocked event loop shows up as probe
+latency and as lag in /api/runtime/metrics.
+
+    python benchmarks/bench_loop_lag.py --duration 30 --concurrency 8
+    python benchmarks/bench_loop_lag.py --url http://127.0.0.1:8000   # existing server
+"""
+
+import argparse
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+project_root = Path(__file__).resolve().parent.parent
+
+MIXED_LOAD = [
+    ('POST', '/api/forecast', {'ticker': 'AAPL', 'days': 30, 'currency': 'USD'}),
+    ('POST', '/api/chat', {'message': 'What is a mutual fund?'}),
+    ('GET', '/api/sentiment-analysis?ticker=AAPL', None),
+    ('GET', '/api/portfolio/history', None),
+    ('GET', '/api/portfolio', None),
+    ('GET', '/api/market-data', None),
+    ('GET', '/api/news', None),
+]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(ready_timeout):
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api_server:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=project_root, env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.perf_counter() + ready_timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if requests.get(f"{base}/api/health/ready", timeout=2).status_code == 200:
+                return server, base
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not become ready")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def run_load(base, duration, concurrency):
+    stop = threading.Event()
+    counts = {}
+    lock = threading.Lock()
+    requests_iter = itertools.cycle(MIXED_LOAD)
+
+    def worker():
+        session = requests.Session()
+        while not stop.is_set():
+            with lock:
+                method, path, body = next(requests_iter)
+            try:
+                status = session.request(method, base + path, json=body, timeout=120).status_code
+            except requests.RequestException:
+                status = 'error'
+            with lock:
+                counts[(path.split('?')[0], status)] = counts.get((path.split('?')[0], status), 0) + 1
+
+    probe_latencies = []
+
+    def probe():
+        session = requests.Session()
+        while not stop.is_set():
+            start = time.perf_counter()
+            session.get(f"{base}/api/health/live", timeout=30)
+            probe_latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.05)
+
+    with ThreadPoolExecutor(max_workers=concurrency + 1) as pool:
+        pool.submit(probe)
+        for _ in range(concurrency):
+            pool.submit(worker)
+        time.sleep(duration)
+        stop.set()
+    return counts, probe_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Event-loop lag under mixed load')
+    parser.add_argument('--url', help='Use an already running server instead of starting one')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--ready-timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    server = None
+    base = args.url
+    if base is None:
+        server, base = start_server(args.ready_timeout)
+    try:
+        counts, probe = run_load(base, args.duration, args.concurrency)
+        runtime = requests.get(f"{base}/api/runtime/metrics", timeout=5).json()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"Mixed load: {args.concurrency} clients for {args.duration:.0f}s")
+    for (path, status), n in sorted(counts.items(), key=lambda kv: str(kv[0])):
+        print(f"  {path:<28} {status!s:<6} {n:6d}")
+    if probe:
+        print(f"\n/api/health/live during load ({len(probe)} probes)")
+        print(f"  p50 {statistics.median(probe):8.1f} ms   p99 {percentile(probe, 0.99):8.1f} ms   max {max(probe):8.1f} ms")
+    lag = runtime['loop_lag']
+    if lag.get('samples'):
+        print(f"\nEvent-loop lag ({lag['samples']} samples every {lag['interval_ms']:.0f} ms)")
+        print(f"  p50 {lag['p50_ms']:8.1f} ms   p99 {lag['p99_ms']:8.1f} ms   max {lag['max_ms']:8.1f} ms   "
+              f"slow ticks {lag['slow_ticks']}")
+    print(f"\nPools: {runtime['pools']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
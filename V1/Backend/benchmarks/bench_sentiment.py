@@ -0,0 +1,82 @@
+"""
+Benchmark for FinBERT headline sentiment throughput on CPU.
+
+Compares the old per-headline path (one forward pass per headline) with the
+batched, length-bucketed path used by analyze_headline_sentiment.
+
+    python benchmarks/bench_sentiment.py --headlines 256 --batch-sizes 8 16 32
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sentiment.finbert import load_finbert_pipeline, predict_sentiment
+
+SUBJECTS = ['Apple', 'Tesla', 'Microsoft', 'Nvidia', 'Reliance', 'TCS', 'Infosys', 'HDFC Bank']
+EVENTS = [
+    'shares rise after strong quarterly earnings',
+    'stock slides as regulators open probe into accounting practices',
+    'announces leadership change ahead of investor day',
+    'beats revenue estimates but guidance disappoints analysts',
+    'to cut jobs amid slowing demand',
+    'unveils new product line at annual conference',
+    'hit with downgrade on valuation concerns',
+    'expands buyback programme after record cash flow',
+]
+TAILS = ['', ' - report', ', sources say', ' as markets await Fed decision', ' in volatile trading session']
+
+
+def make_headlines(n, seed=42):
+    """Generates n synthetic headlines of varying length."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)}{rng.choice(TAILS)}" for _ in range(n)]
+
+
+def bench_per_item(finbert_pipeline, headlines):
+    start = time.perf_counter()
+    for text in headlines:
+        finbert_pipeline(text[:512])[0]
+    return len(headlines) / (time.perf_counter() - start)
+
+
+def bench_batched(finbert_pipeline, headlines, batch_size):
+    start = time.perf_counter()
+    predict_sentiment(finbert_pipeline, headlines, batch_size=batch_size)
+    return len(headlines) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FinBERT sentiment throughput benchmark')
+    parser.add_argument('--headlines', type=int, default=128, help='Number of synthetic headlines')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[8, 16, 32, 64])
+    parser.add_argument('--threads', type=int, help='torch intra-op threads (default: torch decides)')
+    args = parser.parse_args()
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    headlines = make_headlines(args.headlines)
+    finbert_pipeline = load_finbert_pipeline('pytorch')  # per-item path needs the transformers pipeline
+
+    # Warm up so lazy initialisation doesn't count against the first path
+    predict_sentiment(finbert_pipeline, headlines[:8])
+
+    print(f"Headlines: {len(headlines)} | torch threads: {torch.get_num_threads()}")
+    baseline = bench_per_item(finbert_pipeline, headlines)
+    print(f"{'per-item':>12}: {baseline:8.1f} headlines/sec")
+    for batch_size in args.batch_sizes:
+        rate = bench_batched(finbert_pipeline, headlines, batch_size)
+        print(f"{'batch=' + str(batch_size):>12}: {rate:8.1f} headlines/sec ({rate / baseline:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
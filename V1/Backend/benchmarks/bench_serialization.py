@@ -0,0 +1,106 @@
+"""
+Payload size and serialization time of the time-series response formats.
+
+Compares, for /api/portfolio/history-shaped and /api/forecast-shaped data:
+  - row JSON as served today (jsonable_encoder + json.dumps, like JSONResponse)
+  - columnar JSON with the fast encoder (orjson when installed)
+  - Arrow IPC stream (when pyarrow is installed)
+each raw and gzipped.
+
+    python benchmarks/bench_serialization.py --days 2520 --repeat 50
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from serialization import (  # noqa: E402
+    dumps, frame_to_columns, rows_to_columns, columns_to_arrow, UnsupportedFormat, orjson, GZIP_LEVEL
+)
+
+
+def row_json(data):
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def make_history(days):
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days)
+    values = 100000 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, days))
+    return [{"date": d.strftime('%Y-%m-%d'), "total_value": float(v)} for d, v in zip(dates, values)]
+
+
+def make_forecast(days):
+    rng = np.random.default_rng(1)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, days))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.002, days)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close
+    }, index=pd.date_range('2030-01-01', periods=days))
+
+
+def measure(encode, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode()
+        timings.append(time.perf_counter() - start)
+    return body, statistics.median(timings) * 1000
+
+
+def report(title, encoders, repeat):
+    print(f"\n{title}")
+    print(f"{'format':<16} {'bytes':>10} {'gzip bytes':>11} {'encode ms':>10} {'vs row JSON':>12}")
+    baseline = None
+    for name, encode in encoders:
+        try:
+            body, ms = measure(encode, repeat)
+        except UnsupportedFormat as e:
+            print(f"{name:<16} skipped ({e})")
+            continue
+        zipped = len(gzip.compress(body, compresslevel=GZIP_LEVEL))
+        baseline = baseline or len(body)
+        print(f"{name:<16} {len(body):>10,} {zipped:>11,} {ms:>10.2f} {len(body) / baseline:>11.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time-series serialization benchmark')
+    parser.add_argument('--days', type=int, default=2520, help='History length (default ~10 trading years)')
+    parser.add_argument('--forecast-days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"Fast JSON encoder: {'orjson' if orjson else 'stdlib json (orjson not installed)'}")
+
+    history = make_history(args.days)
+    report(f"/api/portfolio/history ({args.days} points)", [
+        ('row json', lambda: row_json(history)),
+        ('columnar json', lambda: dumps(rows_to_columns(history, ['date', 'total_value']))),
+        ('arrow ipc', lambda: columns_to_arrow(rows_to_columns(history, ['date', 'total_value']))),
+    ], args.repeat)
+
+    forecast = make_forecast(args.forecast_days)
+    response = {'status': 'success', 'results': {'AAPL': {'message': 'Success', 'forecast': forecast}}}
+    report(f"/api/forecast ({args.forecast_days} days)", [
+        ('row json', lambda: row_json(response)),
+        ('columnar json', lambda: dumps({**response, 'results': {'AAPL': {
+            'message': 'Success', 'forecast': frame_to_columns(forecast)}}})),
+        ('arrow ipc', lambda: columns_to_arrow(frame_to_columns(forecast.assign(symbol='AAPL')))),
+    ], args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Startup-time benchmark for the API server.
+
+Measures, each in a fresh interpreter:
+  - how long `import api_server` takes
+  - time until the server answers /api/health/live (first request)
+  - latency of that first request and of a first /api/market-data call
+  - time until /api/health/ready reports every component loaded
+
+    python benchmarks/bench_startup.py --runs 3
+    python benchmarks/bench_startup.py --eager    # FAST_STARTUP=false for comparison
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+project_root = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import api_server; "
+    "print(f'{time.perf_counter() - start:.4f}')"
+)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def measure_import(env):
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET], cwd=project_root, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()
+    return float(output[-1])
+
+
+def _timed_get(url):
+    start = time.perf_counter()
+    response = requests.get(url, timeout=5)
+    return response, time.perf_counter() - start
+
+
+def measure_server(env, ready_timeout):
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api_server:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    result = {}
+    try:
+        while True:
+            try:
+                _, latency = _timed_get(f"{base}/api/health/live")
+                result['first_response_s'] = time.perf_counter() - start
+                result['first_request_ms'] = latency * 1000
+                break
+            except requests.ConnectionError:
+                if server.poll() is not None:
+                    raise RuntimeError("API server exited during startup")
+                time.sleep(0.02)
+
+        _, latency = _timed_get(f"{base}/api/market-data")
+        result['market_data_ms'] = latency * 1000
+
+        while time.perf_counter() - start < ready_timeout:
+            response, _ = _timed_get(f"{base}/api/health/ready")
+            if response.status_code == 200:
+                result['ready_s'] = time.perf_counter() - start
+                break
+            time.sleep(0.1)
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API startup-time benchmark')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--eager', action='store_true', help='Load models before serving (FAST_STARTUP=false)')
+    parser.add_argument('--ready-timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    env = dict(os.environ, FAST_STARTUP='false' if args.eager else 'true')
+    imports, runs = [], []
+    for i in range(args.runs):
+        imports.append(measure_import(env))
+        runs.append(measure_server(env, args.ready_timeout))
+        print(f"run {i + 1}: import {imports[-1]:.2f}s | " +
+              " | ".join(f"{k} {v:.2f}" for k, v in runs[-1].items()))
+
+    print(f"\nMode: {'eager' if args.eager else 'fast startup'} ({args.runs} runs, median)")
+    print(f"{'import api_server':<22} {statistics.median(imports):8.2f} s")
+    for key in ('first_response_s', 'first_request_ms', 'market_data_ms', 'ready_s'):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            unit = 'ms' if key.endswith('_ms') else 's'
+            print(f"{key:<22} {statistics.median(values):8.2f} {unit}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Accuracy-parity and speed comparison of FinBERT inference backends.
+
+Every backend in sentiment/backends.py scores the fixture headlines and is
+compared with the current production path (the fp32 transformers pipeline,
+called once per headline). A backend passes when its label agreement with that
+reference is at least --min-agreement.
+
+    python benchmarks/compare_sentiment_backends.py --backends pytorch quantized onnx
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sentiment.backends import BACKENDS
+from sentiment.finbert import load_finbert_pipeline, predict_sentiment
+
+FIXTURE_PATH = Path(__file__).resolve().parent / 'fixtures' / 'headlines.txt'
+
+
+def load_fixture(path=FIXTURE_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def time_backend(finbert_pipeline, headlines, batch_size, repeats):
+    """Returns (best batched seconds, mean single-headline latency in ms)."""
+    predict_sentiment(finbert_pipeline, headlines[:4], batch_size=batch_size)  # warm-up
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_sentiment(finbert_pipeline, headlines, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in headlines:
+        predict_sentiment(finbert_pipeline, [text], batch_size=1)
+    single_ms = (time.perf_counter() - start) / len(headlines) * 1000
+    return best, single_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare FinBERT inference backends')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--min-agreement', type=float, default=0.97,
+                        help='Minimum label agreement with the reference pipeline')
+    args = parser.parse_args()
+
+    headlines = load_fixture()
+    reference_pipeline = load_finbert_pipeline('pytorch')
+    reference = [reference_pipeline(text)[0] for text in headlines]
+    reference_labels = [r['label'].lower() for r in reference]
+
+    rows = []
+    for backend in args.backends:
+        try:
+            start = time.perf_counter()
+            finbert_pipeline = load_finbert_pipeline(backend)
+            load_s = time.perf_counter() - start
+        except Exception as e:
+            print(f"{backend}: failed to load ({e})")
+            continue
+
+        predictions = predict_sentiment(finbert_pipeline, headlines, batch_size=args.batch_size)
+        labels = [p['label'].lower() for p in predictions]
+        agreement = sum(a == b for a, b in zip(labels, reference_labels)) / len(headlines)
+        max_score_diff = max(abs(p['score'] - r['score']) for p, r in zip(predictions, reference))
+        batched_s, single_ms = time_backend(finbert_pipeline, headlines, args.batch_size, args.repeats)
+        rows.append({
+            'backend': backend,
+            'agreement': agreement,
+            'max_score_diff': max_score_diff,
+            'throughput': len(headlines) / batched_s,
+            'single_ms': single_ms,
+            'load_s': load_s,
+            'passed': agreement >= args.min_agreement
+        })
+
+    print(f"\nFixture: {len(headlines)} headlines | batch size: {args.batch_size}")
+    print(f"{'backend':<10} {'agree':>7} {'max|dp|':>8} {'hl/sec':>9} {'1-item ms':>10} {'load s':>7}  parity")
+    for r in rows:
+        print(f"{r['backend']:<10} {r['agreement']:>7.1%} {r['max_score_diff']:>8.4f} {r['throughput']:>9.1f} "
+              f"{r['single_ms']:>10.1f} {r['load_s']:>7.1f}  {'PASS' if r['passed'] else 'FAIL'}")
+
+    passing = [r for r in rows if r['passed']]
+    if not passing:
+        print("\n❌ No backend holds label agreement with the reference pipeline.")
+        return 1
+    fastest = max(passing, key=lambda r: r['throughput'])
+    print(f"\n✅ Fastest backend with parity: {fastest['backend']} (set SENTIMENT_BACKEND={fastest['backend']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Local stand-ins for Alpha Vantage, NewsAPI and Groq.
+
+Each fake serves the response shapes the backend parses -- Alpha Vantage
+TIME_SERIES_DAILY / FX_DAILY, NewsAPI /everything and /top-headlines, and
+Groq's OpenAI-compatible chat completions (streamed as server-sent events or
+not) -- with configurable latency, jitter and error rate, so load tests don't
+spend API quota and don't vary with third-party latency.
+
+Used by benchmarks/loadtest.py; can also be run on its own and the printed
+environment pasted into .env:
+
+    python benchmarks/fakes.py --latency-ms 80 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+HEADLINES = (Path(__file__).resolve().parent / 'fixtures' / 'headlines.txt').read_text(encoding='utf-8').splitlines()
+FX_BASE = {('USD', 'INR'): 83.2, ('INR', 'USD'): 1 / 83.2}
+ANSWER = (
+    "Diversification spreads your money across assets that don't move together, so a loss in one "
+    "holding is cushioned by the others. Index funds are a low-cost way to get broad exposure."
+)
+
+
+class Behaviour:
+    """Latency and failure injection shared by all handlers of one fake."""
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, seed=None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            extra = self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, self.latency + extra))
+
+    def fails(self):
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+def _seed(*parts):
+    return int(hashlib.sha1('|'.join(parts).encode()).hexdigest()[:8], 16)
+
+
+def daily_series(symbol, days):
+    """Deterministic random-walk OHLCV keyed by date string, newest first like Alpha Vantage."""
+    rng = random.Random(_seed(symbol))
+    price = rng.uniform(50, 500)
+    series = {}
+    day = date.today() - timedelta(days=days)
+    for _ in range(days):
+        day += timedelta(days=1)
+        if day.weekday() >= 5:
+            continue
+        open_price = price
+        price = max(1.0, price * (1 + rng.gauss(0.0003, 0.015)))
+        series[day.isoformat()] = {
+            '1. open': f"{open_price:.4f}",
+            '2. high': f"{max(open_price, price) * (1 + rng.uniform(0, 0.01)):.4f}",
+            '3. low': f"{min(open_price, price) * (1 - rng.uniform(0, 0.01)):.4f}",
+            '4. close': f"{price:.4f}",
+            '5. volume': str(rng.randint(1_000_000, 50_000_000)),
+        }
+    return dict(reversed(list(series.items())))
+
+
+def fx_series(from_currency, to_currency, days):
+    rng = random.Random(_seed(from_currency, to_currency))
+    rate = FX_BASE.get((from_currency, to_currency), 1.0)
+    series = {}
+    day = date.today() - timedelta(days=days)
+    for _ in range(days):
+        day += timedelta(days=1)
+        rate *= 1 + rng.gauss(0, 0.002)
+        series[day.isoformat()] = {
+            '1. open': f"{rate:.5f}", '2. high': f"{rate * 1.001:.5f}",
+            '3. low': f"{rate * 0.999:.5f}", '4. close': f"{rate:.5f}",
+        }
+    return dict(reversed(list(series.items())))
+
+
+def articles(query, n):
+    rng = random.Random(_seed(query or 'top'))
+    now = datetime.now(timezone.utc)
+    result = []
+    for i in range(n):
+        title = rng.choice(HEADLINES)
+        result.append({
+            'source': {'id': None, 'name': rng.choice(['Reuters', 'Bloomberg', 'CNBC', 'MarketWatch'])},
+            'author': None,
+            'title': title,
+            'description': f"{title}. Analysts weigh in on what it means for investors.",
+            'url': f"https://news.example.com/{_seed(query or 'top', str(i))}",
+            'urlToImage': None,
+            'publishedAt': (now - timedelta(hours=i * 3)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': title,
+        })
+    return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    behaviour = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class AlphaVantageHandler(_Handler):
+    days = 1500
+
+    def do_GET(self):
+        self.behaviour.delay()
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if self.behaviour.fails():
+            # Alpha Vantage reports throttling with HTTP 200 and a Note
+            self._send_json(200, {'Note': 'Thank you for using Alpha Vantage! Our standard API rate limit is 5 requests per minute.'})
+            return
+        days = self.days if params.get('outputsize') == 'full' else 140
+        function = params.get('function')
+        if function == 'TIME_SERIES_DAILY':
+            symbol = params.get('symbol', 'AAPL')
+            self._send_json(200, {
+                'Meta Data': {'1. Information': 'Daily Prices', '2. Symbol': symbol},
+                'Time Series (Daily)': daily_series(symbol, days),
+            })
+        elif function == 'FX_DAILY':
+            pair = (params.get('from_symbol', 'USD'), params.get('to_symbol', 'INR'))
+            self._send_json(200, {
+                'Meta Data': {'1. Information': 'Forex Daily Prices', '2. From Symbol': pair[0], '3. To Symbol': pair[1]},
+                'Time Series FX (Daily)': fx_series(*pair, days),
+            })
+        else:
+            self._send_json(200, {'Error Message': f"Invalid API call: unknown function {function}"})
+
+
+class NewsAPIHandler(_Handler):
+    def do_GET(self):
+        self.behaviour.delay()
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if self.behaviour.fails():
+            self._send_json(429, {'status': 'error', 'code': 'rateLimited', 'message': 'You have made too many requests recently.'})
+            return
+        if not url.path.endswith(('/everything', '/top-headlines')):
+            self._send_json(404, {'status': 'error', 'code': 'routeNotFound', 'message': 'Not found'})
+            return
+        n = min(int(params.get('pageSize', 20)), 100)
+        found = articles(params.get('q'), n)
+        self._send_json(200, {'status': 'ok', 'totalResults': len(found), 'articles': found})
+
+
+class GroqHandler(_Handler):
+    token_interval = 0.01
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        self.behaviour.delay()
+        if self.behaviour.fails():
+            self._send_json(503, {'error': {'message': 'Service unavailable', 'type': 'internal_server_error'}})
+            return
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Unknown path', 'type': 'invalid_request_error'}})
+            return
+        completion_id = f"chatcmpl-{_seed(self.path, str(time.time_ns())):x}"
+        model = request.get('model', 'llama3-8b-8192')
+        created = int(time.time())
+        words = ANSWER.split(' ')
+        if not request.get('stream'):
+            self._send_json(200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ANSWER}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': 20, 'completion_tokens': len(words), 'total_tokens': 20 + len(words)},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        try:
+            event({'role': 'assistant', 'content': ''})
+            for i, word in enumerate(words):
+                time.sleep(self.token_interval)
+                event({'content': word if i == 0 else ' ' + word})
+            event({}, 'stop')
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading mid-answer (e.g. a cancelled chat stream)
+            pass
+
+
+class FakeServices:
+    """Starts the three fakes on free localhost ports in background threads."""
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, token_interval_ms=10, seed=None):
+        self._servers = []
+        self.alpha_vantage = self._start(AlphaVantageHandler, Behaviour(latency_ms, jitter_ms, error_rate, seed))
+        self.newsapi = self._start(NewsAPIHandler, Behaviour(latency_ms, jitter_ms, error_rate, seed))
+        self.groq = self._start(
+            GroqHandler, Behaviour(latency_ms, jitter_ms, error_rate, seed), token_interval=token_interval_ms / 1000
+        )
+
+    def _start(self, handler, behaviour, **attrs):
+        handler_class = type(handler.__name__, (handler,), {'behaviour': behaviour, **attrs})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def environment(self):
+        """Settings pointing the backend at the fakes."""
+        return {
+            'ALPHA_VANTAGE_URL': f"{self.alpha_vantage}/query",
+            'ALPHA_VANTAGE_API_KEY': 'fake',
+            'ALPHA_VANTAGE_CALL_INTERVAL': '0',
+            'NEWSAPI_BASE_URL': f"{self.newsapi}/v2",
+            'NEWS_API_KEY': 'fake',
+            'GROQ_BASE_URL': self.groq,
+            'GROQ_API_KEY': 'fake',
+        }
+
+    def close(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run fake Alpha Vantage, NewsAPI and Groq servers')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--token-interval-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    services = FakeServices(args.latency_ms, args.jitter_ms, args.error_rate, args.token_interval_ms)
+    for key, value in services.environment().items():
+        print(f"{key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        services.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Mixed-traffic load test against the API with local third-party stand-ins.
+
+Starts the fakes from benchmarks/fakes.py, starts the API server on a
+scratch database pointed at them, seeds market data through the ETL, then
+drives weighted mixed traffic from closed-loop clients and reports per
+endpoint throughput, p50/p95/p99 latency and error rates. Per-client rate
+limits are disabled, since every simulated client shares one address.
+
+    python benchmarks/loadtest.py --duration 60 --concurrency 16
+    python benchmarks/loadtest.py --latency-ms 200 --error-rate 0.05 --json results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_loop_lag import percentile, start_server  # noqa: E402
+from fakes import FakeServices  # noqa: E402
+
+TICKERS = ['AAPL', 'MSFT', 'TSLA']
+
+# (weight, label, method, path, body); {ticker} is filled in per request
+MIX = [
+    (20, 'portfolio', 'GET', '/api/portfolio', None),
+    (20, 'market-data', 'GET', '/api/market-data', None),
+    (10, 'portfolio-history', 'GET', '/api/portfolio/history', None),
+    (10, 'news', 'GET', '/api/news', None),
+    (10, 'health', 'GET', '/api/health/live', None),
+    (8, 'sentiment', 'GET', '/api/sentiment-analysis?ticker={ticker}', None),
+    (2, 'bulk-sentiment', 'POST', '/api/bulk-sentiment', {'tickers': TICKERS}),
+    (8, 'forecast', 'POST', '/api/forecast', {'ticker': '{ticker}', 'days': 30, 'currency': 'USD'}),
+    (10, 'chat-general', 'POST', '/api/chat', {'message': 'What is diversification?'}),
+    (2, 'chat-forecast', 'POST', '/api/chat', {'message': 'forecast {ticker} for 14 days in USD'}),
+]
+
+
+def _fill(value, ticker):
+    if isinstance(value, str):
+        return value.replace('{ticker}', ticker)
+    if isinstance(value, dict):
+        return {k: _fill(v, ticker) for k, v in value.items()}
+    return value
+
+
+def seed(base, timeout):
+    """Runs the market ETL for every ticker (chat forecasts run it synchronously)."""
+    for ticker in TICKERS:
+        response = requests.post(
+            f"{base}/api/chat", json={'message': f"forecast {ticker} for 5 days in USD"}, timeout=timeout
+        )
+        print(f"  seeded {ticker}: HTTP {response.status_code}")
+
+
+def run_load(base, duration, concurrency, request_timeout, seed_value=None):
+    weights = [entry[0] for entry in MIX]
+    samples = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(None if seed_value is None else seed_value + index)
+        session = requests.Session()
+        local = []
+        while time.perf_counter() < deadline:
+            _, label, method, path, body = rng.choices(MIX, weights)[0]
+            ticker = rng.choice(TICKERS)
+            start = time.perf_counter()
+            try:
+                status = session.request(
+                    method, base + _fill(path, ticker), json=_fill(body, ticker), timeout=request_timeout
+                ).status_code
+            except requests.RequestException:
+                status = 'error'
+            local.append((label, status, time.perf_counter() - start))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(client, i) for i in range(concurrency)]
+        # Re-raises a client's exception instead of silently losing its samples
+        for future in futures:
+            future.result()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    by_label = {}
+    for label, status, seconds in samples:
+        by_label.setdefault(label, []).append((status, seconds))
+    by_label['TOTAL'] = [(status, seconds) for _, status, seconds in samples]
+
+    summary = {}
+    for label, results in by_label.items():
+        latencies = [seconds * 1000 for _, seconds in results]
+        shed = sum(1 for status, _ in results if status in (429, 503))
+        errors = sum(1 for status, _ in results if status == 'error' or (status >= 500 and status != 503))
+        summary[label] = {
+            'requests': len(results),
+            'rps': len(results) / elapsed,
+            'ok': sum(1 for status, _ in results if status != 'error' and status < 400),
+            'shed': shed,
+            'errors': errors,
+            'error_rate': errors / len(results),
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': max(latencies),
+        }
+    return summary
+
+
+def print_report(summary, args, elapsed):
+    print(f"\n{args.concurrency} clients for {elapsed:.0f}s; fakes at {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"{args.error_rate:.0%} errors")
+    print(f"  {'endpoint':<18} {'reqs':>6} {'req/s':>7} {'shed':>5} {'err%':>6} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, row in sorted(summary.items(), key=lambda kv: (kv[0] == 'TOTAL', kv[0])):
+        print(f"  {label:<18} {row['requests']:6d} {row['rps']:7.1f} {row['shed']:5d} {row['error_rate']:6.1%} "
+              f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} {row['max_ms']:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mixed-traffic load test with fake upstream APIs')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Fake upstream latency')
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of fake upstream calls that fail')
+    parser.add_argument('--token-interval-ms', type=float, default=10, help='Delay between streamed Groq tokens')
+    parser.add_argument('--request-timeout', type=float, default=120)
+    parser.add_argument('--ready-timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, help='Seed for the traffic mix and fake behaviour')
+    parser.add_argument('--json', help='Also write the summary to this file')
+    args = parser.parse_args()
+
+    fakes = FakeServices(args.latency_ms, args.jitter_ms, args.error_rate, args.token_interval_ms, args.seed)
+    scratch = tempfile.TemporaryDirectory(prefix='quantfin-loadtest-')
+    saved_env = dict(os.environ)
+    os.environ.update(fakes.environment())
+    os.environ.update({
+        'DATABASE_PATH': str(Path(scratch.name) / 'loadtest.db'),
+        'FORECAST_RATE_PER_MINUTE': '0',
+        'BULK_SENTIMENT_RATE_PER_MINUTE': '0',
+    })
+    server = None
+    try:
+        server, base = start_server(args.ready_timeout)
+        print(f"API at {base}; seeding market data...")
+        seed(base, args.request_timeout)
+        samples, elapsed = run_load(base, args.duration, args.concurrency, args.request_timeout, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        os.environ.clear()
+        os.environ.update(saved_env)
+        fakes.close()
+        scratch.cleanup()
+
+    if not samples:
+        print("No requests completed")
+        return 1
+    summary = summarize(samples, elapsed)
+    print_report(summary, args, elapsed)
+    if args.json:
+        Path(args.json).write_text(json.dumps({'args': vars(args), 'endpoints': summary}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
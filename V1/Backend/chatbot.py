@@ -1,35 +1,86 @@
 # chatbot.py
 
 import sys
-import sqlite3
+import asyncio
+import threading
+import time
 import pandas as pd
 from pathlib import Path
-import groq  # New import
 
 # Add project root to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+import httpx
+import http_replay
 from config.config import config
+from data.db_pool import read_connection
 from data.etl_pipeline import run_etl_pipeline
 from stock_forecast import generate_forecasts
+from metrics import REGISTRY
+from tracing import span
 
 # --- Updated Groq Client Initialization ---
+# The groq SDK is imported and the client created on first use (or by the API
+# server's warm-up task), keeping it out of the import path.
 groq_client = None
-key_found = False
+async_groq_client = None
 api_key = config.get('GROQ_API_KEY')
+key_found = bool(api_key)
+_groq_lock = threading.Lock()
 
-if api_key:
-    groq_client = groq.Groq(api_key=api_key)
-    key_found = True
-else:
+if not key_found:
     print("⚠️  Warning: GROQ_API_KEY not found in your .env file. The general Q&A function will be disabled.")
 
+def get_groq_client():
+    """Returns the shared Groq client, creating it on first call."""
+    global groq_client
+    if not key_found:
+        return None
+    with _groq_lock:
+        if groq_client is None:
+            import groq
+            # GROQ_BASE_URL lets load tests use a local stand-in (benchmarks/fakes.py)
+            groq_client = groq.Groq(
+                api_key=api_key,
+                base_url=config.get('GROQ_BASE_URL') or None,
+                # Record/replay transport; redirects followed like the SDK's default client
+                http_client=httpx.Client(transport=http_replay.ReplayTransport(), follow_redirects=True),
+            )
+    return groq_client
+
+
+def get_async_groq_client():
+    """
+    Returns the shared AsyncGroq client for the API server's event loop,
+    creating it on first call (the warm-up task calls it from a worker thread);
+    its connection pool is reused across requests.
+    """
+    global async_groq_client
+    if not key_found:
+        return None
+    with _groq_lock:
+        if async_groq_client is None:
+            import groq
+            async_groq_client = groq.AsyncGroq(
+                api_key=api_key,
+                base_url=config.get('GROQ_BASE_URL') or None,
+                http_client=httpx.AsyncClient(transport=http_replay.AsyncReplayTransport(), follow_redirects=True),
+            )
+    return async_groq_client
+
+
+async def close_async_groq_client():
+    global async_groq_client
+    if async_groq_client is not None:
+        await async_groq_client.close()
+        async_groq_client = None
+
 
 # --- Helper Functions (No changes here) ---
 
 def get_last_close_price(db_path, ticker):
-    with sqlite3.connect(db_path) as conn:
+    with span('db.last_close_price', symbol=ticker), read_connection(db_path) as conn:
         query = "SELECT close FROM market_data WHERE symbol = ? ORDER BY date DESC LIMIT 1"
         cursor = conn.cursor()
         result = cursor.execute(query, (ticker,)).fetchone()
@@ -55,30 +106,97 @@ def get_allocation_decision(forecast_df, last_actual_price, forecast_horizon):
     return decision, justification
 
 # --- Updated Q&A Function for Groq ---
+GROQ_MODEL = "llama3-8b-8192"  # Groq uses specific model names
+QA_DISABLED_MESSAGE = "Sorry, the Q&A function is disabled because the Groq API key is missing."
+
+groq_first_token_seconds = REGISTRY.histogram(
+    'groq_first_token_seconds', 'Time from sending a Groq request to its first streamed token'
+)
+groq_request_seconds = REGISTRY.histogram(
+    'groq_request_seconds', 'Total Groq chat completion time', ('outcome',)
+)
+
+def _general_question_messages(query):
+    # --- NEW, MORE FORCEFUL SYSTEM PROMPT ---
+    system_message = {
+        "role": "system",
+        "content": ""
+    }
+    return [system_message, {"role": "user", "content": query}]
+
+def _stream_answer(client, query):
+    """Yields the answer's text chunks, timing first token and total latency."""
+    start = time.perf_counter()
+    outcome = 'error'
+    first_token = True
+    try:
+        stream = client.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_general_question_messages(query),
+            stream=True,
+        )
+        for chunk in stream:
+            content = chunk.choices[0].delta.content if chunk.choices else None
+            if not content:
+                continue
+            if first_token:
+                groq_first_token_seconds.observe(time.perf_counter() - start)
+                first_token = False
+            yield content
+        outcome = 'ok'
+    except GeneratorExit:
+        outcome = 'cancelled'
+        raise
+    finally:
+        groq_request_seconds.observe(time.perf_counter() - start, outcome)
+
+async def stream_answer_async(client, query):
+    """Async counterpart of _stream_answer, for the API server's streaming chat."""
+    start = time.perf_counter()
+    outcome = 'error'
+    first_token = True
+    stream = None
+    try:
+        stream = await client.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_general_question_messages(query),
+            stream=True,
+        )
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content if chunk.choices else None
+            if not content:
+                continue
+            if first_token:
+                groq_first_token_seconds.observe(time.perf_counter() - start)
+                first_token = False
+            yield content
+        outcome = 'ok'
+    except (GeneratorExit, asyncio.CancelledError):
+        # Client went away mid-answer
+        outcome = 'cancelled'
+        raise
+    finally:
+        groq_request_seconds.observe(time.perf_counter() - start, outcome)
+        if stream is not None:
+            # Releases the upstream response and its pooled connection now
+            # rather than at garbage collection (AsyncStream.close, present
+            # since groq 0.4); shielded so the close still completes while the
+            # request task is being cancelled
+            await asyncio.shield(stream.close())
+
 def handle_general_question(query):
     """
     Handles general financial questions by sending them to the Groq API.
     """
-    if not key_found or groq_client is None:
-        print("Sorry, the Q&A function is disabled because the Groq API key is missing.")
+    client = get_groq_client()
+    if client is None:
+        print(QA_DISABLED_MESSAGE)
         return
 
     print("")
     try:
-        # --- NEW, MORE FORCEFUL SYSTEM PROMPT ---
-        system_message = {
-            "role": "system",
-            "content": ""
-        }
-
-        stream = groq_client.chat.completions.create(
-            model="llama3-8b-8192",  # Groq uses specific model names
-            messages=[system_message, {"role": "user", "content": query}],
-            stream=True,
-        )
-        
-        for chunk in stream:
-            print(chunk.choices[0].delta.content or "", end="")
+        for content in _stream_answer(client, query):
+            print(content, end="")
         print("\n")
 
     except Exception as e:
@@ -156,7 +274,7 @@ def run_chatbot():
                 print("[1/4] Database update complete.")
 
                 print(f"\n[2/4] Generating forecast...")
-                forecast_results = generate_forecasts(db_path, [ticker], days, currency)
+                forecast_results = generate_forecasts(db_path, [ticker], days, currency, show_plot=True)
                 print("[2/4] Forecast generation complete.")
 
                 print("\n[3/4] Analyzing forecast for allocation decision...")
@@ -22,8 +22,12 @@ def setup_logging():
     logger = logging.getLogger()
     logger.setLevel(log_level)
     
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Create formatter; trace/span ids tie log lines to exported spans (see tracing.py)
+    from tracing import install_log_context
+    install_log_context()
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [trace=%(trace_id)s span=%(span_id)s] - %(message)s'
+    )
     
     # Create console handler
     console_handler = logging.StreamHandler()
@@ -69,8 +73,12 @@ def setup_logging():
     logger = logging.getLogger()
     logger.setLevel(log_level)
     
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Create formatter; trace/span ids tie log lines to exported spans (see tracing.py)
+    from tracing import install_log_context
+    install_log_context()
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [trace=%(trace_id)s span=%(span_id)s] - %(message)s'
+    )
     
     # Create console handler
     console_handler = logging.StreamHandler()
@@ -0,0 +1,82 @@
+# data/data_version.py
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from config.config import config
+from data.db_pool import read_connection
+
+logger = logging.getLogger(__name__)
+
+# How long a process trusts its last read of the version before re-reading it.
+# ETL runs in this process invalidate immediately; runs in other processes
+# (CLI, other API workers) are picked up within this interval.
+DATA_VERSION_CHECK_INTERVAL = float(config.get('DATA_VERSION_CHECK_INTERVAL', 2))
+
+_cached = {}
+_lock = threading.Lock()
+
+
+def setup_data_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    ''')
+
+
+def bump_data_version(conn):
+    """
+    Increments the market data version inside the caller's write transaction,
+    so the new version becomes visible together with the data it describes.
+    Call forget_data_version once the transaction has committed.
+    """
+    setup_data_version(conn)
+    conn.execute(
+        'INSERT INTO data_version (id, version, updated_at) VALUES (1, 1, ?) '
+        'ON CONFLICT(id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at',
+        (datetime.now(timezone.utc).isoformat(),)
+    )
+
+
+def forget_data_version(db_path):
+    """Drops this process's cached version so the next read sees the latest commit."""
+    with _lock:
+        _cached.pop(str(Path(db_path).resolve()), None)
+
+
+def get_data_version(db_path):
+    """
+    Current market data version (0 before the first ETL run). Other read
+    errors (e.g. a locked database) propagate rather than being reported as
+    a version, and are not cached.
+    """
+    key = str(Path(db_path).resolve())
+    now = time.monotonic()
+    with _lock:
+        entry = _cached.get(key)
+        if entry and now - entry[1] < DATA_VERSION_CHECK_INTERVAL:
+            return entry[0]
+    try:
+        with read_connection(db_path) as conn:
+            row = conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+        version = row[0] if row else 0
+    except sqlite3.OperationalError as e:
+        if 'no such table' not in str(e):
+            raise
+        version = 0
+    with _lock:
+        _cached[key] = (version, now)
+    return version
+
+
+def data_version_is_cached(db_path):
+    """True if get_data_version would answer without touching the database."""
+    with _lock:
+        entry = _cached.get(str(Path(db_path).resolve()))
+    return bool(entry) and time.monotonic() - entry[1] < DATA_VERSION_CHECK_INTERVAL
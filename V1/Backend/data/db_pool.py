@@ -0,0 +1,186 @@
+# data/db_pool.py
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from config.config import config
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Negative cache_size is in KiB
+SQLITE_CACHE_SIZE_KB = int(config.get('SQLITE_CACHE_SIZE_KB', 20000))
+SQLITE_MMAP_SIZE = int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+DB_MAX_READERS = int(config.get('DB_MAX_READERS', 16))
+
+sqlite_wait_seconds = REGISTRY.histogram(
+    'sqlite_connection_wait_seconds', 'Time spent waiting for a pooled SQLite connection', ('mode',)
+)
+sqlite_query_seconds = REGISTRY.histogram(
+    'sqlite_query_seconds', 'Time a pooled SQLite connection was held by its caller', ('mode',)
+)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.acquisitions = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def acquired(self, waited):
+        with self._lock:
+            self.acquisitions += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def released(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def opened(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'acquisitions': self.acquisitions,
+                'wait_ms_avg': self.wait_seconds_total / self.acquisitions * 1000 if self.acquisitions else 0.0,
+                'wait_ms_max': self.wait_seconds_max * 1000
+            }
+
+
+def _apply_pragmas(conn):
+    conn.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}')
+
+
+class SQLitePool:
+    """
+    Reusable SQLite connections for one database file.
+
+    Readers get a read-only (mode=ro URI) connection cached per thread, so the
+    bounded DB thread pool reuses a handful of connections instead of opening
+    one per query; at most DB_MAX_READERS are in use at once. Writes go
+    through a single connection serialized by a lock. The database runs in
+    WAL mode so readers don't block on the ETL writer or vice versa.
+    """
+    def __init__(self, db_path, max_readers=DB_MAX_READERS):
+        self.db_path = str(Path(db_path).resolve())
+        self._local = threading.local()
+        self._readers = threading.BoundedSemaphore(max_readers)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self.read_metrics = PoolMetrics()
+        self.write_metrics = PoolMetrics()
+
+    def _open_writer(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Shared across threads, but only ever used while holding _writer_lock
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode = WAL')
+        # WAL + NORMAL is durable across application crashes, which is enough for derived market data
+        conn.execute('PRAGMA synchronous = NORMAL')
+        _apply_pragmas(conn)
+        self.write_metrics.opened()
+        return conn
+
+    def _open_reader(self):
+        if not Path(self.db_path).exists():
+            # Create the file (in WAL mode) so read-only connections can open it
+            with self.writer():
+                pass
+        conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True)
+        _apply_pragmas(conn)
+        self.read_metrics.opened()
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Yields this thread's read-only connection."""
+        start = time.perf_counter()
+        self._readers.acquire()
+        acquired = time.perf_counter()
+        self.read_metrics.acquired(acquired - start)
+        sqlite_wait_seconds.observe(acquired - start, 'read')
+        try:
+            conn = getattr(self._local, 'conn', None)
+            if conn is None:
+                conn = self._local.conn = self._open_reader()
+            try:
+                yield conn
+            finally:
+                # Don't leave a read transaction open: it would pin the WAL
+                if conn.in_transaction:
+                    conn.rollback()
+        finally:
+            self.read_metrics.released()
+            self._readers.release()
+            sqlite_query_seconds.observe(time.perf_counter() - acquired, 'read')
+
+    @contextmanager
+    def writer(self):
+        """Yields the single writer connection; commits on success, rolls back on error."""
+        start = time.perf_counter()
+        with self._writer_lock:
+            acquired = time.perf_counter()
+            self.write_metrics.acquired(acquired - start)
+            sqlite_wait_seconds.observe(acquired - start, 'write')
+            try:
+                if self._writer is None:
+                    self._writer = self._open_writer()
+                try:
+                    yield self._writer
+                    self._writer.commit()
+                except BaseException:
+                    self._writer.rollback()
+                    raise
+            finally:
+                self.write_metrics.released()
+                sqlite_query_seconds.observe(time.perf_counter() - acquired, 'write')
+
+    def stats(self):
+        return {'readers': self.read_metrics.snapshot(), 'writer': self.write_metrics.snapshot()}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """Returns the process-wide pool for a database file, creating it on first use."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = SQLitePool(key)
+        return _pools[key]
+
+
+def read_connection(db_path):
+    """Context manager yielding a pooled read-only connection."""
+    return get_pool(db_path).reader()
+
+
+def write_connection(db_path):
+    """Context manager yielding the serialized writer connection."""
+    return get_pool(db_path).writer()
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = dict(_pools)
+    return {path: pool.stats() for path, pool in pools.items()}
@@ -1,15 +1,50 @@
 # data/etl_pipeline.py
 
-import sqlite3
 import logging
-import requests
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from config.config import config
 from pathlib import Path
+from data.db_pool import write_connection
+from data.data_version import setup_data_version, bump_data_version, forget_data_version
+from data.news_archive import setup_news_archive, load_ticker_news
+from data.sentiment_store import setup_sentiment_tables, record_scored_articles
+import http_replay
+from metrics import REGISTRY
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Overridable so load tests can point at a local stand-in (benchmarks/fakes.py)
+ALPHA_VANTAGE_URL = config.get('ALPHA_VANTAGE_URL', 'https://www.alphavantage.co/query')
+# Pause between Alpha Vantage calls; the free tier allows 5 calls per minute
+ALPHA_VANTAGE_CALL_INTERVAL = float(config.get('ALPHA_VANTAGE_CALL_INTERVAL', 15))
+
+# Fetch stages include the sleeps that keep us under the Alpha Vantage rate limit
+etl_stage_seconds = REGISTRY.histogram(
+    'etl_stage_seconds', 'ETL stage duration', ('stage', 'dataset')
+)
+
+
+def _rate_limit_pause():
+    # Replayed responses don't count against the Alpha Vantage quota
+    if http_replay.MODE != 'replay':
+        time.sleep(ALPHA_VANTAGE_CALL_INTERVAL)
+
+
+@contextmanager
+def _stage(stage, dataset):
+    with etl_stage_seconds.time(stage, dataset), span(f'etl.{stage}', dataset=dataset):
+        yield
+
+
+def _get_alpha_vantage(params):
+    with span('http.alpha_vantage', function=params['function']) as http_span:
+        response = http_replay.session().get(ALPHA_VANTAGE_URL, params=params)
+        http_span.set_attribute('http.status_code', response.status_code)
+        return response.json()
+
 # def _setup_database(db_path):
 #     """Creates database tables if they don't exist."""
 #     logger.info(f"Setting up database at {db_path}...")
@@ -52,7 +87,7 @@ def _setup_database(db_path):
     db_file.parent.mkdir(parents=True, exist_ok=True)
 
     logger.info(f"Setting up database at {db_path}...")
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         cursor = conn.cursor()
 
         # Create table for market data
@@ -82,6 +117,15 @@ def _setup_database(db_path):
             )
         ''')
 
+        # Scored news headlines and their rolling per-ticker aggregates
+        setup_sentiment_tables(conn)
+
+        # Raw article archive with its FTS5 index
+        setup_news_archive(conn)
+
+        # Version counter bumped by every market data commit
+        setup_data_version(conn)
+
         conn.commit()
     logger.info("Database setup complete.")
 
@@ -99,12 +143,11 @@ def _fetch_market_data(tickers):
             'outputsize': 'full', # 'compact' for last 100 days, 'full' for all history
             'apikey': api_key
         }
-        response = requests.get('https://www.alphavantage.co/query', params=params)
-        data = response.json()
+        data = _get_alpha_vantage(params)
         
         if 'Time Series (Daily)' not in data:
             logger.error(f"Could not fetch data for {symbol}: {data.get('Note') or data.get('Error Message', 'Unknown error')}")
-            time.sleep(15) # Sleep to avoid hitting rate limits
+            _rate_limit_pause() # Sleep to avoid hitting rate limits
             continue
 
         for date_str, values in data['Time Series (Daily)'].items():
@@ -121,7 +164,7 @@ def _fetch_market_data(tickers):
         # Alpha Vantage has a rate limit of 5 calls per minute for the free tier.
         # A 15-second sleep is a safe buffer.
         logger.info(f"Successfully fetched data for {symbol}. Waiting to avoid rate limit...")
-        time.sleep(15)
+        _rate_limit_pause()
         
     return all_data
 
@@ -141,12 +184,11 @@ def _fetch_fx_rates():
             'outputsize': 'full',
             'apikey': api_key
         }
-        response = requests.get('https://www.alphavantage.co/query', params=params)
-        data = response.json()
+        data = _get_alpha_vantage(params)
         
         if 'Time Series FX (Daily)' not in data:
             logger.error(f"Could not fetch FX rate for {from_curr}->{to_curr}: {data.get('Note') or data.get('Error Message', 'Unknown error')}")
-            time.sleep(15)
+            _rate_limit_pause()
             continue
 
         for date_str, values in data['Time Series FX (Daily)'].items():
@@ -158,7 +200,7 @@ def _fetch_fx_rates():
             })
         
         logger.info(f"Successfully fetched FX for {from_curr}->{to_curr}. Waiting...")
-        time.sleep(15)
+        _rate_limit_pause()
         
     return all_rates
 
@@ -169,8 +211,9 @@ def _save_to_db(db_path, table_name, data_list):
         return 0
         
     logger.info(f"Saving {len(data_list)} records to {table_name}...")
-    with sqlite3.connect(db_path) as conn:
+    with span('db.write', table=table_name, rows=len(data_list)), write_connection(db_path) as conn:
         cursor = conn.cursor()
+        changes_before = conn.total_changes
         
         # Use INSERT OR IGNORE to avoid errors on duplicate entries (based on UNIQUE constraints)
         for record in data_list:
@@ -178,36 +221,78 @@ def _save_to_db(db_path, table_name, data_list):
             placeholders = ', '.join(['?'] * len(record))
             sql = f'INSERT OR IGNORE INTO {table_name} ({columns}) VALUES ({placeholders})'
             cursor.execute(sql, tuple(record.values()))
-            
+
+        # New rows invalidate cached dashboard responses (see api_server.cached_json)
+        if conn.total_changes > changes_before:
+            bump_data_version(conn)
         conn.commit()
+    forget_data_version(db_path)
     logger.info(f"Save complete for {table_name}.")
     return len(data_list)
 
 
-def run_etl_pipeline(pipeline_type, tickers, db_path):
+def _load_sentiment_model():
+    """Loads FinBERT for the news stage, preferring the shared sentiment worker."""
+    from sentiment.finbert import connect_sentiment_worker, load_finbert_pipeline
+
+    socket_path = config.get('SENTIMENT_WORKER_SOCKET')
+    if socket_path:
+        return connect_sentiment_worker(socket_path)
+    logger.info("Loading FinBERT for the news pipeline...")
+    return load_finbert_pipeline()
+
+def _run_news_pipeline(tickers, db_path, finbert_pipeline=None):
+    """Fetches recent headlines per ticker, scores them and stores them with rolling aggregates."""
+    from sentiment.dedup import score_headlines_deduped
+
+    n_headlines = int(config.get('NEWS_ETL_HEADLINES', 50))
+    lookback_days = int(config.get('SENTIMENT_LOOKBACK_DAYS', 7))
+    finbert_pipeline = finbert_pipeline or _load_sentiment_model()
+    total = 0
+
+    for symbol in tickers:
+        # Served from the local archive; NewsAPI is only asked for the uncovered range
+        articles = load_ticker_news(db_path, symbol, lookback_days, n_headlines)
+        if not articles:
+            logger.info(f"No news found for {symbol}.")
+            continue
+        scored = score_headlines_deduped(finbert_pipeline, [a['title'] for a in articles])
+        total += record_scored_articles(db_path, symbol, articles, scored)
+
+    return total
+
+def run_etl_pipeline(pipeline_type, tickers, db_path, finbert_pipeline=None):
     """
     Main function to run the ETL pipeline based on the specified type.
+
+    finbert_pipeline lets callers that already hold the sentiment model (e.g.
+    the API server) reuse it for the news stage.
     """
-    _setup_database(db_path)
-    records_processed = {}
+    with span('etl.run', pipeline=pipeline_type, tickers=','.join(tickers)):
+        _setup_database(db_path)
+        records_processed = {}
     
-    if pipeline_type in ['full', 'market']:
-        market_data = _fetch_market_data(tickers)
-        records_processed['market'] = _save_to_db(db_path, 'market_data', market_data)
+        if pipeline_type in ['full', 'market']:
+            with _stage('fetch', 'market_data'):
+                market_data = _fetch_market_data(tickers)
+            with _stage('save', 'market_data'):
+                records_processed['market'] = _save_to_db(db_path, 'market_data', market_data)
 
-        fx_rates = _fetch_fx_rates()
-        records_processed['fx_rates'] = _save_to_db(db_path, 'fx_rates', fx_rates)
+            with _stage('fetch', 'fx_rates'):
+                fx_rates = _fetch_fx_rates()
+            with _stage('save', 'fx_rates'):
+                records_processed['fx_rates'] = _save_to_db(db_path, 'fx_rates', fx_rates)
 
-    if pipeline_type in ['full', 'macro']:
-        logger.info("Macro data pipeline not yet implemented.")
-        records_processed['macro'] = 0
+        if pipeline_type in ['full', 'macro']:
+            logger.info("Macro data pipeline not yet implemented.")
+            records_processed['macro'] = 0
 
-    if pipeline_type in ['full', 'news']:
-        logger.info("News data pipeline not yet implemented.")
-        records_processed['news'] = 0
+        if pipeline_type in ['full', 'news']:
+            with _stage('run', 'news'):
+                records_processed['news'] = _run_news_pipeline(tickers, db_path, finbert_pipeline)
 
-    if pipeline_type in ['full', 'social']:
-        logger.info("Social media data pipeline not yet implemented.")
-        records_processed['social'] = 0
+        if pipeline_type in ['full', 'social']:
+            logger.info("Social media data pipeline not yet implemented.")
+            records_processed['social'] = 0
         
-    return {"status": "success", "records_processed": records_processed}        
\ No newline at end of file
+        return {"status": "success", "records_processed": records_processed}        
\ No newline at end of file
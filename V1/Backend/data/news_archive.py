@@ -0,0 +1,268 @@
+# data/news_archive.py
+
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from data.db_pool import read_connection, write_connection
+from data.news_client import NEWS_FETCH_CONCURRENCY, fetch_ticker_articles, fetch_ticker_articles_async
+from executors import run_db
+from sentiment.cache import content_key
+
+logger = logging.getLogger(__name__)
+
+# A coverage gap shorter than this is not worth a NewsAPI call
+MIN_GAP = timedelta(minutes=5)
+
+
+def setup_news_archive(conn):
+    """Creates the article archive, its FTS5 index and the per-ticker coverage table."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news_archive (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            headline_key TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            summary TEXT,
+            url TEXT,
+            source TEXT,
+            published_at TIMESTAMP NOT NULL,
+            fetched_at TIMESTAMP NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_archive_published ON news_archive (published_at)')
+    # External-content FTS5 index kept in sync by triggers
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_archive_fts USING fts5(
+            title, summary, content='news_archive', content_rowid='id'
+        )
+    ''')
+    cursor.executescript('''
+        CREATE TRIGGER IF NOT EXISTS news_archive_ai AFTER INSERT ON news_archive BEGIN
+            INSERT INTO news_archive_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_archive_ad AFTER DELETE ON news_archive BEGIN
+            INSERT INTO news_archive_fts (news_archive_fts, rowid, title, summary)
+            VALUES ('delete', old.id, old.title, old.summary);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_archive_au AFTER UPDATE ON news_archive BEGIN
+            INSERT INTO news_archive_fts (news_archive_fts, rowid, title, summary)
+            VALUES ('delete', old.id, old.title, old.summary);
+            INSERT INTO news_archive_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+        END;
+    ''')
+    # Which tickers' NewsAPI queries returned an article; most results for
+    # q=AAPL never spell out the symbol ("Apple shares rise ..."), so this
+    # link, not the text index, is what ties an article to a ticker
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news_ticker_articles (
+            ticker TEXT NOT NULL,
+            article_id INTEGER NOT NULL,
+            PRIMARY KEY (ticker, article_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS news_archive_ad_links AFTER DELETE ON news_archive BEGIN
+            DELETE FROM news_ticker_articles WHERE article_id = old.id;
+        END
+    ''')
+    # page_size is the smallest pageSize of a truncated fetch within the
+    # covered range (NULL when every fetch returned fewer articles than asked)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news_coverage (
+            ticker TEXT PRIMARY KEY,
+            covered_from TIMESTAMP NOT NULL,
+            covered_to TIMESTAMP NOT NULL,
+            page_size INTEGER
+        )
+    ''')
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(news_coverage)')}
+    if 'page_size' not in columns:
+        # Ranges recorded before page sizes were tracked get refetched once
+        cursor.execute('ALTER TABLE news_coverage ADD COLUMN page_size INTEGER DEFAULT 0')
+
+
+def _utc(value):
+    ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _fts_query(ticker):
+    """Quotes the ticker as an FTS5 phrase so symbols like 'RELIANCE.NS' are safe."""
+    return '"' + ticker.replace('"', '""') + '"'
+
+
+def archive_articles(db_path, articles, ticker=None):
+    """
+    Inserts articles (see data.news_client.parse_articles), skipping ones
+    already archived, and links them to the ticker they were fetched for.
+    Returns the number of newly archived articles.
+    """
+    if not articles:
+        return 0
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    rows = [
+        (content_key(a['title']), a['title'], a.get('summary'), a.get('url'), a.get('source'),
+         _utc(a['published_at']).isoformat() if a.get('published_at') else fetched_at, fetched_at)
+        for a in articles
+    ]
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    with write_connection(db_path) as conn:
+        setup_news_archive(conn)
+        inserted = conn.executemany(
+            'INSERT OR IGNORE INTO news_archive (headline_key, title, summary, url, source, published_at, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            rows
+        ).rowcount
+        if ticker is not None:
+            conn.executemany(
+                'INSERT OR IGNORE INTO news_ticker_articles (ticker, article_id) '
+                'SELECT ?, id FROM news_archive WHERE headline_key = ?',
+                [(ticker, row[0]) for row in rows]
+            )
+        conn.commit()
+        return inserted
+
+
+def search_archive(db_path, ticker, days=7, limit=50):
+    """
+    Archived articles for the ticker over the last `days` days, newest first:
+    those NewsAPI returned for it, plus any mentioning it in title or summary.
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    try:
+        with read_connection(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(
+                'SELECT a.title, a.summary, a.url, a.source, a.published_at '
+                'FROM news_archive a '
+                'WHERE a.published_at >= ? AND ('
+                '    a.id IN (SELECT article_id FROM news_ticker_articles WHERE ticker = ?)'
+                '    OR a.id IN (SELECT rowid FROM news_archive_fts WHERE news_archive_fts MATCH ?)'
+                ') '
+                'ORDER BY a.published_at DESC LIMIT ?',
+                (since, ticker, _fts_query(ticker), limit)
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"News archive search failed for {ticker}: {e}")
+        return []
+    return [dict(row) for row in rows]
+
+
+def uncovered_since(db_path, ticker, days=7, limit=50):
+    """
+    Start of the time range not yet fetched for the ticker, or None if the
+    archive already covers the last `days` days up to now (within MIN_GAP).
+    A range fetched with a page size below `limit` counts as not covered.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+    try:
+        with read_connection(db_path) as conn:
+            row = conn.execute(
+                'SELECT covered_from, covered_to, page_size FROM news_coverage WHERE ticker = ?', (ticker,)
+            ).fetchone()
+    except sqlite3.Error:
+        row = None
+    if row is None or _utc(row[0]) > since or (row[2] is not None and row[2] < limit):
+        return since
+    covered_to = _utc(row[1])
+    return covered_to if now - covered_to > MIN_GAP else None
+
+
+def record_coverage(db_path, ticker, fetched_from, fetched_to, page_size=None):
+    """
+    Extends the ticker's covered range after a successful fetch.
+
+    NewsAPI returns the newest articles first, so a page cut short by
+    pageSize only drops ones older than what search_archive returns for the
+    same limit; the whole requested range counts as covered for requests up
+    to that limit. page_size is None when the fetch returned fewer articles
+    than asked, i.e. nothing was cut.
+    """
+    with write_connection(db_path) as conn:
+        setup_news_archive(conn)
+        row = conn.execute(
+            'SELECT covered_from, covered_to, page_size FROM news_coverage WHERE ticker = ?', (ticker,)
+        ).fetchone()
+        if row and _utc(row[1]) >= fetched_from - MIN_GAP and _utc(row[0]) <= fetched_to:
+            # Contiguous with what we had: merge. Only a top-up fetch (from
+            # where the old range ended) keeps the old range's page size; a
+            # fetch of the whole window re-covered everything still in it.
+            if fetched_from >= _utc(row[1]) - MIN_GAP and row[2] is not None:
+                page_size = row[2] if page_size is None else min(page_size, row[2])
+            fetched_from = min(fetched_from, _utc(row[0]))
+            fetched_to = max(fetched_to, _utc(row[1]))
+        conn.execute(
+            'INSERT OR REPLACE INTO news_coverage (ticker, covered_from, covered_to, page_size) VALUES (?, ?, ?, ?)',
+            (ticker, fetched_from.isoformat(), fetched_to.isoformat(), page_size)
+        )
+        conn.commit()
+
+
+def _store_fetch(db_path, ticker, articles, since, fetched_to, limit):
+    archive_articles(db_path, articles, ticker)
+    record_coverage(db_path, ticker, since, fetched_to, limit if len(articles) >= limit else None)
+
+
+def load_ticker_news(db_path, ticker, days=7, limit=50):
+    """
+    Articles mentioning the ticker in the last `days` days.
+
+    Answers from the local archive and calls NewsAPI only for the part of the
+    range that hasn't been fetched yet.
+    """
+    since = uncovered_since(db_path, ticker, days, limit)
+    if since is not None:
+        fetched_to = datetime.now(timezone.utc)
+        try:
+            # Raises on a failed request, so the range stays uncovered
+            articles = fetch_ticker_articles(ticker, limit, since=since)
+            _store_fetch(db_path, ticker, articles, since, fetched_to, limit)
+        except Exception as e:
+            logger.error(f"Error fetching news for {ticker}: {e}")
+    return search_archive(db_path, ticker, days, limit)
+
+
+async def load_ticker_news_async(db_path, ticker, days=7, limit=50):
+    """
+    load_ticker_news with the NewsAPI call on the shared async client and
+    SQLite on the DB pool. A failed fetch is re-raised when the archive has
+    nothing to serve instead, so callers can report the error.
+    """
+    since = await run_db(uncovered_since, db_path, ticker, days, limit)
+    fetch_error = None
+    if since is not None:
+        fetched_to = datetime.now(timezone.utc)
+        try:
+            articles = await fetch_ticker_articles_async(ticker, limit, since=since)
+            await run_db(_store_fetch, db_path, ticker, articles, since, fetched_to, limit)
+        except Exception as e:
+            logger.error(f"Error fetching news for {ticker}: {e}")
+            fetch_error = e
+    articles = await run_db(search_archive, db_path, ticker, days, limit)
+    if not articles and fetch_error is not None:
+        raise fetch_error
+    return articles
+
+
+async def load_many_tickers_news(db_path, tickers, days=7, limit=10):
+    """
+    Loads headlines for every ticker concurrently through load_ticker_news_async.
+
+    Returns {ticker: headlines or Exception}; at most NEWS_FETCH_CONCURRENCY
+    tickers are loaded at once.
+    """
+    semaphore = asyncio.Semaphore(NEWS_FETCH_CONCURRENCY)
+
+    async def load(ticker):
+        async with semaphore:
+            return [a['title'] for a in await load_ticker_news_async(db_path, ticker, days, limit)]
+
+    results = await asyncio.gather(*(load(t) for t in tickers), return_exceptions=True)
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error loading news for {ticker}: {result}")
+    return dict(zip(tickers, results))
@@ -0,0 +1,105 @@
+# data/news_client.py
+
+import logging
+import httpx
+import http_replay
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Overridable so load tests can point at a local stand-in (benchmarks/fakes.py)
+NEWSAPI_BASE_URL = config.get('NEWSAPI_BASE_URL', 'https://newsapi.org/v2').rstrip('/')
+NEWSAPI_EVERYTHING_URL = f"{NEWSAPI_BASE_URL}/everything"
+NEWSAPI_TOP_HEADLINES_URL = f"{NEWSAPI_BASE_URL}/top-headlines"
+
+HTTP_MAX_CONNECTIONS = int(config.get('HTTP_MAX_CONNECTIONS', 50))
+# Defaults to the connection pool size so a typical watchlist goes out in one
+# wave; lower it if NewsAPI starts rate-limiting bursts
+NEWS_FETCH_CONCURRENCY = int(config.get('NEWS_FETCH_CONCURRENCY', HTTP_MAX_CONNECTIONS))
+
+_client = None
+
+
+def get_async_client():
+    """Returns the shared pooled HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=int(config.get('HTTP_MAX_KEEPALIVE', 20))
+        )
+        # Limits go on the transport, which applies the record/replay mode
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0), transport=http_replay.AsyncReplayTransport(limits=limits)
+        )
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _everything_params(ticker, n_headlines, since=None):
+    api_key = config.get('NEWS_API_KEY')
+    if not api_key:
+        raise ValueError("NEWSAPI_KEY not configured")
+    params = {
+        'q': ticker,
+        'language': 'en',
+        'sortBy': 'publishedAt',
+        'pageSize': n_headlines,
+        'apiKey': api_key
+    }
+    if since is not None:
+        params['from'] = since.strftime('%Y-%m-%dT%H:%M:%S')
+    return params
+
+
+def parse_articles(payload):
+    """Normalizes NewsAPI articles into title/summary/url/source/published_at dicts."""
+    articles = []
+    for a in payload.get("articles", []):
+        if not a.get('title'):
+            continue
+        articles.append({
+            'title': a['title'],
+            'summary': a.get('description') or '',
+            'url': a.get('url'),
+            'source': (a.get('source') or {}).get('name'),
+            'published_at': a.get('publishedAt')
+        })
+    return articles
+
+
+async def fetch_top_headlines_async(n_headlines=8, category='business'):
+    """Fetches top business headlines; raises on HTTP errors so callers can keep a previous copy."""
+    params = {
+        'category': category,
+        'language': 'en',
+        'pageSize': n_headlines,
+        'apiKey': config.get('NEWS_API_KEY')
+    }
+    resp = await get_async_client().get(NEWSAPI_TOP_HEADLINES_URL, params=params)
+    resp.raise_for_status()
+    return parse_articles(resp.json())
+
+
+def fetch_ticker_articles(ticker, n_headlines=15, since=None):
+    """
+    Fetches recent articles mentioning a ticker (blocking; for the ETL and
+    worker threads). Raises on HTTP errors, so a failed fetch isn't mistaken
+    for a ticker without news.
+    """
+    resp = http_replay.session().get(NEWSAPI_EVERYTHING_URL, params=_everything_params(ticker, n_headlines, since), timeout=10)
+    resp.raise_for_status()
+    return parse_articles(resp.json())
+
+
+async def fetch_ticker_articles_async(ticker, n_headlines=15, since=None):
+    """Fetches recent articles mentioning a ticker without blocking the event loop; raises on HTTP errors."""
+    resp = await get_async_client().get(NEWSAPI_EVERYTHING_URL, params=_everything_params(ticker, n_headlines, since))
+    resp.raise_for_status()
+    return parse_articles(resp.json())
@@ -0,0 +1,91 @@
+# data/news_feed.py
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CachedNewsFeed:
+    """
+    In-memory news feed with a TTL and stale-while-revalidate refresh.
+
+    Callers always get the last good copy immediately; once it is older than
+    ttl_seconds a single background task refreshes it. Only the very first
+    request (no copy yet) waits for the fetch. A failed refresh keeps serving
+    the previous copy.
+
+    fetch is an async callable returning a list of articles; annotate, if
+    given, is a blocking callable run in a thread over the fetched articles
+    before they are published (e.g. to attach sentiment). After a failed
+    refresh the next attempt waits retry_seconds.
+    """
+    def __init__(self, fetch, ttl_seconds=300, annotate=None, retry_seconds=30):
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.annotate = annotate
+        self.retry_seconds = retry_seconds
+        self._items = None
+        self._fetched_at = 0.0
+        self._retry_at = 0.0
+        self._refresh_task = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error = None
+
+    def is_fresh(self):
+        return self._items is not None and time.monotonic() - self._fetched_at < self.ttl_seconds
+
+    async def _refresh(self):
+        try:
+            items = await self.fetch()
+            if self.annotate:
+                items = await asyncio.to_thread(self.annotate, items)
+            self._items, self._fetched_at = items, time.monotonic()
+            self.refreshes += 1
+            self.last_error = None
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self._retry_at = time.monotonic() + self.retry_seconds
+            logger.error(f"News feed refresh failed: {e}")
+            raise
+        finally:
+            self._refresh_task = None
+
+    def _ensure_refresh(self):
+        # Single-flight: concurrent callers share one refresh
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+            # Failures are recorded in _refresh; don't warn about unretrieved exceptions
+            self._refresh_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return self._refresh_task
+
+    async def get(self):
+        if self._items is None:
+            # Nothing to serve yet: wait for the first fetch (raises if it fails)
+            await asyncio.shield(self._ensure_refresh())
+            return self._items
+        if self.is_fresh():
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+            if time.monotonic() >= self._retry_at:
+                self._ensure_refresh()
+        return self._items
+
+    def stats(self):
+        return {
+            'ttl_seconds': self.ttl_seconds,
+            'age_seconds': time.monotonic() - self._fetched_at if self._items is not None else None,
+            'items': len(self._items or []),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'refreshing': self._refresh_task is not None,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,242 @@
+# data/sentiment_store.py
+
+import logging
+import math
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from data.db_pool import read_connection, write_connection
+from sentiment.cache import content_key
+
+logger = logging.getLogger(__name__)
+
+MARKET_KEY = '__MARKET__'
+
+# EWMA time constants: each window's weight decays by 1/e over its span
+EWMA_WINDOWS = {
+    '1d': timedelta(days=1).total_seconds(),
+    '7d': timedelta(days=7).total_seconds(),
+    '30d': timedelta(days=30).total_seconds(),
+}
+
+
+def setup_sentiment_tables(conn):
+    """Creates the scored-news and rolling-aggregate tables if they don't exist."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news_sentiment (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            headline_key TEXT NOT NULL,
+            published_at TIMESTAMP NOT NULL,
+            title TEXT NOT NULL,
+            summary TEXT,
+            url TEXT,
+            source TEXT,
+            label TEXT NOT NULL,
+            score REAL NOT NULL,
+            numerical_score REAL NOT NULL,
+            ingested_at TIMESTAMP NOT NULL,
+            UNIQUE(ticker, headline_key)
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_news_sentiment_ticker_time ON news_sentiment (ticker, published_at)'
+    )
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sentiment_aggregates (
+            ticker TEXT NOT NULL,
+            span TEXT NOT NULL,
+            weighted_sum REAL NOT NULL,
+            weight REAL NOT NULL,
+            last_ts REAL NOT NULL,
+            observations INTEGER NOT NULL,
+            PRIMARY KEY (ticker, span)
+        )
+    ''')
+    # When each ticker was last scored, whether or not that run stored anything
+    # new; MAX(ingested_at) alone would leave a quiet ticker stale forever
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sentiment_ingest_runs (
+            ticker TEXT PRIMARY KEY,
+            last_run_at TIMESTAMP NOT NULL,
+            headlines INTEGER NOT NULL
+        )
+    ''')
+
+
+def _parse_ts(value):
+    """ISO-8601 (NewsAPI style, 'Z' suffix allowed) to an aware UTC datetime."""
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _update_aggregates(cursor, ticker, ts, value):
+    """
+    Folds one observation into every EWMA window for a ticker in O(1).
+
+    Each window keeps a time-decayed sum and weight, so the EWMA is their
+    ratio and no history has to be re-read. Observations older than the last
+    one are decayed themselves instead of decaying the running state.
+    """
+    for window, tau in EWMA_WINDOWS.items():
+        row = cursor.execute(
+            'SELECT weighted_sum, weight, last_ts, observations FROM sentiment_aggregates WHERE ticker = ? AND span = ?',
+            (ticker, window)
+        ).fetchone()
+        if row is None:
+            weighted_sum, weight, last_ts, observations = value, 1.0, ts, 1
+        else:
+            weighted_sum, weight, last_ts, observations = row
+            if ts >= last_ts:
+                decay = math.exp(-(ts - last_ts) / tau)
+                weighted_sum, weight, last_ts = weighted_sum * decay + value, weight * decay + 1.0, ts
+            else:
+                decay = math.exp(-(last_ts - ts) / tau)
+                weighted_sum, weight = weighted_sum + value * decay, weight + decay
+            observations += 1
+        cursor.execute(
+            'INSERT OR REPLACE INTO sentiment_aggregates (ticker, span, weighted_sum, weight, last_ts, observations) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (ticker, window, weighted_sum, weight, last_ts, observations)
+        )
+
+
+def record_scored_headlines(db_path, ticker, items):
+    """
+    Stores scored headlines for a ticker and updates rolling aggregates.
+
+    items are dicts with headline_key, published_at, title, label, score,
+    numerical_score and optionally summary, url, source. Headlines already
+    stored for the ticker are skipped; the market-wide aggregate counts each
+    distinct headline once across tickers. The run itself is recorded even
+    when nothing new was stored. Returns the number of new rows.
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    ingested_at = datetime.now(timezone.utc).isoformat()
+    inserted = 0
+    with write_connection(db_path) as conn:
+        setup_sentiment_tables(conn)
+        cursor = conn.cursor()
+        for item in items:
+            ts = _parse_ts(item['published_at'])
+            seen_elsewhere = cursor.execute(
+                'SELECT 1 FROM news_sentiment WHERE headline_key = ? LIMIT 1', (item['headline_key'],)
+            ).fetchone()
+            cursor.execute(
+                'INSERT OR IGNORE INTO news_sentiment (ticker, headline_key, published_at, title, summary, url, source, '
+                'label, score, numerical_score, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (ticker, item['headline_key'], ts.isoformat(), item['title'], item.get('summary'), item.get('url'),
+                 item.get('source'), item['label'], item['score'], item['numerical_score'], ingested_at)
+            )
+            if cursor.rowcount == 0:
+                continue
+            inserted += 1
+            _update_aggregates(cursor, ticker, ts.timestamp(), item['numerical_score'])
+            if not seen_elsewhere:
+                _update_aggregates(cursor, MARKET_KEY, ts.timestamp(), item['numerical_score'])
+        cursor.execute(
+            'INSERT OR REPLACE INTO sentiment_ingest_runs (ticker, last_run_at, headlines) VALUES (?, ?, ?)',
+            (ticker, ingested_at, len(items))
+        )
+        conn.commit()
+    logger.info(f"Stored {inserted} new scored headlines for {ticker}")
+    return inserted
+
+
+def record_scored_articles(db_path, ticker, articles, scored):
+    """Stores articles (see data.news_client.parse_articles) alongside their sentiment results."""
+    now = datetime.now(timezone.utc)
+    items = []
+    for article, result in zip(articles, scored):
+        items.append({
+            'headline_key': content_key(article['title']),
+            'published_at': article.get('published_at') or now,
+            'title': article['title'],
+            'summary': article.get('summary'),
+            'url': article.get('url'),
+            'source': article.get('source'),
+            'label': result['label'],
+            'score': result['score'],
+            'numerical_score': result['numerical_score']
+        })
+    return record_scored_headlines(db_path, ticker, items)
+
+
+def get_aggregates(db_path, ticker):
+    """Returns {window: {'ewma', 'weight', 'observations', 'last_update'}} for a ticker."""
+    now = datetime.now(timezone.utc).timestamp()
+    try:
+        with read_connection(db_path) as conn:
+            rows = conn.execute(
+                'SELECT span, weighted_sum, weight, last_ts, observations FROM sentiment_aggregates WHERE ticker = ?',
+                (ticker,)
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    aggregates = {}
+    for window, weighted_sum, weight, last_ts, observations in rows:
+        aggregates[window] = {
+            'ewma': weighted_sum / weight if weight else 0.0,
+            # Effective number of observations still "in" the window as of now
+            'weight': weight * math.exp(-max(now - last_ts, 0) / EWMA_WINDOWS[window]),
+            'observations': observations,
+            'last_update': datetime.fromtimestamp(last_ts, timezone.utc).isoformat()
+        }
+    return aggregates
+
+
+def get_recent_headlines(db_path, ticker, days=7, limit=50):
+    """Scored headlines for a ticker published in the last `days` days, newest first."""
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    try:
+        with read_connection(db_path) as conn:
+            # Pooled connections are shared, so set the row factory on the cursor only
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(
+                'SELECT title, summary, url, source, published_at, label, score, numerical_score, ingested_at '
+                'FROM news_sentiment WHERE ticker = ? AND published_at >= ? ORDER BY published_at DESC LIMIT ?',
+                (ticker, since, limit)
+            ).fetchall()
+    except sqlite3.Error:
+        return []
+    return [dict(row) for row in rows]
+
+
+def get_last_ingest_time(db_path, ticker):
+    """When headlines for the ticker were last scored and stored, or None."""
+    try:
+        with read_connection(db_path) as conn:
+            row = conn.execute(
+                'SELECT last_run_at FROM sentiment_ingest_runs WHERE ticker = ?', (ticker,)
+            ).fetchone()
+            if row is None:
+                # Stored before ingest runs were recorded
+                row = conn.execute(
+                    'SELECT MAX(ingested_at) FROM news_sentiment WHERE ticker = ?', (ticker,)
+                ).fetchone()
+    except sqlite3.Error:
+        return None
+    return _parse_ts(row[0]) if row and row[0] else None
+
+
+def get_top_movers(db_path, window='7d', limit=3):
+    """(most positive, most negative) tickers by EWMA for a window, as (ticker, ewma, observations)."""
+    try:
+        with read_connection(db_path) as conn:
+            rows = conn.execute(
+                'SELECT ticker, weighted_sum / weight AS ewma, observations FROM sentiment_aggregates '
+                'WHERE span = ? AND ticker != ? AND weight > 0 ORDER BY ewma DESC',
+                (window, MARKET_KEY)
+            ).fetchall()
+    except sqlite3.Error:
+        return [], []
+    bullish = [row for row in rows if row[1] > 0][:limit]
+    bearish = [row for row in reversed(rows) if row[1] < 0][:limit]
+    return bullish, bearish
@@ -0,0 +1,229 @@
+# executors.py
+
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from config.config import config
+from metrics import REGISTRY
+from profiling import current_profile, run_profiled
+from tracing import current_context, run_traced, export_spans
+
+logger = logging.getLogger(__name__)
+
+# Execution model for the async API server:
+#   - HTTP calls use async clients (see data/news_client.py) on the event loop
+#   - SQLite work runs on a bounded thread pool (run_db)
+#   - CPU-bound model work (ARIMA fits) runs on a process pool (run_cpu), so a
+#     long fit can't hold the GIL and stall the event loop
+#   - other blocking calls (file I/O, sync SDKs, FinBERT, which releases the
+#     GIL) use asyncio.to_thread; anything that opens a SQLite connection uses
+#     run_db so the pool bounds database concurrency
+DB_POOL_SIZE = int(config.get('DB_POOL_SIZE', 8))
+CPU_POOL_SIZE = int(config.get('CPU_POOL_SIZE', max(1, (os.cpu_count() or 2) - 1)))
+LOOP_LAG_INTERVAL = float(config.get('LOOP_LAG_INTERVAL_MS', 100)) / 1000
+LOOP_LAG_WARN = float(config.get('LOOP_LAG_WARN_MS', 200)) / 1000
+
+
+class PoolStats:
+    def __init__(self, name, size):
+        self._lock = threading.Lock()
+        self.name = name
+        self.size = size
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finished(self, ok):
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+
+_db_pool = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix='db')
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+db_pool_stats = PoolStats('db', DB_POOL_SIZE)
+cpu_pool_stats = PoolStats('cpu', CPU_POOL_SIZE)
+
+
+def _warm_cpu_worker():
+    # Import statsmodels once per worker instead of on its first forecast
+    from stock_forecast import preload_models
+    try:
+        preload_models()
+    except ImportError as e:
+        # Surface the error on the forecast itself rather than killing the pool
+        logger.warning(f"Could not preload forecasting models: {e}")
+
+
+def get_cpu_pool():
+    """Returns the shared process pool, or None when CPU_POOL_SIZE is 0."""
+    global _cpu_pool
+    if CPU_POOL_SIZE <= 0:
+        return None
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            # spawn rather than fork: the parent holds torch and client threads
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=CPU_POOL_SIZE,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_cpu_worker
+            )
+        return _cpu_pool
+
+
+def _call_in_worker(profile, trace_parent, fn, *args):
+    # Runs in a pool worker, one call at a time: return this call's metric
+    # observations (plus sampled stacks for a profiled request and finished
+    # spans for a traced one) with the result so the API process can merge them
+    REGISTRY.reset()
+    call = functools.partial(fn, *args)
+    if trace_parent is not None:
+        call = functools.partial(run_traced, trace_parent, call)
+    if profile:
+        call = functools.partial(run_profiled, call)
+    result, stacks, spans = call(), None, None
+    if profile:
+        result, stacks = result
+    if trace_parent is not None:
+        result, spans = result
+    return result, REGISTRY.export(), stacks, spans
+
+
+async def _run_tracked(stats, executor, fn, *args):
+    stats.started()
+    ok = False
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        ok = True
+        return result
+    finally:
+        stats.finished(ok)
+
+
+async def run_db(fn, *args):
+    """Runs a blocking SQLite call on the bounded DB thread pool."""
+    # Like asyncio.to_thread, carry context variables (the current span) over
+    return await _run_tracked(db_pool_stats, _db_pool, contextvars.copy_context().run, fn, *args)
+
+
+async def run_cpu(fn, *args):
+    """
+    Runs CPU-bound work in the process pool. fn and its arguments must be
+    picklable (module-level functions). Falls back to a thread when the pool
+    is disabled.
+    """
+    global _cpu_pool
+    pool = get_cpu_pool()
+    if pool is None:
+        return await _run_tracked(cpu_pool_stats, None, contextvars.copy_context().run, fn, *args)
+    profile = current_profile.get()
+    try:
+        result, observed, stacks, spans = await _run_tracked(
+            cpu_pool_stats, pool, _call_in_worker, profile is not None, current_context(), fn, *args
+        )
+        REGISTRY.merge(observed)
+        if stacks:
+            profile.add_stacks(stacks, 'cpu-pool')
+        export_spans(spans)
+        return result
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool for the next call
+        with _cpu_pool_lock:
+            if _cpu_pool is pool:
+                _cpu_pool = None
+        raise
+
+
+def shutdown_pools():
+    global _cpu_pool
+    _db_pool.shutdown(wait=False)
+    with _cpu_pool_lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=False, cancel_futures=True)
+            _cpu_pool = None
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop responsiveness: a task sleeps for a fixed interval
+    and records how late it wakes up. Sustained lag means something is
+    blocking the loop.
+    """
+    def __init__(self, interval=LOOP_LAG_INTERVAL, warn_threshold=LOOP_LAG_WARN, window=600):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._samples = deque(maxlen=window)
+        self._task = None
+        self.max_lag = 0.0
+        self.slow_ticks = 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - start - self.interval, 0.0)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.warn_threshold:
+                self.slow_ticks += 1
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self):
+        samples = np.array(self._samples) * 1000
+        if not len(samples):
+            return {'samples': 0}
+        return {
+            'samples': len(samples),
+            'interval_ms': self.interval * 1000,
+            'mean_ms': float(samples.mean()),
+            'p50_ms': float(np.percentile(samples, 50)),
+            'p99_ms': float(np.percentile(samples, 99)),
+            'window_max_ms': float(samples.max()),
+            'max_ms': self.max_lag * 1000,
+            'slow_ticks': self.slow_ticks
+        }
+
+
+loop_lag = LoopLagMonitor()
@@ -0,0 +1,263 @@
+# http_replay.py
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from config.config import config
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Record/replay for outbound HTTP (Alpha Vantage, NewsAPI, Groq). Every client
+# the backend uses goes through the adapter/transports below:
+#   off     requests go to the network as usual
+#   record  requests go to the network and each response is saved as a
+#           gzipped JSON fixture under HTTP_FIXTURE_DIR
+#   replay  responses are served from the fixtures with no network access; a
+#           request without a fixture fails like a connection error
+# Fixtures are keyed by method, host, path, query and body. Credentials are
+# never stored, and the key ignores them and the NewsAPI time window
+# (from/to), so recordings replay with any key on any day.
+MODES = ('off', 'record', 'replay')
+MODE = config.get('HTTP_REPLAY_MODE', 'off').lower()
+FIXTURE_DIR = Path(config.get('HTTP_FIXTURE_DIR', 'fixtures/http'))
+
+SECRET_PARAMS = {'apikey', 'api_key'}
+IGNORED_PARAMS = SECRET_PARAMS | {'from', 'to'}
+
+if MODE not in MODES:
+    logger.warning(f"Unknown HTTP_REPLAY_MODE {MODE!r}; using 'off'")
+    MODE = 'off'
+
+http_replay_total = REGISTRY.counter(
+    'http_replay_total', 'Outbound HTTP requests handled in record or replay mode', ('mode', 'result')
+)
+
+
+def set_mode(mode, fixture_dir=None):
+    """Switches mode (and optionally the fixture directory) for subsequent requests."""
+    global MODE, FIXTURE_DIR
+    if mode not in MODES:
+        raise ValueError(f"HTTP replay mode must be one of {MODES}, got {mode!r}")
+    MODE = mode
+    if fixture_dir is not None:
+        FIXTURE_DIR = Path(fixture_dir)
+    _store.clear()
+    logger.info(f"HTTP replay mode: {MODE} (fixtures in {FIXTURE_DIR})")
+
+
+def _canonical_body(body):
+    if not body:
+        return ''
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+    except ValueError:
+        return body
+
+
+def describe(method, url, body=None):
+    """Returns (fixture key, request description with credentials removed)."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    host = parts.hostname or 'unknown'
+    body = _canonical_body(body)
+    keyed_query = sorted((k, v) for k, v in query if k.lower() not in IGNORED_PARAMS)
+    digest = hashlib.sha256(json.dumps([method.upper(), host, parts.path, keyed_query, body]).encode()).hexdigest()
+    request = {
+        'method': method.upper(),
+        'url': f"{parts.scheme}://{host}{parts.path}",
+        'query': [[k, '***' if k.lower() in SECRET_PARAMS else v] for k, v in query],
+        'body': body,
+    }
+    return f"{host}/{digest[:24]}", request
+
+
+class FixtureStore:
+    """Reads and writes fixtures, keeping replayed ones in memory."""
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return FIXTURE_DIR / f"{key}.json.gz"
+
+    def load(self, key):
+        with self._lock:
+            fixture = self._cache.get(key)
+        if fixture is not None:
+            return fixture
+        try:
+            fixture = json.loads(gzip.decompress(self._path(key).read_bytes()))
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._cache[key] = fixture
+        return fixture
+
+    def save(self, key, request, status, content_type, content):
+        try:
+            body = {'text': content.decode('utf-8')}
+        except UnicodeDecodeError:
+            body = {'base64': base64.b64encode(content).decode('ascii')}
+        fixture = {
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'request': request,
+            'response': {'status': status, 'content_type': content_type, **body},
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so a concurrent replay never reads half a file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(gzip.compress(json.dumps(fixture).encode('utf-8'), mtime=0))
+        os.replace(tmp, path)
+        with self._lock:
+            self._cache[key] = fixture
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_store = FixtureStore()
+
+
+def _fixture_content(fixture):
+    response = fixture['response']
+    if 'base64' in response:
+        return base64.b64decode(response['base64'])
+    return response['text'].encode('utf-8')
+
+
+def _fixture_headers(fixture):
+    content_type = fixture['response'].get('content_type')
+    return {'Content-Type': content_type} if content_type else {}
+
+
+def _replay(key, request):
+    fixture = _store.load(key)
+    if fixture is None:
+        http_replay_total.inc('replay', 'miss')
+        logger.warning(f"No recorded response for {request['method']} {request['url']} ({key})")
+        return None
+    http_replay_total.inc('replay', 'hit')
+    return fixture
+
+
+def _record(key, request, status, content_type, content):
+    try:
+        _store.save(key, request, status, content_type, content)
+        http_replay_total.inc('record', 'saved')
+    except OSError as e:
+        http_replay_total.inc('record', 'error')
+        logger.warning(f"Could not record {request['method']} {request['url']}: {e}")
+
+
+class ReplayAdapter(HTTPAdapter):
+    """requests transport adapter applying the record/replay mode."""
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if MODE == 'off':
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        key, described = describe(request.method, request.url, request.body)
+        if MODE == 'replay':
+            fixture = _replay(key, described)
+            if fixture is None:
+                raise requests.ConnectionError(f"No recorded response for {described['url']} (replay mode)", request=request)
+            response = requests.Response()
+            response.status_code = fixture['response']['status']
+            response.headers = CaseInsensitiveDict(_fixture_headers(fixture))
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = _fixture_content(fixture)
+            response.url = request.url
+            response.request = request
+            response.reason = 'Replayed'
+            return response
+        response = super().send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        _record(key, described, response.status_code, response.headers.get('Content-Type'), response.content)
+        return response
+
+
+_local = threading.local()
+
+
+def session():
+    """Returns this thread's requests Session, routed through ReplayAdapter."""
+    current = getattr(_local, 'session', None)
+    if current is None:
+        current = requests.Session()
+        adapter = ReplayAdapter()
+        current.mount('http://', adapter)
+        current.mount('https://', adapter)
+        _local.session = current
+    return current
+
+
+def _decoded_headers(headers):
+    # The recorded body is already decompressed and may be re-chunked
+    return [(k, v) for k, v in headers.items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+
+
+def _httpx_response(fixture, request):
+    return httpx.Response(
+        fixture['response']['status'], headers=_fixture_headers(fixture),
+        content=_fixture_content(fixture), request=request
+    )
+
+
+class ReplayTransport(httpx.HTTPTransport):
+    """
+    httpx transport applying the record/replay mode. Recorded responses are
+    read in full before being returned, so a streamed response arrives all
+    at once while recording.
+    """
+    def handle_request(self, request):
+        if MODE == 'off':
+            return super().handle_request(request)
+        key, described = describe(request.method, str(request.url), request.read())
+        if MODE == 'replay':
+            fixture = _replay(key, described)
+            if fixture is None:
+                raise httpx.ConnectError(f"No recorded response for {described['url']} (replay mode)", request=request)
+            return _httpx_response(fixture, request)
+        response = super().handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        _record(key, described, response.status_code, response.headers.get('content-type'), content)
+        return httpx.Response(response.status_code, headers=_decoded_headers(response.headers), content=content, request=request)
+
+
+class AsyncReplayTransport(httpx.AsyncHTTPTransport):
+    """Async counterpart of ReplayTransport; fixture files are read and written off the event loop."""
+    async def handle_async_request(self, request):
+        if MODE == 'off':
+            return await super().handle_async_request(request)
+        key, described = describe(request.method, str(request.url), await request.aread())
+        if MODE == 'replay':
+            fixture = await asyncio.to_thread(_replay, key, described)
+            if fixture is None:
+                raise httpx.ConnectError(f"No recorded response for {described['url']} (replay mode)", request=request)
+            return _httpx_response(fixture, request)
+        response = await super().handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        await asyncio.to_thread(_record, key, described, response.status_code, response.headers.get('content-type'), content)
+        return httpx.Response(response.status_code, headers=_decoded_headers(response.headers), content=content, request=request)
@@ -15,6 +15,7 @@ sys.path.insert(0, str(project_root))
 from config.logging_config import setup_logging
 from data.etl_pipeline import run_etl_pipeline
 from config.config import config
+import http_replay
 
 # Import the new forecasting function from stock_forecast.py
 from stock_forecast import generate_forecasts
@@ -48,11 +49,23 @@ def main():
         action='store_true',
         help='Validate configuration and API keys'
     )
+    parser.add_argument(
+        '--http-mode',
+        choices=['off', 'record', 'replay'],
+        help='Record outbound API responses as fixtures, or replay them without network access'
+    )
+    parser.add_argument(
+        '--fixture-dir',
+        help='Directory for recorded HTTP fixtures'
+    )
     args = parser.parse_args()
 
     # Setup logging
     setup_logging()
 
+    if args.http_mode or args.fixture_dir:
+        http_replay.set_mode(args.http_mode or http_replay.MODE, args.fixture_dir)
+
     # Validate configuration if requested
     if args.validate_config:
         if config.validate_config():
@@ -115,7 +128,8 @@ def main():
             db_path=db_path,
             tickers=tickers_to_process,
             forecast_horizon=forecast_horizon,
-            target_currency=target_currency
+            target_currency=target_currency,
+            show_plot=True
         )
 
         # Print forecast summary
@@ -0,0 +1,177 @@
+# market_feed.py
+
+import asyncio
+import json
+import logging
+import math
+from config.config import config
+from response_cache import unwrap
+
+logger = logging.getLogger(__name__)
+
+MARKET_FEED_POLL_SECONDS = float(config.get('MARKET_FEED_POLL_SECONDS', 2))
+MARKET_FEED_QUEUE_SIZE = int(config.get('MARKET_FEED_QUEUE_SIZE', 32))
+MARKET_FEED_HEARTBEAT_SECONDS = float(config.get('MARKET_FEED_HEARTBEAT_SECONDS', 15))
+
+
+def _clean(value):
+    # NaN (e.g. the first day's change) is not valid JSON
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def diff_quotes(previous, current):
+    """(changed quotes, removed symbols) between two {symbol: quote} snapshots."""
+    changed = [quote for symbol, quote in current.items() if previous.get(symbol) != quote]
+    removed = [symbol for symbol in previous if symbol not in current]
+    return changed, removed
+
+
+def format_sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscriber:
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = asyncio.Event()
+
+
+class MarketFeed:
+    """
+    Fans out market quote updates to push subscribers from a single producer.
+
+    The producer watches the market data version (bumped by every ETL commit)
+    and, when it changes, reloads the snapshot once and publishes only the
+    symbols whose values changed. Each subscriber has a bounded queue; one
+    that falls behind by more than MARKET_FEED_QUEUE_SIZE messages is dropped
+    and its client reconnects to a fresh snapshot.
+
+    load_snapshot and get_version are coroutine functions returning the list
+    of quote dicts and the current data version. A snapshot wrapped in
+    response_cache.Fallback (placeholder quotes) is published but not tied
+    to the version, so the next poll tries to load real quotes again.
+
+    The producer only runs while someone is subscribed: it stops at the first
+    poll after the last client leaves, and the next subscribe restarts it and
+    waits for a fresh snapshot.
+    """
+    def __init__(self, load_snapshot, get_version, poll_seconds=MARKET_FEED_POLL_SECONDS,
+                 queue_size=MARKET_FEED_QUEUE_SIZE):
+        self.load_snapshot = load_snapshot
+        self.get_version = get_version
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._clients = 0
+        self._quotes = None
+        self._version = None
+        self._seq = 0
+        self._producer = None
+        self._ready = asyncio.Event()
+        self.published = 0
+        self.dropped = 0
+
+    async def _refresh(self):
+        version = await self.get_version()
+        if version == self._version and self._quotes is not None:
+            return
+        snapshot, fallback = unwrap(await self.load_snapshot())
+        quotes = {
+            q['symbol']: {k: _clean(v) for k, v in q.items()}
+            for q in snapshot
+        }
+        changed, removed = diff_quotes(self._quotes or {}, quotes)
+        first = self._quotes is None
+        self._quotes, self._version = quotes, None if fallback else version
+        self._ready.set()
+        if not first and (changed or removed):
+            self._seq += 1
+            self.publish(format_sse('delta', {
+                'seq': self._seq, 'version': version, 'changed': changed, 'removed': removed
+            }, self._seq))
+
+    async def _run(self):
+        # Clients waiting for their first snapshot count, so a failing first
+        # refresh keeps retrying rather than leaving them waiting
+        while True:
+            try:
+                await self._refresh()
+            except Exception as e:
+                logger.error(f"Market feed refresh failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+            if not self._clients:
+                break
+        # Whatever is held now may be stale by the time the next client arrives
+        self._ready.clear()
+        self._version = None
+
+    def _ensure_producer(self):
+        if self._producer is None or self._producer.done():
+            self._producer = asyncio.get_running_loop().create_task(self._run())
+
+    def publish(self, message):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow consumer: drop it rather than buffer without bound
+                self._subscribers.discard(subscriber)
+                subscriber.dropped.set()
+                self.dropped += 1
+                logger.warning("Dropped slow market feed subscriber")
+        self.published += 1
+
+    async def subscribe(self):
+        """
+        Yields server-sent events for one client: a full snapshot, then
+        deltas, with heartbeat comments while idle.
+        """
+        subscriber = Subscriber(self.queue_size)
+        self._clients += 1
+        try:
+            self._ensure_producer()
+            await self._ready.wait()
+            self._subscribers.add(subscriber)
+            yield format_sse('snapshot', {
+                'seq': self._seq, 'version': self._version, 'quotes': list(self._quotes.values())
+            }, self._seq)
+            while not subscriber.dropped.is_set():
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), MARKET_FEED_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message
+            # Tell the client why the stream ends; EventSource reconnects to a fresh snapshot
+            yield format_sse('dropped', {'reason': 'slow consumer'})
+        finally:
+            self._subscribers.discard(subscriber)
+            self._clients -= 1
+
+    async def stop(self):
+        if self._producer is not None:
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+            self._producer = None
+
+    def stats(self):
+        return {
+            'subscribers': len(self._subscribers),
+            'producer_running': self._producer is not None and not self._producer.done(),
+            'version': self._version,
+            'seq': self._seq,
+            'symbols': len(self._quotes or {}),
+            'published': self.published,
+            'dropped_subscribers': self.dropped,
+            'max_queue_depth': max((s.queue.qsize() for s in self._subscribers), default=0)
+        }
@@ -0,0 +1,246 @@
+# metrics.py
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Prometheus text exposition without the prometheus_client dependency. Each
+# observation is a bisect and a few additions under a per-metric lock, cheap
+# enough for the SQLite and HTTP hot paths.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+STREAM_BUCKETS = (1, 5, 15, 30, 60, 300, 900, 1800, 3600)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in items]
+
+    def export(self):
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, exported):
+        with self._lock:
+            for labels, value in exported.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets. Label values are passed positionally,
+    in labelnames order: histogram.observe(0.12, 'GET', '/api/portfolio').
+    """
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        samples = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                samples.append((f'{self.name}_bucket', _format_labels(self.labelnames, labels, le), cumulative))
+            samples.append((f'{self.name}_sum', _format_labels(self.labelnames, labels), total))
+            samples.append((f'{self.name}_count', _format_labels(self.labelnames, labels), cumulative))
+        return samples
+
+    def export(self):
+        with self._lock:
+            return {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+    def merge(self, exported):
+        with self._lock:
+            for labels, (counts, total) in exported.items():
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                for i, count in enumerate(counts):
+                    series[0][i] += count
+                series[1] += total
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Module reloads (and spawned workers) re-declare the same metric
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collect):
+        """
+        Adds a callback evaluated at scrape time. It returns a list of
+        (name, type, documentation, [(labels dict, value), ...]) tuples, for
+        values such as cache hit ratios that other components already track.
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        """The registry in Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        for collect in collectors:
+            for name, type_name, documentation, samples in collect():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {type_name}')
+                for labels, value in samples:
+                    label_text = _format_labels(labels.keys(), labels.values())
+                    lines.append(f'{name}{label_text} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """Raw metric state, for shipping observations out of a worker process."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.export() for metric in metrics}
+
+    def merge(self, exported):
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, state in exported.items():
+            if name in metrics:
+                metrics[name].merge(state)
+
+    def reset(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per method, route template and
+    status code. Unmatched paths share one 'unmatched' route label so that
+    scanners can't create unbounded series. Server-sent event streams stay open
+    for as long as the client listens, so they are recorded separately in
+    http_stream_duration_seconds rather than skewing request latency.
+    """
+    def __init__(self, app, registry=REGISTRY):
+        self.app = app
+        self.requests = registry.histogram(
+            'http_request_duration_seconds', 'HTTP request latency', ('method', 'route', 'status')
+        )
+        self.streams = registry.histogram(
+            'http_stream_duration_seconds', 'How long server-sent event streams stayed open', ('method', 'route', 'status'),
+            buckets=STREAM_BUCKETS
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        streaming = False
+
+        async def send_with_status(message):
+            nonlocal status, streaming
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                content_type = dict(message.get('headers', ())).get(b'content-type', b'')
+                streaming = content_type.startswith(b'text/event-stream')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            (self.streams if streaming else self.requests).observe(
+                time.perf_counter() - start, scope['method'],
+                getattr(route, 'path', 'unmatched'), str(status)
+            )
@@ -0,0 +1,179 @@
+# profiling.py
+
+import asyncio
+import hmac
+import logging
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Opt-in per-request profiling. Disabled unless PROFILE_TOKEN is set; then a
+# request to one of PROFILE_PATHS carrying "X-Profile-Token: <token>" is
+# sampled and its stacks saved in collapsed ("folded") format, which
+# flamegraph.pl, inferno and speedscope read directly. Requests without the
+# header only pay a path lookup.
+PROFILE_TOKEN = config.get('PROFILE_TOKEN', '')
+PROFILE_PATHS = frozenset(
+    p.strip() for p in config.get('PROFILE_PATHS', '/api/forecast,/api/sentiment-analysis').split(',') if p.strip()
+)
+PROFILE_DIR = Path(config.get('PROFILE_DIR', 'logs/profiles'))
+PROFILE_MAX_FILES = int(config.get('PROFILE_MAX_FILES', 50))
+PROFILE_INTERVAL = float(config.get('PROFILE_INTERVAL_MS', 5)) / 1000
+PROFILE_MAX_CONCURRENT = int(config.get('PROFILE_MAX_CONCURRENT', 2))
+
+HEADER = b'x-profile-token'
+ID_HEADER = b'x-profile-id'
+
+# Innermost frames of threads that are parked rather than working
+_IDLE_FRAMES = {
+    ('threading.py', 'wait'), ('queue.py', 'get'), ('selectors.py', 'select'),
+    ('thread.py', '_worker'), ('connection.py', '_recv'), ('socket.py', 'accept'),
+}
+
+current_profile = ContextVar('current_profile', default=None)
+_active = threading.BoundedSemaphore(PROFILE_MAX_CONCURRENT)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame):
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+def _collapse(frame, root):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Samples the stacks of every busy thread in this process every `interval`
+    seconds from a background thread. The event loop thread is shared, so a
+    profile also shows other requests' work that ran at the same time.
+    """
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                self.stacks[_collapse(frame, names.get(ident, str(ident)))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+def run_profiled(fn, *args):
+    """Calls fn under a sampler; returns (result, stacks). Used inside pool workers."""
+    sampler = StackSampler()
+    sampler.start()
+    try:
+        result = fn(*args)
+    finally:
+        stacks = sampler.stop()
+    return result, dict(stacks)
+
+
+class RequestProfile:
+    def __init__(self, label):
+        self.id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.sampler = StackSampler()
+        self._lock = threading.Lock()
+        self._extra = Counter()
+
+    def add_stacks(self, stacks, root):
+        """Merges stacks sampled elsewhere (e.g. a CPU pool worker) under `root`."""
+        with self._lock:
+            for stack, count in stacks.items():
+                self._extra[f"{root};{stack}"] += count
+
+    def folded(self):
+        stacks = self.sampler.stacks + self._extra
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def save_profile(profile):
+    """Writes <id>.folded to PROFILE_DIR, keeping only the newest PROFILE_MAX_FILES."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"{profile.id}.folded"
+    path.write_text(profile.folded(), encoding='utf-8')
+    profiles = sorted(PROFILE_DIR.glob('*.folded'), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:-PROFILE_MAX_FILES]:
+        old.unlink(missing_ok=True)
+    logger.info(f"Saved profile {profile.id} for {profile.label} ({profile.sampler.samples} samples)")
+    return path
+
+
+def _requests_profile(scope):
+    if not PROFILE_TOKEN or scope['path'] not in PROFILE_PATHS:
+        return False
+    for name, value in scope['headers']:
+        if name == HEADER:
+            return hmac.compare_digest(value, PROFILE_TOKEN.encode())
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests opting in with the admin header and
+    returns the profile id in X-Profile-Id. At most PROFILE_MAX_CONCURRENT
+    requests are profiled at once; others run unprofiled.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not _requests_profile(scope) or not _active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+
+        async def send_with_id(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + [(ID_HEADER, profile.id.encode())]
+            await send(message)
+
+        token = current_profile.set(profile)
+        profile.sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.sampler.stop()
+            current_profile.reset(token)
+            _active.release()
+            try:
+                await asyncio.to_thread(save_profile, profile)
+            except OSError as e:
+                logger.error(f"Could not save profile {profile.id}: {e}")
@@ -0,0 +1,84 @@
+# response_cache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class Fallback:
+    """
+    Wraps placeholder data served when the database can't answer (no data
+    yet, or a failed read). It is sent to the client but never cached or
+    given a version ETag, so the real data replaces it on the next request.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+
+def unwrap(value):
+    """(data, is_fallback) for a value that may be a Fallback."""
+    if isinstance(value, Fallback):
+        return value.data, True
+    return value, False
+
+
+class ResponseCache:
+    """
+    Serialized API responses keyed by (name, data version).
+
+    Entries never expire on their own: when the ETL commits new market data
+    the version changes, so lookups miss and the stale entry is evicted. The
+    ETag is derived from the name and version, so a client revalidating with
+    If-None-Match can be answered without building the response at all.
+    """
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_etag(name, version):
+        digest = hashlib.sha1(f"{name}:{version}".encode('utf-8')).hexdigest()[:16]
+        return f'"{digest}"'
+
+    def get(self, name, version):
+        """Returns the cached body for this version, or None."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, name, version, body):
+        with self._lock:
+            current = self._entries.get(name)
+            # A slow builder must not overwrite a newer version's entry
+            if current is not None and current[0] > version:
+                return
+            self._entries[name] = (version, body)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,109 @@
+# sentiment/backends.py
+
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('pytorch', 'quantized', 'onnx')
+ONNX_OPSET = 14
+
+
+def _load_pytorch(model_name):
+    from transformers import pipeline
+    return pipeline(
+        "sentiment-analysis",
+        model=model_name,
+        tokenizer=model_name,
+        device=-1  # Use CPU
+    )
+
+
+def _load_quantized(model_name):
+    """fp32 pipeline with every Linear layer swapped for a dynamic int8 kernel."""
+    import torch
+
+    finbert_pipeline = _load_pytorch(model_name)
+    finbert_pipeline.model = torch.quantization.quantize_dynamic(
+        finbert_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return finbert_pipeline
+
+
+class OnnxSequenceClassifier:
+    """
+    Minimal stand-in for a transformers model backed by an ONNX Runtime session.
+
+    Exposes config, device and a __call__ returning an object with .logits, which
+    is all predict_sentiment needs.
+    """
+    def __init__(self, onnx_path, model_config):
+        import onnxruntime as ort
+        import torch
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = int(config.get('ONNX_INTRA_OP_THREADS', 0))
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(onnx_path), options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.config = model_config
+        self.device = torch.device('cpu')
+
+    def __call__(self, **inputs):
+        import torch
+
+        feed = {name: tensor.cpu().numpy() for name, tensor in inputs.items() if name in self.input_names}
+        logits = self.session.run(['logits'], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def export_onnx(model_name, onnx_path):
+    """Exports the fp32 model to ONNX with dynamic batch and sequence axes."""
+    import torch
+
+    finbert_pipeline = _load_pytorch(model_name)
+    model, tokenizer = finbert_pipeline.model, finbert_pipeline.tokenizer
+    sample = tokenizer(["Shares rise after earnings beat"], return_tensors='pt')
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    Path(onnx_path).parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Exporting {model_name} to ONNX at {onnx_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[name] for name in input_names), str(onnx_path),
+            input_names=input_names, output_names=['logits'],
+            dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET
+        )
+    return finbert_pipeline
+
+
+def _load_onnx(model_name):
+    from transformers import AutoConfig, AutoTokenizer
+
+    onnx_path = Path(config.get('SENTIMENT_ONNX_PATH', 'models/finbert-tone.onnx'))
+    if not onnx_path.exists():
+        export_onnx(model_name, onnx_path)
+    return SimpleNamespace(
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        model=OnnxSequenceClassifier(onnx_path, AutoConfig.from_pretrained(model_name))
+    )
+
+
+def load_backend(backend, model_name):
+    """
+    Loads a FinBERT backend exposing .tokenizer and .model.
+
+    'pytorch' is the stock fp32 pipeline, 'quantized' uses dynamic int8 Linear
+    layers and 'onnx' runs an exported graph on ONNX Runtime's CPU provider
+    (requires the optional onnxruntime package).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{backend}'. Choose from {', '.join(BACKENDS)}.")
+    loaders = {'pytorch': _load_pytorch, 'quantized': _load_quantized, 'onnx': _load_onnx}
+    return loaders[backend](model_name)
@@ -0,0 +1,170 @@
+# sentiment/batcher.py
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference queue is at capacity and cannot take more work."""
+
+
+class MicroBatcher:
+    """
+    Collects texts from all in-flight requests into shared model batches.
+
+    Callers submit texts and get a concurrent.futures.Future back. A single
+    worker thread waits for the first queued text, then keeps collecting until
+    either max_batch_size texts are gathered or max_wait_ms has passed, and runs
+    predict_fn once on the whole batch. A bounded queue provides backpressure:
+    submit raises InferenceQueueFull instead of letting work pile up.
+    predict_many feeds long lists through in queue-sized chunks, so the bound
+    limits load rather than the size of a single call.
+    """
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=10, max_queue_size=1024):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._items = 0
+        self._rejected = 0
+        self._last_batch_ms = 0.0
+        self._stopping = False
+        self._worker = threading.Thread(target=self._run, name='sentiment-microbatcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queues one text for classification and returns its Future."""
+        future = Future()
+        try:
+            self._queue.put_nowait((text, future))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            raise InferenceQueueFull(f"Inference queue is full ({self._queue.maxsize} pending)")
+        return future
+
+    def predict_many(self, texts, timeout=None):
+        """
+        Submits texts and blocks until all of their results are ready.
+
+        Texts are queued at most max_queue_size at a time, waiting for each
+        chunk before queueing the next; timeout applies per chunk.
+        """
+        texts = list(texts)
+        chunk_size = self._queue.maxsize if self._queue.maxsize > 0 else max(len(texts), 1)
+        results = []
+        for i in range(0, len(texts), chunk_size):
+            futures = []
+            try:
+                for text in texts[i:i + chunk_size]:
+                    futures.append(self.submit(text))
+            except InferenceQueueFull:
+                # The worker skips cancelled futures, so a rejected call leaves no work behind
+                for future in futures:
+                    future.cancel()
+                raise
+            results.extend(future.result(timeout=timeout) for future in futures)
+        return results
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # The run loop exits after this batch
+                self._stopping = True
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self, batch):
+        # Drop requests whose callers gave up before the batch ran
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            results = self.predict_fn([text for text, _ in batch])
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            logger.error(f"Batched inference failed for {len(batch)} texts: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] += 1
+            self._items += len(batch)
+            self._last_batch_ms = (time.perf_counter() - start) * 1000
+
+    def _run(self):
+        while not self._stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            self._dispatch(self._collect(item))
+
+    def close(self):
+        """Stops the worker once already-queued texts have been processed."""
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def stats(self):
+        with self._stats_lock:
+            batches = sum(self._batch_sizes.values())
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_size': self._queue.maxsize,
+                'batches': batches,
+                'items': self._items,
+                'avg_batch_size': self._items / batches if batches else 0.0,
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'rejected': self._rejected,
+                'last_batch_ms': round(self._last_batch_ms, 2)
+            }
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(finbert_pipeline):
+    """Returns the shared micro-batcher for a loaded pipeline, starting it on first use."""
+    # Imported here because sentiment.finbert routes cache misses through this module
+    from sentiment.finbert import predict_sentiment
+
+    with _batchers_lock:
+        batcher = _batchers.get(id(finbert_pipeline))
+        if batcher is None:
+            batcher = MicroBatcher(
+                lambda texts: predict_sentiment(finbert_pipeline, texts),
+                max_batch_size=int(config.get('MICROBATCH_MAX_SIZE', 32)),
+                max_wait_ms=float(config.get('MICROBATCH_MAX_WAIT_MS', 10)),
+                max_queue_size=int(config.get('MICROBATCH_QUEUE_SIZE', 1024))
+            )
+            _batchers[id(finbert_pipeline)] = batcher
+        return batcher
+
+
+def batcher_stats():
+    """Stats for every running batcher (normally just one)."""
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+    return [batcher.stats() for batcher in batchers]
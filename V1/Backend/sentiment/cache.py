@@ -0,0 +1,153 @@
+# sentiment/cache.py
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from config.config import config
+from data.db_pool import read_connection, write_connection
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_headline(text):
+    """Normalizes a headline so trivially different copies share a cache entry."""
+    text = unicodedata.normalize('NFKC', text or '')
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def content_key(text):
+    """Model-independent identity of a headline."""
+    return hashlib.sha256(normalize_headline(text).encode('utf-8')).hexdigest()
+
+
+def headline_key(text, model_version):
+    """Content address of a headline for a given model version."""
+    payload = f"{model_version}\n{normalize_headline(text)}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent sentiment results keyed by headline hash.
+
+    Lookups go to an in-memory LRU first and fall back to a SQLite table, so
+    results survive restarts and are shared by every process using the same
+    database file.
+    """
+    def __init__(self, db_path, max_memory_items=10000):
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._setup_table()
+
+    def _setup_table(self):
+        with write_connection(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    model_version TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    numerical_score REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Returns {key: result} for every key found in memory or on disk."""
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+        if missing:
+            try:
+                with read_connection(self.db_path) as conn:
+                    # Stay under SQLite's default bound-parameter limit
+                    for i in range(0, len(missing), 500):
+                        chunk = missing[i:i + 500]
+                        placeholders = ', '.join(['?'] * len(chunk))
+                        rows = conn.execute(
+                            f'SELECT key, label, score, numerical_score FROM sentiment_cache WHERE key IN ({placeholders})',
+                            chunk
+                        ).fetchall()
+                        for key, label, score, numerical_score in rows:
+                            found[key] = {'label': label, 'score': score, 'numerical_score': numerical_score}
+            except sqlite3.Error as e:
+                logger.warning(f"Sentiment cache read failed: {e}")
+
+        with self._lock:
+            for key in missing:
+                if key in found:
+                    self._remember(key, found[key])
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_version, entries):
+        """Stores {key: result} in memory and persists it to SQLite."""
+        if not entries:
+            return
+        with self._lock:
+            for key, value in entries.items():
+                self._remember(key, value)
+        try:
+            with write_connection(self.db_path) as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO sentiment_cache (key, model_version, label, score, numerical_score) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(key, model_version, v['label'], v['score'], v['numerical_score']) for key, v in entries.items()]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment cache write failed: {e}")
+
+    def clear(self):
+        """Drops every cached result, in memory and in SQLite."""
+        with self._lock:
+            self._memory.clear()
+        with write_connection(self.db_path) as conn:
+            conn.execute('DELETE FROM sentiment_cache')
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'memory_items': len(self._memory)
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache():
+    """Returns the process-wide sentiment cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            db_path = config.get('SENTIMENT_CACHE_PATH') or config.get('DATABASE_PATH', 'database/financial_data.db')
+            _cache = SentimentCache(db_path, int(config.get('SENTIMENT_CACHE_MEMORY_ITEMS', 10000)))
+        return _cache
@@ -0,0 +1,151 @@
+# sentiment/client.py
+
+import json
+import logging
+import socket
+import struct
+import threading
+
+from sentiment.batcher import InferenceQueueFull
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('!I')  # 4-byte big-endian payload length
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Inference inside the worker process is timed there; this is the round trip
+worker_call_seconds = REGISTRY.histogram(
+    'finbert_worker_call_seconds', 'Sentiment worker predict round-trip time'
+)
+
+
+class SentimentWorkerError(Exception):
+    """Raised when the sentiment worker cannot be reached or returns an error."""
+
+
+def send_message(sock, payload):
+    data = json.dumps(payload).encode('utf-8')
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock):
+    (size,) = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message of {size} bytes exceeds limit")
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class SentimentWorkerClient:
+    """
+    Thin client for the out-of-process FinBERT worker (sentiment/worker.py).
+
+    Each thread keeps one Unix socket connection open and reuses it. Calls that
+    fail or exceed the timeout go to the fallback callable when one is given,
+    otherwise they raise SentimentWorkerError. fallback(texts) returns
+    (results, model_version) so results can be attributed to the model that
+    actually produced them.
+    """
+    def __init__(self, socket_path, timeout=10.0, fallback=None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.fallback = fallback
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self._model_version = None
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _call(self, payload):
+        # A stale pooled connection gets one reconnect before we give up
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_message(sock, payload)
+                response = recv_message(sock)
+                break
+            except (OSError, ConnectionError, ValueError) as e:
+                self._reset()
+                if attempt or isinstance(e, socket.timeout):
+                    raise SentimentWorkerError(f"Sentiment worker unavailable at {self.socket_path}: {e}")
+        if response.get('busy'):
+            # Backpressure from the worker's queue, not a failure worth falling back on
+            raise InferenceQueueFull(response['error'])
+        if 'error' in response:
+            raise SentimentWorkerError(response['error'])
+        return response
+
+    def predict(self, texts):
+        """Classifies texts in the worker, returning one {'label', 'score'} per text."""
+        return self.predict_versioned(texts)[0]
+
+    def predict_versioned(self, texts):
+        """
+        predict, also returning the model version that produced the results:
+        the worker's, or the fallback's when the worker couldn't answer.
+        """
+        if not texts:
+            return [], self._model_version
+        with self._stats_lock:
+            self.requests += 1
+        try:
+            with worker_call_seconds.time():
+                response = self._call({'op': 'predict', 'texts': list(texts)})
+        except SentimentWorkerError as e:
+            with self._stats_lock:
+                self.failures += 1
+            if self.fallback is None:
+                raise
+            logger.warning(f"{e}; using fallback")
+            return self.fallback(texts)
+        if response.get('model_version'):
+            self._model_version = response['model_version']
+        return response['results'], self.model_version()
+
+    def ping(self):
+        """Returns the worker's status, or None when it is unreachable."""
+        try:
+            return self._call({'op': 'ping'})
+        except SentimentWorkerError:
+            return None
+
+    def model_version(self):
+        """The worker's model version (asked once), or None while it is unreachable."""
+        if self._model_version is None:
+            status = self.ping()
+            if status is not None:
+                self._model_version = status.get('model_version')
+        return self._model_version
+
+    def stats(self):
+        with self._stats_lock:
+            return {'socket': self.socket_path, 'requests': self.requests, 'failures': self.failures}
@@ -0,0 +1,148 @@
+# sentiment/dedup.py
+
+import hashlib
+import logging
+import re
+import threading
+from collections import defaultdict
+import numpy as np
+from config.config import config
+from sentiment.cache import normalize_headline
+from sentiment.finbert import score_headlines
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_ENABLED = config.get('NEAR_DUP_ENABLED', 'true').lower() == 'true'
+NEAR_DUP_THRESHOLD = float(config.get('NEAR_DUP_THRESHOLD', 0.8))
+SHINGLE_SIZE = 4   # character n-grams work better than word n-grams on short headlines
+NUM_PERM = 64
+BANDS = 16         # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+
+# Syndicated copies usually differ only by a trailing " - Reuters" / " | Bloomberg"
+_SOURCE_SUFFIX = re.compile(r'\s+[-|\u2013\u2014]\s+[^-|\u2013\u2014]{1,40}$')
+_PUNCTUATION = re.compile(r'[^\w\s%$.]')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    text = _SOURCE_SUFFIX.sub('', text or '')
+    text = _PUNCTUATION.sub(' ', normalize_headline(text))
+    text = ' '.join(text.split()).rstrip('.')
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def minhash_signature(shingle_set):
+    """MinHash signature over NUM_PERM universal hash functions."""
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingle_set],
+        dtype=np.uint64
+    )
+    # (a * h + b) mod p, with h < 2^32 and a, b < 2^31 so nothing overflows 64 bits
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def cluster_headlines(headlines, threshold=None):
+    """
+    Groups near-duplicate headlines.
+
+    Candidate pairs come from MinHash LSH banding and are confirmed with exact
+    Jaccard similarity of character shingles. Returns a list of clusters, each a
+    list of indices into headlines; the first index is the cluster's
+    representative (the earliest occurrence).
+    """
+    threshold = NEAR_DUP_THRESHOLD if threshold is None else threshold
+    shingle_sets = [shingles(h) for h in headlines]
+    rows = NUM_PERM // BANDS
+
+    parent = list(range(len(headlines)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)
+    for i, shingle_set in enumerate(shingle_sets):
+        signature = minhash_signature(shingle_set)
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if find(i) != find(j) and jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+                    # Keep the lower index as root so it stays the representative
+                    ri, rj = find(i), find(j)
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    clusters = defaultdict(list)
+    for i in range(len(headlines)):
+        clusters[find(i)].append(i)
+    return sorted(clusters.values(), key=lambda c: c[0])
+
+
+class DedupStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.headlines = 0
+        self.representatives = 0
+
+    def record(self, headlines, representatives):
+        with self._lock:
+            self.headlines += headlines
+            self.representatives += representatives
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'enabled': NEAR_DUP_ENABLED,
+                'threshold': NEAR_DUP_THRESHOLD,
+                'headlines_seen': self.headlines,
+                'representatives_scored': self.representatives,
+                'inference_calls_saved': self.headlines - self.representatives
+            }
+
+
+dedup_stats = DedupStats()
+
+
+def score_headlines_deduped(finbert_pipeline, headlines):
+    """
+    Scores one representative per near-duplicate cluster and gives every
+    headline its cluster's result, so aggregates are weighted by cluster size.
+    Each result gains 'cluster_size'.
+    """
+    if not headlines:
+        return []
+    if NEAR_DUP_ENABLED:
+        clusters = cluster_headlines(headlines)
+    else:
+        clusters = [[i] for i in range(len(headlines))]
+
+    representatives = [headlines[cluster[0]] for cluster in clusters]
+    scored = score_headlines(finbert_pipeline, representatives)
+    dedup_stats.record(len(headlines), len(representatives))
+
+    results = [None] * len(headlines)
+    for cluster, result in zip(clusters, scored):
+        for i in cluster:
+            results[i] = {**result, 'cluster_size': len(cluster)}
+    if len(clusters) < len(headlines):
+        logger.debug(f"Collapsed {len(headlines)} headlines into {len(clusters)} clusters")
+    return results
@@ -0,0 +1,165 @@
+# sentiment/finbert.py
+
+import logging
+import threading
+from config.config import config
+from sentiment.backends import load_backend
+from sentiment.batcher import get_batcher
+from sentiment.cache import get_sentiment_cache, headline_key
+from sentiment.client import SentimentWorkerClient, SentimentWorkerError
+from sentiment.inference import batched_predict, to_numerical_score
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+FINBERT_MODEL = "yiyanghkust/finbert-tone"
+SENTIMENT_BATCH_SIZE = int(config.get('SENTIMENT_BATCH_SIZE', 16))
+# 'pytorch' (fp32), 'quantized' (dynamic int8) or 'onnx' -- see sentiment/backends.py
+SENTIMENT_BACKEND = config.get('SENTIMENT_BACKEND', 'pytorch').lower()
+
+
+def model_version(backend):
+    """Part of the cache key: bump SENTIMENT_MODEL_VERSION whenever the model or its weights change."""
+    return config.get(
+        'SENTIMENT_MODEL_VERSION',
+        FINBERT_MODEL if backend == 'pytorch' else f"{FINBERT_MODEL}+{backend}"
+    )
+
+
+# Version of the configured backend; a loaded pipeline carries its own (see
+# pipeline_model_version), which differs when the backend fell back to PyTorch
+MODEL_VERSION = model_version(SENTIMENT_BACKEND)
+# Share model batches across concurrent requests (see sentiment/batcher.py)
+MICROBATCH_ENABLED = config.get('MICROBATCH_ENABLED', 'true').lower() == 'true'
+MICROBATCH_RESULT_TIMEOUT = float(config.get('MICROBATCH_RESULT_TIMEOUT', 30))
+
+finbert_batch_seconds = REGISTRY.histogram(
+    'finbert_batch_seconds', 'FinBERT forward pass time per padded batch', ('backend',)
+)
+finbert_texts = REGISTRY.counter('finbert_texts_total', 'Texts classified by FinBERT', ('backend',))
+
+
+def load_finbert_pipeline(backend=None):
+    """
+    Loads FinBERT on CPU with the configured backend, falling back to fp32
+    PyTorch. The pipeline's sentiment_backend and model_version attributes
+    name the backend that actually loaded.
+    """
+    backend = backend or SENTIMENT_BACKEND
+    try:
+        finbert_pipeline = load_backend(backend, FINBERT_MODEL)
+    except ImportError as e:
+        if backend == 'pytorch':
+            raise
+        logger.warning(f"Sentiment backend '{backend}' unavailable ({e}); using 'pytorch'")
+        backend = 'pytorch'
+        finbert_pipeline = load_backend(backend, FINBERT_MODEL)
+    finbert_pipeline.sentiment_backend = backend
+    finbert_pipeline.model_version = model_version(backend)
+    return finbert_pipeline
+
+
+def pipeline_model_version(finbert_pipeline):
+    """Cache key version for results from this pipeline (or sentiment worker)."""
+    if isinstance(finbert_pipeline, SentimentWorkerClient):
+        return finbert_pipeline.model_version() or MODEL_VERSION
+    return getattr(finbert_pipeline, 'model_version', MODEL_VERSION)
+
+
+def connect_sentiment_worker(socket_path):
+    """
+    Returns a client for the shared sentiment worker (sentiment/worker.py).
+
+    SENTIMENT_WORKER_FALLBACK='local' loads the model in this process the first
+    time the worker can't be reached; 'none' lets the error propagate. The
+    worker is pinged here: without a fallback an unreachable worker fails the
+    connect, with one it is only logged.
+    """
+    fallback = None
+    if config.get('SENTIMENT_WORKER_FALLBACK', 'local').lower() == 'local':
+        local = {}
+        local_lock = threading.Lock()
+
+        def fallback(texts):
+            with local_lock:
+                if 'pipeline' not in local:
+                    logger.warning("Loading FinBERT in-process as sentiment worker fallback")
+                    local['pipeline'] = load_finbert_pipeline()
+            predictions = get_batcher(local['pipeline']).predict_many(texts, timeout=MICROBATCH_RESULT_TIMEOUT)
+            return predictions, local['pipeline'].model_version
+
+    client = SentimentWorkerClient(
+        socket_path,
+        timeout=float(config.get('SENTIMENT_WORKER_TIMEOUT', 10)),
+        fallback=fallback
+    )
+    if client.model_version() is None:
+        if fallback is None:
+            raise SentimentWorkerError(f"Sentiment worker at {socket_path} is not answering")
+        logger.warning(f"Sentiment worker at {socket_path} is not answering; falling back to local inference until it does")
+    return client
+
+
+def predict_sentiment(finbert_pipeline, texts, batch_size=None):
+    """
+    Classifies texts in batched forward passes (sentiment.inference.batched_predict)
+    with SENTIMENT_BATCH_SIZE, recording per-batch timings for the loaded backend.
+    """
+    if not texts:
+        return []
+    backend = getattr(finbert_pipeline, 'sentiment_backend', SENTIMENT_BACKEND)
+    results = batched_predict(
+        finbert_pipeline, texts, batch_size or SENTIMENT_BATCH_SIZE,
+        on_batch=lambda seconds: finbert_batch_seconds.observe(seconds, backend)
+    )
+    finbert_texts.inc(backend, amount=len(texts))
+    return results
+
+
+def score_headlines(finbert_pipeline, headlines, cache=None):
+    """
+    Scores headlines, sending only cache misses to the model.
+
+    Returns one {'label', 'score', 'numerical_score'} dict per headline, in
+    input order. Labels are lower-case.
+    """
+    if not headlines:
+        return []
+    cache = cache or get_sentiment_cache()
+    version = pipeline_model_version(finbert_pipeline)
+    keys = [headline_key(text, version) for text in headlines]
+    known = cache.get_many(list(dict.fromkeys(keys)))
+
+    # One model input per distinct uncached headline
+    pending = {}
+    for key, text in zip(keys, headlines):
+        if key not in known and key not in pending:
+            pending[key] = text
+
+    if pending:
+        texts = list(pending.values())
+        produced_by = version
+        if isinstance(finbert_pipeline, SentimentWorkerClient):
+            # The worker's local fallback may answer with a different backend
+            predictions, produced_by = finbert_pipeline.predict_versioned(texts)
+            produced_by = produced_by or version
+        elif MICROBATCH_ENABLED:
+            predictions = get_batcher(finbert_pipeline).predict_many(texts, timeout=MICROBATCH_RESULT_TIMEOUT)
+        else:
+            predictions = predict_sentiment(finbert_pipeline, texts)
+        fresh = {}
+        for key, result in zip(pending.keys(), predictions):
+            label = result['label'].lower()
+            fresh[key] = {
+                'label': label,
+                'score': result['score'],
+                'numerical_score': to_numerical_score(label, result['score'])
+            }
+        known.update(fresh)
+        if produced_by != version:
+            # Store under the version that produced the results, not the one looked up
+            fresh = {headline_key(text, produced_by): fresh[key] for key, text in pending.items()}
+        cache.put_many(produced_by, fresh)
+
+    logger.debug(f"Scored {len(headlines)} headlines, {len(pending)} sent to the model")
+    return [known[key] for key in keys]
@@ -0,0 +1,60 @@
+# sentiment/inference.py
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# No config or database imports here: backend_server.py uses this module on
+# its own, without the API's .env or the sentiment cache.
+MAX_TOKENS = 512  # BERT position limit
+DEFAULT_BATCH_SIZE = 16
+
+
+def _length_buckets(token_lengths, batch_size):
+    """Groups indices of similar token length so each batch pads as little as possible."""
+    order = sorted(range(len(token_lengths)), key=lambda i: token_lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def batched_predict(finbert_pipeline, texts, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """
+    Classifies texts with a FinBERT pipeline in batched forward passes.
+
+    Texts are truncated at MAX_TOKENS by the tokenizer, sorted by token length
+    and padded per batch. Returns one {'label', 'score'} dict per input text, in
+    input order, matching the output of finbert_pipeline(text)[0]. on_batch, if
+    given, is called with each forward pass's duration in seconds.
+    """
+    if not texts:
+        return []
+    import torch
+
+    tokenizer = finbert_pipeline.tokenizer
+    model = finbert_pipeline.model
+    id2label = model.config.id2label
+
+    encoded = tokenizer(list(texts), truncation=True, max_length=MAX_TOKENS)
+    token_lengths = [len(ids) for ids in encoded['input_ids']]
+    results = [None] * len(texts)
+
+    with torch.inference_mode():
+        for bucket in _length_buckets(token_lengths, batch_size):
+            batch_start = time.perf_counter()
+            features = [{key: encoded[key][i] for key in encoded.keys()} for i in bucket]
+            batch = tokenizer.pad(features, padding='longest', return_tensors='pt')
+            batch = {key: value.to(model.device) for key, value in batch.items()}
+            probs = model(**batch).logits.softmax(dim=-1)
+            scores, label_ids = probs.max(dim=-1)
+            for i, score, label_id in zip(bucket, scores.tolist(), label_ids.tolist()):
+                results[i] = {'label': id2label[label_id], 'score': score}
+            if on_batch is not None:
+                on_batch(time.perf_counter() - batch_start)
+
+    logger.debug(f"Classified {len(texts)} texts in batches of {batch_size}")
+    return results
+
+
+def to_numerical_score(label, score):
+    """Maps a label/confidence pair onto [-1, 1]."""
+    return score if label == 'positive' else -score if label == 'negative' else 0
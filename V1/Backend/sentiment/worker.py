@@ -0,0 +1,103 @@
+"""
+Standalone FinBERT inference worker.
+
+Loads the model once and serves classification requests over a Unix socket,
+so any number of API worker processes can share a single copy of torch and
+the model weights. Requests from concurrent connections are merged into
+shared batches by the micro-batcher.
+
+    python sentiment/worker.py --socket /tmp/quantfin-sentiment.sock
+
+Point API workers at it with SENTIMENT_WORKER_SOCKET in the .env file.
+"""
+
+import argparse
+import logging
+import os
+import socketserver
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.config import config
+from config.logging_config import setup_logging
+from sentiment.batcher import InferenceQueueFull, get_batcher
+from sentiment.client import recv_message, send_message
+from sentiment.finbert import MODEL_VERSION, SENTIMENT_BACKEND, load_finbert_pipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/tmp/quantfin-sentiment.sock'
+
+
+class SentimentRequestHandler(socketserver.BaseRequestHandler):
+    """Serves length-prefixed JSON requests until the client disconnects."""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            except ValueError as e:
+                send_message(self.request, {'error': f'Bad request: {e}'})
+                return
+            send_message(self.request, self.server.dispatch(request))
+
+
+class SentimentWorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, finbert_pipeline):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        super().__init__(socket_path, SentimentRequestHandler)
+        self.batcher = get_batcher(finbert_pipeline)
+        self.model_version = getattr(finbert_pipeline, 'model_version', MODEL_VERSION)
+        self.backend = getattr(finbert_pipeline, 'sentiment_backend', SENTIMENT_BACKEND)
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'model_version': self.model_version, 'backend': self.backend,
+                    'batcher': self.batcher.stats()}
+        if op == 'predict':
+            try:
+                return {'results': self.batcher.predict_many(request.get('texts', [])),
+                        'model_version': self.model_version}
+            except InferenceQueueFull as e:
+                return {'error': str(e), 'busy': True}
+            except Exception as e:
+                logger.error(f"Inference failed: {e}")
+                return {'error': f'Inference failed: {e}'}
+        return {'error': f"Unknown op '{op}'"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FinBERT sentiment inference worker')
+    parser.add_argument('--socket', default=config.get('SENTIMENT_WORKER_SOCKET', DEFAULT_SOCKET),
+                        help='Unix socket path to listen on')
+    args = parser.parse_args()
+
+    setup_logging()
+    logger.info(f"Loading FinBERT ({SENTIMENT_BACKEND} backend)...")
+    finbert_pipeline = load_finbert_pipeline()
+
+    server = SentimentWorkerServer(args.socket, finbert_pipeline)
+    logger.info(f"Sentiment worker listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# serialization.py
+
+import gzip
+import io
+import json
+import logging
+import pandas as pd
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+# orjson and pyarrow are optional: without orjson the stdlib encoder is used,
+# without pyarrow Arrow responses are refused with 406.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MEDIA_TYPE = 'application/json'
+COLUMNAR_MEDIA_TYPE = 'application/vnd.quantfin.columnar+json'
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+FORMATS = {'json': JSON_MEDIA_TYPE, 'columnar': COLUMNAR_MEDIA_TYPE, 'arrow': ARROW_MEDIA_TYPE}
+
+GZIP_MIN_BYTES = int(config.get('GZIP_MIN_BYTES', 1024))
+GZIP_LEVEL = int(config.get('GZIP_LEVEL', 5))
+
+
+class UnsupportedFormat(Exception):
+    pass
+
+
+def negotiate_format(request):
+    """
+    Picks 'json' (row objects, the default), 'columnar' or 'arrow' from an
+    explicit ?format= parameter or, failing that, the Accept header.
+    """
+    requested = request.query_params.get('format')
+    if requested:
+        if requested not in FORMATS:
+            raise UnsupportedFormat(f"Unknown format '{requested}', expected one of {', '.join(FORMATS)}")
+        return requested
+    accept = request.headers.get('accept', '')
+    if ARROW_MEDIA_TYPE in accept:
+        return 'arrow'
+    if COLUMNAR_MEDIA_TYPE in accept:
+        return 'columnar'
+    return 'json'
+
+
+def dumps(data):
+    """Compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def frame_to_columns(df, index_name='date'):
+    """{index_name: [...], column: [...]} with ISO dates and plain floats."""
+    if isinstance(df.index, pd.DatetimeIndex):
+        index = df.index.strftime('%Y-%m-%d').tolist()
+    else:
+        index = df.index.tolist()
+    columns = {index_name: index}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        columns[str(name)] = values.tolist() if values.dtype != object else list(values)
+    return columns
+
+
+def rows_to_columns(rows, names):
+    """[{name: value}, ...] to {name: [values]}."""
+    return {name: [row[name] for row in rows] for name in names}
+
+
+def columns_to_arrow(columns):
+    """Serializes {name: list} columns as an Arrow IPC stream."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise UnsupportedFormat("Arrow responses need pyarrow installed on the server")
+    table = pa.table(columns)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def accepts_gzip(request):
+    """
+    Whether the Accept-Encoding header allows gzip, honouring q-values: an
+    explicit gzip (or x-gzip) entry wins over '*', and q=0 refuses it.
+    """
+    wildcard = None
+    for coding in request.headers.get('accept-encoding', '').split(','):
+        name, *params = [part.strip() for part in coding.split(';')]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.lower()
+        if name in ('gzip', 'x-gzip'):
+            return quality > 0
+        if name == '*':
+            wildcard = quality > 0
+    return bool(wildcard)
+
+
+def maybe_gzip(request, body, headers):
+    """Gzips bodies over GZIP_MIN_BYTES for clients that accept it."""
+    if len(body) < GZIP_MIN_BYTES or not accepts_gzip(request):
+        return body
+    headers['Content-Encoding'] = 'gzip'
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
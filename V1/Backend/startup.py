@@ -0,0 +1,70 @@
+# startup.py
+
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+PROCESS_START = time.perf_counter()
+
+
+class ComponentRegistry:
+    """
+    Tracks heavy components that are loaded after the server starts accepting
+    connections, so health checks can report readiness per component.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components = {}
+
+    def register(self, name, required=True):
+        with self._lock:
+            self._components[name] = {
+                'state': 'pending',
+                'required': required,
+                'load_seconds': None,
+                'error': None,
+                'ready_at': None
+            }
+
+    def load(self, name, loader):
+        """Runs loader(), recording its duration and outcome. Returns its result or None."""
+        with self._lock:
+            self._components[name]['state'] = 'loading'
+        start = time.perf_counter()
+        try:
+            result = loader()
+            state, error = 'ready', None
+        except Exception as e:
+            logger.error(f"Failed to load component '{name}': {e}")
+            result, state, error = None, 'failed', str(e)
+        with self._lock:
+            self._components[name].update({
+                'state': state,
+                'load_seconds': round(time.perf_counter() - start, 3),
+                'error': error,
+                'ready_at': datetime.now().isoformat() if state == 'ready' else None
+            })
+        return result
+
+    def state(self, name):
+        with self._lock:
+            return self._components.get(name, {}).get('state')
+
+    def is_ready(self):
+        """True once every required component has loaded successfully; a failed one keeps it False."""
+        with self._lock:
+            return all(c['state'] == 'ready' for c in self._components.values() if c['required'])
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(info) for name, info in self._components.items()}
+
+
+def uptime_seconds():
+    return round(time.perf_counter() - PROCESS_START, 3)
+
+
+components = ComponentRegistry()
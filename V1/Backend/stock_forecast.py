@@ -1,12 +1,17 @@
 import pandas as pd
 import numpy as np
-import plotly.graph_objs as go
-from statsmodels.tsa.arima.model import ARIMA
-from ta.momentum import RSIIndicator
-from ta.trend import SMAIndicator
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
 import warnings
 import sqlite3
 
+from config.config import config
+from data.db_pool import read_connection
+from metrics import REGISTRY
+from tracing import span
+
 warnings.filterwarnings("ignore")
 
 # Native currency mapping for stocks. Used for currency conversion.
@@ -15,12 +20,25 @@ STOCK_CURRENCY = {
     'RELIANCE.NS': 'INR', 'TCS.NS': 'INR', 'INFY.NS': 'INR', 'HDFCBANK.NS': 'INR'
 }
 
+# Serialized chart specs keyed by forecast key, so repeated forecast requests
+# don't rebuild the same figure. Bounded LRU guarded by a lock because specs
+# are built on worker threads.
+CHART_CACHE_SIZE = int(config.get('CHART_CACHE_SIZE', 128))
+_chart_spec_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+# Forecasts run in the CPU process pool; executors.run_cpu ships these
+# observations back to the API process.
+arima_seconds = REGISTRY.histogram('arima_seconds', 'ARIMA model fit and forecast time', ('step',))
+chart_cache_lookups = REGISTRY.counter('chart_cache_lookups_total', 'Forecast chart spec cache lookups', ('result',))
+
 def load_data_from_db(db_path, symbol):
     """Loads historical stock data from the SQLite database for a given symbol."""
-    with sqlite3.connect(db_path) as conn:
+    with span('db.load_market_data', symbol=symbol) as db_span, read_connection(db_path) as conn:
         # Assumes the ETL pipeline stores data in a 'market_data' table
         query = f"SELECT date, open, high, low, close FROM market_data WHERE symbol = ? ORDER BY date"
         df = pd.read_sql_query(query, conn, params=(symbol,), index_col='date', parse_dates=['date'])
+        db_span.set_attribute('rows', len(df))
     
     if df.empty:
         raise ValueError(f"No data found for symbol '{symbol}' in the database at {db_path}.")
@@ -32,7 +50,7 @@ def get_fx_rate_from_db(db_path, from_currency, to_currency):
         return 1.0
     
     try:
-        with sqlite3.connect(db_path) as conn:
+        with span('db.fx_rate', pair=f"{from_currency}/{to_currency}"), read_connection(db_path) as conn:
             # Assumes the ETL pipeline stores FX rates in an 'fx_rates' table
             query = "SELECT rate FROM fx_rates WHERE from_currency = ? AND to_currency = ? ORDER BY date DESC LIMIT 1"
             cursor = conn.cursor()
@@ -54,7 +72,13 @@ def get_fx_rate_from_db(db_path, from_currency, to_currency):
         # Catches DB errors like "no such table: fx_rates"
         raise ValueError(f"DB error fetching FX rate: {e}. Ensure 'fx_rates' table exists and is populated.")
 
+# statsmodels and ta are imported inside the functions that need them so that
+# importing this module (e.g. from the API server) stays cheap.
+
 def add_technical_indicators(df):
+    from ta.momentum import RSIIndicator
+    from ta.trend import SMAIndicator
+
     df = df.copy()
     df['sma_14'] = SMAIndicator(df['close'], window=14).sma_indicator()
     df['rsi_14'] = RSIIndicator(df['close'], window=14).rsi()
@@ -62,51 +86,110 @@ def add_technical_indicators(df):
     return df
 
 def arima_forecast(df, periods, order=(5,1,0)):
+    from statsmodels.tsa.arima.model import ARIMA
+
     model = ARIMA(df['close'], order=order)
-    model_fit = model.fit()
-    return model_fit.forecast(steps=periods)
+    with arima_seconds.time('fit'), span('arima.fit', order=str(order), observations=len(df)):
+        model_fit = model.fit()
+    with arima_seconds.time('forecast'), span('arima.forecast', periods=periods):
+        return model_fit.forecast(steps=periods)
 
 def backtest_arima(df, test_size=30, order=(5,1,0)):
+    from statsmodels.tsa.arima.model import ARIMA
+
     if len(df) <= test_size:
         print(f"Warning: Not enough data for backtesting (data size: {len(df)}, test size: {test_size}). Skipping.")
         return
     train = df['close'][:-test_size]
     test = df['close'][-test_size:]
     model = ARIMA(train, order=order)
-    model_fit = model.fit()
+    with arima_seconds.time('backtest_fit'), span('arima.backtest_fit', order=str(order), test_size=test_size):
+        model_fit = model.fit()
     forecast = model_fit.forecast(steps=test_size)
     mape = np.mean(np.abs((test.values - forecast.values) / test.values)) * 100
     rmse = np.sqrt(np.mean((test.values - forecast.values) ** 2))
     print(f"Backtest Accuracy (last {test_size} days) -> MAPE: {mape:.2f}%, RMSE: {rmse:.2f}")
 
-def generate_ohlc_from_close(forecast):
+def generate_ohlc_from_close(forecast, seed=None):
+    # A seed derived from the forecast key keeps the synthetic wicks stable
+    # between calls, so a cached chart spec always matches the returned data.
+    rng = np.random.default_rng(seed)
     ohlc_data = []
     for i, close_price in enumerate(forecast):
         open_price = forecast.iloc[i-1] if i > 0 else close_price * (1 - 0.01)
-        high = max(open_price, close_price) * (1 + np.random.uniform(0.001, 0.01))
-        low = min(open_price, close_price) * (1 - np.random.uniform(0.001, 0.01))
+        high = max(open_price, close_price) * (1 + rng.uniform(0.001, 0.01))
+        low = min(open_price, close_price) * (1 - rng.uniform(0.001, 0.01))
         ohlc_data.append({'open': open_price, 'high': high, 'low': low, 'close': close_price})
     return pd.DataFrame(ohlc_data)
 
+def make_forecast_key(symbol, last_date, days, currency, forecast):
+    """
+    Builds the cache key identifying one forecast run. It includes a digest of
+    the (currency-converted) forecast series, so a same-day ETL re-run or a new
+    FX rate never serves a chart that disagrees with the returned values.
+    """
+    digest = hashlib.sha1(np.ascontiguousarray(forecast, dtype=np.float64).tobytes()).hexdigest()[:16]
+    return f"{symbol}|{pd.Timestamp(last_date).date().isoformat()}|{days}|{currency}|{digest}"
+
+def build_forecast_chart_spec(ohlc_forecast, symbol, days, currency):
+    """Builds a compact Plotly-compatible candlestick spec without importing plotly."""
+    return {
+        'data': [{
+            'type': 'candlestick',
+            'name': 'Forecast',
+            'x': [d.strftime('%Y-%m-%d') for d in pd.DatetimeIndex(ohlc_forecast.index)],
+            'open': ohlc_forecast['open'].round(4).tolist(),
+            'high': ohlc_forecast['high'].round(4).tolist(),
+            'low': ohlc_forecast['low'].round(4).tolist(),
+            'close': ohlc_forecast['close'].round(4).tolist(),
+            'increasing': {'line': {'color': 'limegreen'}},
+            'decreasing': {'line': {'color': 'crimson'}},
+        }],
+        'layout': {
+            'title': {'text': f"{symbol} Stock Price Forecast ({days} Days) in {currency}"},
+            'xaxis': {'title': {'text': 'Date'}, 'rangeslider': {'visible': False}},
+            'yaxis': {'title': {'text': f'Price ({currency})'}},
+            'plot_bgcolor': 'white',
+            'font': {'family': 'Arial', 'size': 14},
+        },
+    }
+
+def get_forecast_chart_spec(forecast_key, ohlc_forecast, symbol, days, currency):
+    """Returns the cached chart spec for a forecast key, building it on a miss."""
+    with _chart_cache_lock:
+        spec = _chart_spec_cache.get(forecast_key)
+        if spec is not None:
+            _chart_spec_cache.move_to_end(forecast_key)
+            chart_cache_lookups.inc('hit')
+            return spec
+
+    chart_cache_lookups.inc('miss')
+    spec = build_forecast_chart_spec(ohlc_forecast, symbol, days, currency)
+    with _chart_cache_lock:
+        _chart_spec_cache[forecast_key] = spec
+        while len(_chart_spec_cache) > CHART_CACHE_SIZE:
+            _chart_spec_cache.popitem(last=False)
+    return spec
+
 def create_forecast_plot(ohlc_forecast, symbol, days, currency):
     """Generates an interactive Plotly candlestick chart for the forecast."""
-    fig = go.Figure(data=[go.Candlestick(
-        x=ohlc_forecast.index, open=ohlc_forecast['open'], high=ohlc_forecast['high'],
-        low=ohlc_forecast['low'], close=ohlc_forecast['close'],
-        increasing_line_color='limegreen', decreasing_line_color='crimson',
-        name='Forecast'
-    )])
-    fig.update_layout(
-        title=f"{symbol} Stock Price Forecast ({days} Days) in {currency}",
-        xaxis_title='Date', yaxis_title=f'Price ({currency})',
-        xaxis_rangeslider_visible=False, plot_bgcolor='white',
-        font=dict(family='Arial', size=14)
-    )
-    return fig
-
-def generate_forecasts(db_path, tickers, forecast_horizon, target_currency):
+    # plotly is heavy and only needed when a figure is actually shown
+    import plotly.graph_objs as go
+    return go.Figure(build_forecast_chart_spec(ohlc_forecast, symbol, days, currency))
+
+def preload_models():
+    """Imports the forecasting libraries ahead of the first request."""
+    import statsmodels.tsa.arima.model  # noqa: F401
+    import ta.momentum  # noqa: F401
+    import ta.trend  # noqa: F401
+
+def generate_forecasts(db_path, tickers, forecast_horizon, target_currency, show_plot=False):
     """
-    Generates and displays forecasts for a list of tickers using data from the database.
+    Generates forecasts for a list of tickers using data from the database.
+
+    Charts are not built here: each result carries a 'forecast_key' that can be
+    passed to get_forecast_chart_spec. Set show_plot to open an interactive
+    window (CLI use only).
     """
     all_results = {}
     print("\n" + "="*50)
@@ -114,48 +197,57 @@ def generate_forecasts(db_path, tickers, forecast_horizon, target_currency):
     print("="*50)
 
     for symbol in tickers:
-        try:
-            print(f"\n--- Forecasting for {symbol} ---")
+        with span('forecast.symbol', symbol=symbol, horizon=forecast_horizon) as symbol_span:
+            try:
+                print(f"\n--- Forecasting for {symbol} ---")
             
-            # 1. Load data from the database
-            data = load_data_from_db(db_path, symbol)
+                # 1. Load data from the database
+                data = load_data_from_db(db_path, symbol)
             
-            # 2. Add technical indicators
-            data_with_indicators = add_technical_indicators(data)
+                # 2. Add technical indicators
+                data_with_indicators = add_technical_indicators(data)
             
-            # 3. Backtest model for accuracy check
-            backtest_arima(data_with_indicators, test_size=30, order=(5,1,0))
+                # 3. Backtest model for accuracy check
+                backtest_arima(data_with_indicators, test_size=30, order=(5,1,0))
             
-            # 4. Generate the actual forecast
-            print(f"Generating {forecast_horizon}-day forecast...")
-            forecast = arima_forecast(data_with_indicators, forecast_horizon, order=(5,1,0))
+                # 4. Generate the actual forecast
+                print(f"Generating {forecast_horizon}-day forecast...")
+                forecast = arima_forecast(data_with_indicators, forecast_horizon, order=(5,1,0))
             
-            # 5. Handle currency conversion
-            native_currency = STOCK_CURRENCY.get(symbol, 'USD')
-            display_currency = target_currency
+                # 5. Handle currency conversion
+                native_currency = STOCK_CURRENCY.get(symbol, 'USD')
+                display_currency = target_currency
             
-            if native_currency != display_currency:
-                try:
-                    fx_rate = get_fx_rate_from_db(db_path, native_currency, display_currency)
-                    forecast *= fx_rate
-                    print(f"Converted forecast from {native_currency} to {display_currency} using rate: {fx_rate:.4f}")
-                except ValueError as e:
-                    print(f"⚠️ Warning: Could not convert currency. {e}. Displaying in native currency ({native_currency}).")
-                    display_currency = native_currency
+                if native_currency != display_currency:
+                    try:
+                        fx_rate = get_fx_rate_from_db(db_path, native_currency, display_currency)
+                        forecast *= fx_rate
+                        print(f"Converted forecast from {native_currency} to {display_currency} using rate: {fx_rate:.4f}")
+                    except ValueError as e:
+                        print(f"⚠️ Warning: Could not convert currency. {e}. Displaying in native currency ({native_currency}).")
+                        display_currency = native_currency
             
-            # 6. Prepare forecasted data for plotting
-            ohlc_forecast = generate_ohlc_from_close(forecast)
-            future_dates = pd.date_range(start=data.index[-1] + pd.Timedelta(days=1), periods=forecast_horizon)
-            ohlc_forecast.index = future_dates
+                # 6. Prepare forecasted data for plotting
+                forecast_key = make_forecast_key(symbol, data.index[-1], forecast_horizon, display_currency, forecast)
+                ohlc_forecast = generate_ohlc_from_close(forecast, seed=zlib.crc32(forecast_key.encode()))
+                future_dates = pd.date_range(start=data.index[-1] + pd.Timedelta(days=1), periods=forecast_horizon)
+                ohlc_forecast.index = future_dates
             
-            # 7. Generate and show the plot
-            fig = create_forecast_plot(ohlc_forecast, symbol, forecast_horizon, display_currency)
-            fig.show()
+                # 7. Show the plot only when explicitly asked for
+                if show_plot:
+                    fig = create_forecast_plot(ohlc_forecast, symbol, forecast_horizon, display_currency)
+                    fig.show()
 
-            all_results[symbol] = {'message': 'Success', 'forecast': ohlc_forecast}
+                all_results[symbol] = {
+                    'message': 'Success',
+                    'forecast': ohlc_forecast,
+                    'forecast_key': forecast_key,
+                    'currency': display_currency
+                }
 
-        except Exception as e:
-            print(f"❌ Error forecasting for {symbol}: {e}")
-            all_results[symbol] = {'message': f'Failed: {e}', 'forecast': None}
+            except Exception as e:
+                print(f"❌ Error forecasting for {symbol}: {e}")
+                all_results[symbol] = {'message': f'Failed: {e}', 'forecast': None, 'forecast_key': None}
+                symbol_span.set_attribute('error', str(e))
             
     return all_results
\ No newline at end of file
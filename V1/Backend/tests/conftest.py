@@ -0,0 +1,16 @@
+# tests/conftest.py
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# config.config searches for a .env from the working directory upwards and
+# refuses to load without one, so the suite runs from an empty scratch
+# project; relative paths (database, logs) land there too.
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_scratch = Path(tempfile.mkdtemp(prefix='quantfin-tests-'))
+(_scratch / '.env').write_text('')
+os.chdir(_scratch)
@@ -0,0 +1,117 @@
+# tests/test_admission.py
+
+import asyncio
+import pytest
+import admission
+from admission import AdmissionController, ConcurrencyLimiter, Rejected, TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(admission.time, 'monotonic', fake)
+    return fake
+
+
+def test_token_bucket_allows_a_burst_then_429s(clock):
+    limiter = TokenBucketLimiter('forecast', rate_per_minute=60, burst=3)
+    for _ in range(3):
+        limiter.check('client-a')
+    with pytest.raises(Rejected) as rejected:
+        limiter.check('client-a')
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 1
+
+    # Other clients have their own bucket
+    limiter.check('client-b')
+
+    clock.now += 1.0
+    limiter.check('client-a')
+    assert limiter.snapshot()['allowed'] == 5
+    assert limiter.snapshot()['rate_limited'] == 1
+
+
+def test_token_bucket_forgets_least_recent_clients(clock):
+    limiter = TokenBucketLimiter('forecast', rate_per_minute=60, burst=1, max_clients=2)
+    limiter.check('a')
+    limiter.check('b')
+    limiter.check('c')
+    assert limiter.snapshot()['clients'] == 2
+    # 'a' was evicted, so it starts again with a full bucket
+    limiter.check('a')
+
+
+def test_concurrency_limiter_queues_then_sheds():
+    async def scenario():
+        limiter = ConcurrencyLimiter('bulk', max_concurrent=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        async def queued():
+            async with limiter.slot():
+                return 'ran'
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        assert limiter.snapshot()['queue_depth'] == 1
+
+        with pytest.raises(Rejected) as rejected:
+            async with limiter.slot():
+                pass
+        assert rejected.value.status_code == 503
+
+        release.set()
+        await holder
+        assert await waiter == 'ran'
+        return limiter.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot['admitted'] == 2
+    assert snapshot['shed_queue_full'] == 1
+    assert snapshot['in_flight'] == 0
+
+
+def test_concurrency_limiter_sheds_after_the_queue_timeout():
+    async def scenario():
+        limiter = ConcurrencyLimiter('forecast', max_concurrent=1, max_queue=4, queue_timeout=0.01)
+        async with limiter.slot():
+            with pytest.raises(Rejected) as rejected:
+                async with limiter.slot():
+                    pass
+        return rejected.value, limiter.snapshot()
+
+    rejected, snapshot = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert snapshot['shed_timeout'] == 1
+    assert snapshot['queue_depth'] == 0
+
+
+def test_admission_controller_rate_limits_before_queueing(clock):
+    async def scenario():
+        controller = AdmissionController()
+        controller.configure('forecast', max_concurrent=2, max_queue=2, queue_timeout=1,
+                             rate_per_minute=60, burst=1)
+        async with controller.admit('forecast', 'client'):
+            pass
+        with pytest.raises(Rejected) as rejected:
+            async with controller.admit('forecast', 'client'):
+                pass
+        return rejected.value, controller.snapshot()['forecast']
+
+    rejected, snapshot = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert snapshot['admitted'] == 1
+    assert snapshot['rate_limited'] == 1
@@ -0,0 +1,84 @@
+# tests/test_batcher.py
+
+import threading
+import time
+import pytest
+from sentiment.batcher import InferenceQueueFull, MicroBatcher
+
+
+def _upper(texts):
+    return [text.upper() for text in texts]
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def batchers():
+    """Builds MicroBatchers and stops their worker threads after the test."""
+    created = []
+
+    def make(*args, **kwargs):
+        created.append(MicroBatcher(*args, **kwargs))
+        return created[-1]
+
+    yield make
+    for batcher in created:
+        batcher.close()
+
+
+def test_predict_many_keeps_input_order(batchers):
+    batcher = batchers(_upper, max_batch_size=4, max_wait_ms=1)
+    assert batcher.predict_many(['b', 'a', 'c']) == ['B', 'A', 'C']
+
+
+def test_call_longer_than_the_queue_is_served(batchers):
+    batch_sizes = []
+
+    def predict(texts):
+        batch_sizes.append(len(texts))
+        return _upper(texts)
+
+    batcher = batchers(predict, max_batch_size=4, max_wait_ms=1, max_queue_size=5)
+    texts = [f"headline {i}" for i in range(23)]
+    assert batcher.predict_many(texts) == _upper(texts)
+    assert max(batch_sizes) <= 4
+    assert batcher.stats()['rejected'] == 0
+
+
+def test_full_queue_rejects_and_cancels_the_partial_call(batchers):
+    release = threading.Event()
+    ran = []
+
+    def predict(texts):
+        release.wait(5)
+        ran.extend(texts)
+        return _upper(texts)
+
+    batcher = batchers(predict, max_batch_size=1, max_wait_ms=1, max_queue_size=3)
+    busy = batcher.submit('busy')
+    _wait_until(lambda: batcher.stats()['queue_depth'] == 0)
+    other = batcher.submit('other')
+
+    # 'a' and 'b' fit next to 'other', 'c' does not
+    with pytest.raises(InferenceQueueFull):
+        batcher.predict_many(['a', 'b', 'c'])
+    release.set()
+
+    assert busy.result(5) == 'BUSY'
+    assert other.result(5) == 'OTHER'
+    assert batcher.predict_many(['d']) == ['D']
+    assert ran == ['busy', 'other', 'd']
+    assert batcher.stats()['rejected'] == 1
+
+
+def test_close_finishes_queued_work():
+    batcher = MicroBatcher(_upper, max_batch_size=8, max_wait_ms=50)
+    futures = [batcher.submit(text) for text in ('x', 'y', 'z')]
+    batcher.close()
+    assert [future.result(0) for future in futures] == ['X', 'Y', 'Z']
+    assert not batcher._worker.is_alive()
@@ -0,0 +1,42 @@
+# tests/test_dedup.py
+
+import sentiment.dedup as dedup
+from sentiment.dedup import cluster_headlines, score_headlines_deduped
+
+
+HEADLINES = [
+    "Apple beats quarterly revenue estimates on strong iPhone sales - Reuters",
+    "Tesla recalls 2 million vehicles over Autopilot safeguards",
+    "Apple beats quarterly revenue estimates on strong iPhone sales | Bloomberg",
+    "apple beats quarterly revenue estimates on strong iPhone sales.",
+    "Fed holds rates steady, signals cuts later this year",
+]
+
+
+def test_syndicated_copies_share_a_cluster():
+    clusters = cluster_headlines(HEADLINES, threshold=0.8)
+    assert clusters == [[0, 2, 3], [1], [4]]
+
+
+def test_distinct_stories_about_one_company_stay_apart():
+    headlines = [
+        "Apple beats quarterly revenue estimates on strong iPhone sales",
+        "Apple faces EU antitrust fine over App Store rules",
+    ]
+    assert cluster_headlines(headlines, threshold=0.8) == [[0], [1]]
+
+
+def test_one_inference_per_cluster(monkeypatch):
+    scored_batches = []
+
+    def fake_score(finbert_pipeline, headlines):
+        scored_batches.append(list(headlines))
+        return [{'label': 'positive', 'score': 0.9, 'numerical_score': 0.9} for _ in headlines]
+
+    monkeypatch.setattr(dedup, 'score_headlines', fake_score)
+    monkeypatch.setattr(dedup, 'NEAR_DUP_ENABLED', True)
+    results = score_headlines_deduped(object(), HEADLINES)
+
+    assert scored_batches == [[HEADLINES[0], HEADLINES[1], HEADLINES[4]]]
+    assert [r['cluster_size'] for r in results] == [3, 1, 3, 3, 1]
+    assert all(r['label'] == 'positive' for r in results)
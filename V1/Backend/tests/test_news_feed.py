@@ -0,0 +1,99 @@
+# tests/test_news_feed.py
+
+import asyncio
+import pytest
+from data.news_feed import CachedNewsFeed
+
+
+class FakeSource:
+    """Async fetch returning numbered batches; can be told to block or fail."""
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("NewsAPI unavailable")
+        return [f"batch {self.calls}"]
+
+
+def test_concurrent_first_requests_share_one_fetch():
+    async def scenario():
+        source = FakeSource()
+        source.release.clear()
+        feed = CachedNewsFeed(source, ttl_seconds=60)
+        waiting = [asyncio.create_task(feed.get()) for _ in range(5)]
+        await asyncio.sleep(0)
+        source.release.set()
+        return await asyncio.gather(*waiting), source.calls
+
+    results, calls = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [['batch 1']] * 5
+
+
+def test_fresh_copy_is_served_without_fetching():
+    async def scenario():
+        source = FakeSource()
+        feed = CachedNewsFeed(source, ttl_seconds=60)
+        await feed.get()
+        await feed.get()
+        return source.calls, feed.stats()
+
+    calls, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert stats['hits'] == 1
+
+
+def test_stale_copy_is_served_while_revalidating():
+    async def scenario():
+        source = FakeSource()
+        feed = CachedNewsFeed(source, ttl_seconds=0)
+        assert await feed.get() == ['batch 1']
+
+        source.release.clear()
+        stale = await feed.get()
+        also_stale = await feed.get()
+        refreshing = feed.stats()['refreshing']
+        source.release.set()
+        await asyncio.sleep(0.01)
+        return stale, also_stale, refreshing, source.calls, feed._items
+
+    stale, also_stale, refreshing, calls, current = asyncio.run(scenario())
+    assert stale == also_stale == ['batch 1']
+    assert refreshing
+    assert calls == 2
+    assert current == ['batch 2']
+
+
+def test_failed_refresh_keeps_the_last_good_copy():
+    async def scenario():
+        source = FakeSource()
+        feed = CachedNewsFeed(source, ttl_seconds=0, retry_seconds=60)
+        await feed.get()
+        source.fail = True
+        await feed.get()
+        await asyncio.sleep(0.01)
+        served = await feed.get()
+        return served, source.calls, feed.stats()
+
+    served, calls, stats = asyncio.run(scenario())
+    assert served == ['batch 1']
+    # The retry delay stops a failing source from being hit on every request
+    assert calls == 2
+    assert stats['failures'] == 1
+    assert stats['last_error'] == 'NewsAPI unavailable'
+
+
+def test_first_fetch_failure_reaches_the_caller():
+    async def scenario():
+        source = FakeSource()
+        source.fail = True
+        await CachedNewsFeed(source).get()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
@@ -0,0 +1,98 @@
+# tests/test_response_cache.py
+
+import pytest
+from response_cache import Fallback, ResponseCache, unwrap
+
+
+def test_get_only_answers_for_the_cached_version():
+    cache = ResponseCache()
+    cache.put('market-data', 3, b'body')
+    assert cache.get('market-data', 3) == b'body'
+    assert cache.get('market-data', 4) is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_slow_builder_does_not_overwrite_a_newer_version():
+    cache = ResponseCache()
+    cache.put('portfolio', 5, b'new')
+    cache.put('portfolio', 4, b'old')
+    assert cache.get('portfolio', 5) == b'new'
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_items=2)
+    cache.put('a', 1, b'a')
+    cache.put('b', 1, b'b')
+    cache.get('a', 1)
+    cache.put('c', 1, b'c')
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) == b'a'
+
+
+def test_etag_changes_with_name_and_version():
+    etag = ResponseCache.make_etag('market-data', 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == ResponseCache.make_etag('market-data', 1)
+    assert etag != ResponseCache.make_etag('market-data', 2)
+    assert etag != ResponseCache.make_etag('market-data+gzip', 1)
+
+
+def test_unwrap_marks_fallback_data():
+    assert unwrap(Fallback([1])) == ([1], True)
+    assert unwrap([1]) == ([1], False)
+
+
+@pytest.fixture
+def market_api(tmp_path, monkeypatch):
+    """TestClient for the API server reading market data from an empty scratch database."""
+    from fastapi.testclient import TestClient
+    import api_server
+    from config.config import config
+
+    db_path = str(tmp_path / 'market.db')
+    monkeypatch.setitem(config.settings, 'DATABASE_PATH', db_path)
+    return TestClient(api_server.app), db_path
+
+
+def _commit_quotes(db_path, close):
+    from data.data_version import bump_data_version, forget_data_version
+    from data.db_pool import write_connection
+    from data.etl_pipeline import _setup_database
+
+    _setup_database(db_path)
+    with write_connection(db_path) as conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO market_data (symbol, date, open, high, low, close, volume) '
+            "VALUES ('AAPL', '2026-10-19', 1, 1, 1, ?, 100)", (close,)
+        )
+        bump_data_version(conn)
+    forget_data_version(db_path)
+
+
+def test_fallback_quotes_are_not_cached(market_api):
+    client, _ = market_api
+    response = client.get('/api/market-data')
+    assert response.status_code == 200
+    assert response.headers['cache-control'] == 'no-store'
+    assert 'etag' not in response.headers
+
+
+def test_revalidation_until_the_data_version_changes(market_api):
+    client, db_path = market_api
+    _commit_quotes(db_path, 190.0)
+
+    first = client.get('/api/market-data')
+    assert first.status_code == 200
+    assert first.json()[0]['price'] == 190.0
+    etag = first.headers['etag']
+
+    revalidated = client.get('/api/market-data', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == etag
+
+    _commit_quotes(db_path, 191.0)
+    changed = client.get('/api/market-data', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
+    assert changed.json()[0]['price'] == 191.0
@@ -0,0 +1,74 @@
+# tests/test_sentiment_store.py
+
+import math
+from datetime import datetime, timedelta, timezone
+import pytest
+from data.sentiment_store import (
+    EWMA_WINDOWS, MARKET_KEY, get_aggregates, get_last_ingest_time, get_top_movers, record_scored_headlines
+)
+
+
+def _item(key, score, published_at):
+    return {
+        'headline_key': key,
+        'published_at': published_at.isoformat(),
+        'title': f"headline {key}",
+        'label': 'positive' if score > 0 else 'negative',
+        'score': abs(score),
+        'numerical_score': score,
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'sentiment.db')
+
+
+def test_ewma_decays_older_observations(db_path):
+    now = datetime.now(timezone.utc)
+    day = timedelta(days=1)
+    record_scored_headlines(db_path, 'AAPL', [_item('a', 1.0, now - day)])
+    record_scored_headlines(db_path, 'AAPL', [_item('b', -1.0, now)])
+
+    aggregates = get_aggregates(db_path, 'AAPL')
+    decay = math.exp(-day.total_seconds() / EWMA_WINDOWS['1d'])
+    assert aggregates['1d']['ewma'] == pytest.approx((decay - 1.0) / (decay + 1.0))
+    assert aggregates['1d']['observations'] == 2
+    # The longer window forgets the older headline more slowly
+    assert aggregates['30d']['ewma'] > aggregates['7d']['ewma'] > aggregates['1d']['ewma']
+
+
+def test_out_of_order_observation_matches_in_order(db_path, tmp_path):
+    now = datetime.now(timezone.utc)
+    items = [_item('a', 0.5, now - timedelta(hours=6)), _item('b', -0.2, now)]
+    record_scored_headlines(db_path, 'AAPL', items)
+    out_of_order = str(tmp_path / 'out_of_order.db')
+    record_scored_headlines(out_of_order, 'AAPL', list(reversed(items)))
+
+    for window in EWMA_WINDOWS:
+        assert get_aggregates(out_of_order, 'AAPL')[window]['ewma'] == pytest.approx(
+            get_aggregates(db_path, 'AAPL')[window]['ewma']
+        )
+
+
+def test_repeated_headlines_are_counted_once(db_path):
+    now = datetime.now(timezone.utc)
+    assert record_scored_headlines(db_path, 'AAPL', [_item('a', 0.8, now)]) == 1
+    assert record_scored_headlines(db_path, 'AAPL', [_item('a', 0.8, now)]) == 0
+    # The same story under another ticker counts for that ticker, not twice for the market
+    assert record_scored_headlines(db_path, 'MSFT', [_item('a', 0.8, now)]) == 1
+
+    assert get_aggregates(db_path, 'AAPL')['7d']['observations'] == 1
+    assert get_aggregates(db_path, MARKET_KEY)['7d']['observations'] == 1
+    bullish, bearish = get_top_movers(db_path)
+    assert sorted(row[0] for row in bullish) == ['AAPL', 'MSFT']
+    assert bearish == []
+
+
+def test_ingest_time_advances_without_new_headlines(db_path):
+    now = datetime.now(timezone.utc)
+    record_scored_headlines(db_path, 'AAPL', [_item('a', 0.1, now)])
+    first = get_last_ingest_time(db_path, 'AAPL')
+    record_scored_headlines(db_path, 'AAPL', [])
+    assert get_last_ingest_time(db_path, 'AAPL') >= first
+    assert get_last_ingest_time(db_path, 'MSFT') is None
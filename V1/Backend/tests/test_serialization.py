@@ -0,0 +1,79 @@
+# tests/test_serialization.py
+
+import gzip
+import json
+import pandas as pd
+import pytest
+from starlette.requests import Request
+from serialization import (
+    GZIP_MIN_BYTES, UnsupportedFormat, accepts_gzip, dumps, frame_to_columns, maybe_gzip, negotiate_format,
+    rows_to_columns, COLUMNAR_MEDIA_TYPE
+)
+
+
+def make_request(query='', **headers):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'query_string': query.encode(),
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', True),
+    ('gzip, deflate, br', True),
+    ('GZIP;Q=0.5', True),
+    ('x-gzip', True),
+    ('br, *', True),
+    ('', False),
+    ('deflate, br', False),
+    ('gzip;q=0', False),
+    ('gzip; q=0.0, br', False),
+    ('*;q=0', False),
+    ('gzip;q=0, *', False),
+    ('*;q=0, gzip', True),
+    ('gzip;q=bogus', False),
+])
+def test_accepts_gzip_honours_q_values(header, expected):
+    assert accepts_gzip(make_request(accept_encoding=header)) is expected
+
+
+def test_maybe_gzip_compresses_large_bodies_only():
+    body = b'x' * GZIP_MIN_BYTES
+    headers = {}
+    compressed = maybe_gzip(make_request(accept_encoding='gzip'), body, headers)
+    assert headers == {'Content-Encoding': 'gzip'}
+    assert gzip.decompress(compressed) == body
+
+    headers = {}
+    assert maybe_gzip(make_request(accept_encoding='gzip'), b'small', headers) == b'small'
+    assert headers == {}
+
+
+def test_maybe_gzip_respects_a_refused_coding():
+    headers = {}
+    body = b'x' * GZIP_MIN_BYTES
+    assert maybe_gzip(make_request(accept_encoding='gzip;q=0, identity'), body, headers) == body
+    assert headers == {}
+
+
+def test_negotiate_format_prefers_the_query_parameter():
+    assert negotiate_format(make_request()) == 'json'
+    assert negotiate_format(make_request(accept=COLUMNAR_MEDIA_TYPE)) == 'columnar'
+    assert negotiate_format(make_request('format=arrow', accept=COLUMNAR_MEDIA_TYPE)) == 'arrow'
+    with pytest.raises(UnsupportedFormat):
+        negotiate_format(make_request('format=xml'))
+
+
+def test_frame_to_columns_uses_iso_dates():
+    df = pd.DataFrame({'close': [1.5, 2.5]}, index=pd.to_datetime(['2026-10-16', '2026-10-19']))
+    assert frame_to_columns(df) == {'date': ['2026-10-16', '2026-10-19'], 'close': [1.5, 2.5]}
+
+
+def test_rows_to_columns_and_dumps():
+    rows = [{'symbol': 'AAPL', 'price': 1.0}, {'symbol': 'MSFT', 'price': 2.0}]
+    columns = rows_to_columns(rows, ['symbol', 'price'])
+    assert columns == {'symbol': ['AAPL', 'MSFT'], 'price': [1.0, 2.0]}
+    assert json.loads(dumps(columns)) == columns
@@ -0,0 +1,42 @@
+# tests/test_startup.py
+
+from startup import ComponentRegistry
+
+
+def _failing_loader():
+    raise RuntimeError("model weights missing")
+
+
+def test_not_ready_until_required_components_load():
+    registry = ComponentRegistry()
+    registry.register('finbert')
+    registry.register('groq', required=False)
+    assert not registry.is_ready()
+
+    assert registry.load('finbert', lambda: 'pipeline') == 'pipeline'
+    assert registry.is_ready()
+    assert registry.snapshot()['finbert']['state'] == 'ready'
+
+
+def test_failed_required_component_is_not_ready():
+    registry = ComponentRegistry()
+    registry.register('finbert')
+    registry.register('forecasting')
+    registry.load('forecasting', lambda: None)
+
+    assert registry.load('finbert', _failing_loader) is None
+    assert not registry.is_ready()
+    detail = registry.snapshot()['finbert']
+    assert detail['state'] == 'failed'
+    assert detail['error'] == 'model weights missing'
+
+
+def test_failed_optional_component_does_not_block_readiness():
+    registry = ComponentRegistry()
+    registry.register('finbert')
+    registry.register('groq', required=False)
+    registry.load('finbert', lambda: 'pipeline')
+    registry.load('groq', _failing_loader)
+
+    assert registry.is_ready()
+    assert registry.state('groq') == 'failed'
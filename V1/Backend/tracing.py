@@ -0,0 +1,240 @@
+# tracing.py
+
+import json
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Span tracing for attributing latency within one request. Finished spans are
+# appended as JSON lines to TRACE_EXPORT_PATH using OTLP/JSON field names
+# (traceId, spanId, parentSpanId, startTimeUnixNano, ...), so they can be
+# grepped by trace id or converted for a collector. With TRACING_ENABLED=false
+# span() is a no-op context manager.
+TRACING_ENABLED = config.get('TRACING_ENABLED', 'false').lower() == 'true'
+TRACE_EXPORT_PATH = Path(config.get('TRACE_EXPORT_PATH', 'logs/traces.jsonl'))
+SERVICE_NAME = config.get('TRACE_SERVICE_NAME', 'quantfin-api')
+
+_current = ContextVar('current_span', default=None)
+
+
+class _NoopSpan:
+    """Returned by span() when tracing is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes', 'start_ns', 'end_ns', 'error')
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def to_dict(self):
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'status': {'code': 'ERROR', 'message': self.error} if self.error else {'code': 'OK'},
+            'resource': {'service.name': SERVICE_NAME, 'process.pid': os.getpid()},
+        }
+
+
+class FileExporter:
+    """
+    Appends finished spans to a JSON lines file. Spans are handed to a
+    background writer thread, so ending a span on the event loop never waits
+    on the disk; when the writer falls max_pending batches behind, new spans
+    are dropped (and counted) rather than buffered without bound.
+    """
+    def __init__(self, path, max_pending=10000):
+        self.path = path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def export(self, spans):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            with self._lock:
+                self.dropped += len(spans)
+
+    def flush(self):
+        """Blocks until every span exported so far has been written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _run(self):
+        file = None
+        while True:
+            spans = self._queue.get()
+            try:
+                lines = ''.join(json.dumps(span, default=str) + '\n' for span in spans)
+                if file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    file = open(self.path, 'a', encoding='utf-8')
+                file.write(lines)
+                file.flush()
+            except OSError as e:
+                logger.warning(f"Could not export {len(spans)} spans: {e}")
+            finally:
+                self._queue.task_done()
+
+
+class _Collector:
+    """Holds spans finished in a pool worker until they are sent back."""
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+_exporter = FileExporter(TRACE_EXPORT_PATH)
+
+
+@contextmanager
+def _span(name, attributes):
+    parent = _current.get()
+    if isinstance(parent, tuple):
+        # Remote parent (trace_id, span_id) handed to a pool worker
+        trace_id, parent_id = parent
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = os.urandom(16).hex(), None
+    span = Span(name, trace_id, parent_id, attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        _exporter.export([span.to_dict()])
+
+
+def span(name, **attributes):
+    """
+    Context manager timing one unit of work as a child of the current span
+    (or as a new trace). Yields the Span; attributes can be set on it
+    whether or not tracing is enabled.
+    """
+    if not TRACING_ENABLED:
+        return _NOOP
+    return _span(name, attributes)
+
+
+def current_context():
+    """(trace_id, span_id) of the current span, picklable for a worker process."""
+    current = _current.get()
+    if current is None or isinstance(current, tuple):
+        return current
+    return current.trace_id, current.span_id
+
+
+def run_traced(parent, fn, *args):
+    """
+    Calls fn in a pool worker with `parent` as the remote parent span;
+    returns (result, finished span dicts) for export_spans in the caller.
+    """
+    global _exporter
+    collector, previous = _Collector(), _exporter
+    _exporter = collector
+    token = _current.set(parent)
+    try:
+        result = fn(*args)
+    finally:
+        _current.reset(token)
+        _exporter = previous
+    return result, collector.spans
+
+
+def export_spans(spans):
+    if spans:
+        _exporter.export(spans)
+
+
+def install_log_context():
+    """Adds trace_id and span_id attributes to every log record ('-' outside a span)."""
+    factory = logging.getLogRecordFactory()
+    if getattr(factory, 'adds_trace_context', False):
+        return
+
+    def record_factory(*args, **kwargs):
+        record = factory(*args, **kwargs)
+        current = _current.get()
+        if current is None:
+            record.trace_id = record.span_id = '-'
+        elif isinstance(current, tuple):
+            record.trace_id, record.span_id = current
+        else:
+            record.trace_id, record.span_id = current.trace_id, current.span_id
+        return record
+
+    record_factory.adds_trace_context = True
+    logging.setLogRecordFactory(record_factory)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a root span per HTTP request and returning its
+    trace id in X-Trace-Id.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not TRACING_ENABLED or scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        attributes = {'http.method': scope['method'], 'http.target': scope['path']}
+        with span(f"{scope['method']} {scope['path']}", **attributes) as root:
+            async def send_with_trace(message):
+                if message['type'] == 'http.response.start':
+                    root.set_attribute('http.status_code', message['status'])
+                    message['headers'] = list(message.get('headers', [])) + [(b'x-trace-id', root.trace_id.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
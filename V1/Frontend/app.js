@@ -679,17 +679,57 @@ function initializeChatbot() {
         chatMessages.appendChild(typingDiv);
         chatMessages.scrollTop = chatMessages.scrollHeight;
         try {
-            const response = await apiRequest('/api/chat', {
-                method: 'POST',
-                body: JSON.stringify({ message })
-            });
-            typingDiv.remove();
-            addChatMessage(response.response, 'bot');
+            await streamChatReply(message, typingDiv);
         } catch (error) {
             typingDiv.remove();
             addChatMessage('Sorry, I encountered an error. Please try again later.', 'bot');
         }
     }
+    // Reads the server-sent events from /api/chat/stream, showing tokens as they arrive
+    async function streamChatReply(message, typingDiv) {
+        const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ message })
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        if (!response.body) {
+            // No streaming support: fall back to the buffered endpoint
+            const reply = await apiRequest('/api/chat', { method: 'POST', body: JSON.stringify({ message }) });
+            typingDiv.remove();
+            addChatMessage(reply.response, 'bot');
+            return;
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let bubble = null;
+        let text = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                const event = (block.match(/^event: (.*)$/m) || [])[1];
+                const data = JSON.parse((block.match(/^data: (.*)$/m) || [])[1] || '{}');
+                if (event === 'token') {
+                    if (!bubble) {
+                        typingDiv.remove();
+                        bubble = addChatMessage('', 'bot');
+                    }
+                    text += data.text;
+                    bubble.querySelector('p').textContent = text;
+                    chatMessages.scrollTop = chatMessages.scrollHeight;
+                } else if (event === 'error') {
+                    throw new Error(data.message);
+                }
+            }
+        }
+        if (!bubble) throw new Error('Empty chat response');
+    }
     function addChatMessage(message, sender) {
         if (!chatMessages) return;
         const messageDiv = document.createElement('div');
@@ -697,6 +737,7 @@ function initializeChatbot() {
         messageDiv.innerHTML = `<p>${message}</p>`;
         chatMessages.appendChild(messageDiv);
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageDiv;
     }
     if (sendChat) sendChat.addEventListener('click', sendMessage);
     if (chatInput) {
@@ -1130,9 +1171,69 @@ function initializeCharts() {
 }
 
 // === REAL-TIME ===
+function renderMarketData() {
+    loadMarketTicker();
+    loadWatchlist();
+}
+
+async function refreshPortfolioData() {
+    try {
+        const newPortfolioData = await apiRequest('/api/portfolio');
+        if (newPortfolioData) {
+            portfolioData = newPortfolioData;
+            loadPortfolioData();
+        }
+    } catch (error) {
+        console.error('Failed to update portfolio data:', error);
+    }
+}
+
+// Server push: a snapshot on connect, then deltas with only the changed symbols.
+// The portfolio is re-fetched only when the data version changes.
+function startMarketStream() {
+    const source = new EventSource(`${API_BASE_URL}/api/stream/market`);
+    let dataVersion = null;
+
+    source.addEventListener('snapshot', (event) => {
+        const snapshot = JSON.parse(event.data);
+        if (snapshot.quotes && snapshot.quotes.length > 0) {
+            marketData = snapshot.quotes;
+            renderMarketData();
+        }
+        if (dataVersion !== null && snapshot.version !== dataVersion) refreshPortfolioData();
+        dataVersion = snapshot.version;
+    });
+
+    source.addEventListener('delta', (event) => {
+        const delta = JSON.parse(event.data);
+        const bySymbol = new Map(marketData.map(stock => [stock.symbol, stock]));
+        delta.changed.forEach(stock => bySymbol.set(stock.symbol, stock));
+        delta.removed.forEach(symbol => bySymbol.delete(symbol));
+        marketData = Array.from(bySymbol.values());
+        renderMarketData();
+        if (delta.version !== dataVersion) {
+            dataVersion = delta.version;
+            refreshPortfolioData();
+        }
+    });
+
+    // EventSource reconnects on its own (and gets a fresh snapshot), including
+    // after the server drops this client for falling behind
+    source.addEventListener('dropped', () => console.warn('Market stream dropped this client, reconnecting...'));
+    source.onerror = () => console.warn('Market stream interrupted, reconnecting...');
+
+    window.marketStream = source;
+}
+
 function startRealTimeUpdates() {
     console.log('Starting real-time updates...');
-    
+
+    if (window.EventSource) {
+        startMarketStream();
+        return;
+    }
+
+    // Fallback for browsers without EventSource: poll
     // Market data updates every 30 seconds
     const marketUpdateInterval = setInterval(async () => {
         try {